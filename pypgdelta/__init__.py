@@ -1 +1,9 @@
-from ._delta import get_delta, get_delta_statement
+from ._delta import get_delta, get_delta_statement, iter_delta_statements, write_delta_statement
+from ._execute import execute_delta
+from ._fingerprint import get_configuration_fingerprint
+from ._fleet import get_fleet_delta_statements
+from ._model import (Column, Constraint, Constraints, Index, Schema, Table, get_configuration_dict,
+                     get_configuration_model)
+from ._plan import get_delta_plan, get_plan_waves
+from ._snapshot import load_state, save_state
+from ._watch import DeltaWatcher, watch_delta_statement
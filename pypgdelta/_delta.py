@@ -1,16 +1,25 @@
 from collections import OrderedDict
-from copy import deepcopy
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, TextIO, Tuple, Union
 
+from ._fingerprint import FINGERPRINT_COLUMN_KEYS, FINGERPRINT_INDEX_KEYS, get_schema_fingerprint
+from ._types import is_metadata_only_change
 from .sql import statements
-from .sql.statements._constraint import create_constraint_statements
+from .sql.statements._constraint import create_constraint_actions, create_constraint_statements
+from .sql.statements._index import create_index_statements
 
+# The schemas to compare in a worker process of _map_schemas
+_worker_schemas = None
 
-def get_delta(old_configuration: Dict, new_configuration: Dict) -> Dict:
+
+def get_delta(old_configuration: Dict, new_configuration: Dict, jobs: Union[int, None] = None) -> Dict:
     """Function to generate a delta based on the given configurations
 
     :param Dict old_configuration: The baseline configuration
     :param new_configuration: The desired configuration
+    :param Union[int, None] jobs: If set, compare the schemas in a process pool with this many processes. The delta
+        is the same as without a pool
 
     :return: Delta config
     :rtype: Dict
@@ -26,169 +35,288 @@ def get_delta(old_configuration: Dict, new_configuration: Dict) -> Dict:
     delta['tables'] = OrderedDict()
     delta['tables']['new'] = []
     delta['tables']['alter'] = []
-    for schema_name, schema_config in new_configuration.items():
-        schema_baseline = OrderedDict(
-            [
-                ('schema_name', schema_name)
+    for new_tables, alter_tables in _map_schemas(_get_schema_delta, old_configuration, new_configuration, jobs):
+        delta['tables']['new'].extend(new_tables)
+        delta['tables']['alter'].extend(alter_tables)
+
+    return delta
+
+
+def get_table_delta(old_configuration: Dict,
+                    schema_name: str,
+                    table_name: str,
+                    table_config: Dict,
+                    fingerprints: Union[Dict[int, str], None] = None) -> Tuple[Union[str, None], Dict]:
+    """Function to generate the delta of a single table of the desired configuration
+
+    :param Dict old_configuration: The baseline configuration
+    :param str schema_name: The name of the schema the table belongs to
+    :param str table_name: The name of the table
+    :param Dict table_config: The desired table configuration
+    :param Union[Dict[int, str], None] fingerprints: The fingerprints of the tables and columns of both
+        configurations, see get_schema_fingerprint. Without them the table is compared in full
+
+    :return: The kind of change ('new', 'alter' or None when the table is unchanged) and the table delta
+    :rtype: Tuple[Union[str, None], Dict]
+    """
+
+    table_baseline = OrderedDict(
+        [
+            ('schema_name', schema_name),
+            ('table_name', table_name)
+        ]
+    )
+    column_definitions = table_config.get('columns', {})
+
+    # Add the table definition if missing
+    existing_definition = old_configuration.get(schema_name, {}).get('tables', {}).get(table_name)
+    if not existing_definition:
+
+        # Get the constraints for the new table
+        constraints_delta = compare_constraints(
+            old_constraints={},
+            new_constraints=table_config.get('constraints')
+        )
+
+        # Add the constraints
+        if constraints_delta:
+            table_baseline['constraints'] = constraints_delta
+
+        table_baseline['column_definitions'] = column_definitions
+
+        # Add the indexes
+        indexes_delta = compare_indexes(
+            old_indexes={},
+            new_indexes=table_config.get('indexes', {})
+        )
+        if indexes_delta:
+            table_baseline['indexes'] = indexes_delta
+
+        return 'new', table_baseline
+
+    # Skip the table if the fingerprints match
+    elif _is_unchanged(table_config, existing_definition, fingerprints):
+        return None, table_baseline
+
+    # Get the altered state if any
+    else:
+        alter = False
+        existing_columns = existing_definition.get('columns', {})
+
+        # Sort the columns into new and altered ones in a single pass, referencing the definitions as they are
+        new_columns = OrderedDict()
+        alter_columns = OrderedDict()
+        matched = 0
+        for k, v in column_definitions.items():
+            existing_column = existing_columns.get(k)
+            if existing_column is None:
+                new_columns[k] = v
+                continue
+
+            matched += 1
+            if _is_unchanged(v, existing_column, fingerprints):
+                continue
+            if not _compare_dict(v, existing_column, FINGERPRINT_COLUMN_KEYS):
+                alter_columns[k] = v
+
+        # Get the columns to delete, only possible if not every existing column was matched
+        delete_columns = OrderedDict()
+        if matched != len(existing_columns):
+            for k, v in existing_columns.items():
+                if k not in column_definitions:
+                    delete_columns[k] = v
+
+        if new_columns:
+            table_baseline['new_column_definitions'] = new_columns
+            alter = True
+
+        if alter_columns:
+            table_baseline['alter_column_definitions'] = alter_columns
+            table_baseline['previous_column_definitions'] = OrderedDict(
+                [(k, existing_columns[k]) for k in alter_columns]
+            )
+            alter = True
+
+            # The type changes that rewrite the table under an ACCESS EXCLUSIVE lock
+            rewritten_columns = [
+                k for k, v in alter_columns.items()
+                if not is_metadata_only_change(existing_columns[k].get('data_type_stmt'), v['data_type_stmt'])
             ]
+            if rewritten_columns:
+                table_baseline['rewritten_columns'] = rewritten_columns
+
+        if delete_columns:
+            table_baseline['delete_column_definitions'] = delete_columns
+            alter = True
+
+        # Check constraints
+        constraints_delta = compare_constraints(
+            old_constraints=existing_definition.get('constraints', {}),
+            new_constraints=table_config.get('constraints')
         )
-        tables = schema_config.get('tables', {})
-
-        # Extract the table definitions
-        for table_name, table_config in tables.items():
-            table_baseline = deepcopy(schema_baseline)
-            table_baseline['table_name'] = table_name
-            column_definitions = table_config.get('columns', {})
-
-            # Add the table definition if missing
-            existing_definition = old_configuration.get(schema_name, {}).get('tables', {}).get(table_name)
-            if not existing_definition:
-
-                # Get the constraints for the new table
-                constraints_delta = compare_constraints(
-                    old_constraints={},
-                    new_constraints=table_config.get('constraints')
-                )
 
-                # Add the constraints
-                if constraints_delta:
-                    table_baseline['constraints'] = constraints_delta
-
-                table_baseline['column_definitions'] = column_definitions
-                delta['tables']['new'].append(table_baseline)
-
-            # Get the altered state if any
-            else:
-                alter = False
-                existing_columns = existing_definition.get('columns', {})
-
-                # Get any new column definitions
-                new_columns = OrderedDict(
-                    [
-                        (k, v)
-                        for k, v
-                        in column_definitions.items()
-                        if k not in existing_columns
-                    ]
-                )
+        if constraints_delta:
+            table_baseline['constraints'] = constraints_delta
+            alter = True
 
-                if new_columns:
-                    table_baseline['new_column_definitions'] = new_columns
-                    alter = True
-
-                # Get updated columns
-                alter_columns = OrderedDict(
-                    [
-                        (k, v)
-                        for k, v
-                        in column_definitions.items()
-                        if k in existing_columns and (
-                        not _compare_dict(
-                            v,
-                            existing_columns.get(k, {}),
-                            [
-                                'data_type',
-                                'character_maximum_length',
-                                'nullable',
-                                'data_type_stmt'
-                            ]
-                        )
-                    )
-                    ]
-                )
+        # Check indexes
+        indexes_delta = compare_indexes(
+            old_indexes=existing_definition.get('indexes', {}),
+            new_indexes=table_config.get('indexes', {})
+        )
 
-                if alter_columns:
-                    table_baseline['alter_column_definitions'] = alter_columns
-                    alter = True
-
-                # Get the columns to delete
-                delete_columns = OrderedDict(
-                    [
-                        (k, v)
-                        for k, v
-                        in existing_columns.items()
-                        if k not in column_definitions
-                    ]
-                )
-                if delete_columns:
-                    table_baseline['delete_column_definitions'] = delete_columns
-                    alter = True
-
-                # Check constraints
-                constraints_delta = compare_constraints(
-                    old_constraints=existing_definition.get('constraints', {}),
-                    new_constraints=table_config.get('constraints')
-                )
+        if indexes_delta:
+            table_baseline['indexes'] = indexes_delta
+            alter = True
 
-                if constraints_delta:
-                    table_baseline['constraints'] = constraints_delta
-                    alter = True
+        # Set the alter statements if needed
+        if alter:
 
-                # Set the alter statements if needed
-                if alter:
-                    delta['tables']['alter'].append(table_baseline)
-                # TODO: Add support for constraints
+            # The tables referenced by the foreign keys of the table, see get_delta_plan
+            referenced_tables = []
+            for foreign_key in existing_definition.get('constraints', {}).get('foreign_keys', {}).values():
+                referenced_table = [foreign_key['foreign_schema'], foreign_key['foreign_table']]
+                if referenced_table != [schema_name, table_name] and referenced_table not in referenced_tables:
+                    referenced_tables.append(referenced_table)
+            if referenced_tables:
+                table_baseline['referenced_tables'] = referenced_tables
 
-    return delta
+            return 'alter', table_baseline
 
+    return None, table_baseline
 
-def get_delta_statement(old_configuration: Dict, new_configuration: Dict) -> str:
+
+def get_delta_statement(old_configuration: Dict,
+                        new_configuration: Dict,
+                        jobs: Union[int, None] = None,
+                        online: bool = False,
+                        coalesce: bool = False) -> str:
     """Function to generate a delta based on the given configurations
 
+    Indexes are created and dropped concurrently, these statements can not run inside a transaction block. Run the
+    script one statement at a time in autocommit mode, as psql does by default, or use execute_delta.
+
     :param Dict old_configuration: The baseline configuration
     :param new_configuration: The desired configuration
+    :param Union[int, None] jobs: If set, compare the schemas and generate their statements in a process pool with
+        this many processes. The script is the same as without a pool
+    :param bool online: Whether to alter columns in a way that keeps the tables writable where possible, see
+        statements.alter_table_online
+    :param bool coalesce: Whether to merge the changes of each altered table into as few alter table statements as
+        possible, see statements.alter_table_coalesced
 
     :return: Delta script
     :rtype: str
     """
 
-    delta = get_delta(old_configuration, new_configuration)
-
     statement_list = []
-    for schema in delta['schema']['new']:
-        statement_list.append(statements.create_schema(schema))
-
-    for table in delta['tables']['new']:
-        statement_list.extend(
-            statements.create_table(
-                schema_name=table['schema_name'],
-                table_name=table['table_name'],
-                column_definitions=table['column_definitions']
-            )
-        )
+    for schema in new_configuration:
+        if schema not in old_configuration:
+            statement_list.append(statements.create_schema(schema))
 
-        # Add constraints
-        constraint_statements = create_constraint_statements(
-            schema_name=table['schema_name'],
-            table_name=table['table_name'],
-            constraints=table.get('constraints', {}),
-        )
-        statement_list.extend(constraint_statements['create'])
+    # The new tables of all schemas are created before any table is altered
+    new_statements = []
+    alter_statements = []
+    get_schema_statements = partial(_get_schema_statements, online=online, coalesce=coalesce)
+    for new_tables, alter_tables in _map_schemas(get_schema_statements, old_configuration, new_configuration, jobs):
+        new_statements.extend(new_tables)
+        alter_statements.extend(alter_tables)
 
-    # Add the alter table statements
-    for table in delta['tables']['alter']:
-        constraint_statements = create_constraint_statements(
-            schema_name=table['schema_name'],
-            table_name=table['table_name'],
-            constraints=table.get('constraints', {}),
-        )
+    statement_list.extend(new_statements)
+    statement_list.extend(alter_statements)
 
-        # Drop the constraints
-        statement_list.extend(constraint_statements['drop'])
+    return join_statements(statement_list)
 
-        # Alter the columns
-        statement_list.extend(
-            statements.alter_table(
-                schema_name=table['schema_name'],
-                table_name=table['table_name'],
-                new_column_definitions=table.get('new_column_definitions', {}),
-                alter_column_definitions=table.get('alter_column_definitions', {}),
-                delete_column_definitions=table.get('delete_column_definitions', {})
-            )
-        )
 
-        # Add the create constraint statements
-        statement_list.extend(constraint_statements['create'])
+def iter_delta_statements(old_configuration: Dict,
+                          new_configuration: Dict,
+                          online: bool = False,
+                          coalesce: bool = False) -> Iterator[str]:
+    """Function to generate the delta statements one at a time
+
+    The statements are generated lazily in the order of get_delta_statement, so memory does not grow with the size of
+    the script and the first statements can be executed before the rest are generated.
+
+    :param Dict old_configuration: The baseline configuration
+    :param new_configuration: The desired configuration
+    :param bool online: Whether to alter columns in a way that keeps the tables writable where possible
+    :param bool coalesce: Whether to merge the changes of each altered table into as few statements as possible
+
+    :return: Generator yielding the statements, without the terminating semicolons
+    :rtype: Iterator[str]
+    """
+
+    for schema in new_configuration:
+        if schema not in old_configuration:
+            yield statements.create_schema(schema)
+
+    # The new tables of all schemas are created before any table is altered
+    fingerprints = {}
+    get_alter_statements = partial(get_alter_table_statements, online=online, coalesce=coalesce)
+    for kind, get_statements in (('new', get_new_table_statements), ('alter', get_alter_statements)):
+        for schema_name, schema_config in new_configuration.items():
+            old_schema_config = old_configuration.get(schema_name)
+            if _is_unchanged_schema(schema_config, old_schema_config, fingerprints):
+                continue
+
+            old_tables = (old_schema_config or {}).get('tables', {})
+            for table_name, table_config in schema_config.get('tables', {}).items():
+                is_new = not old_tables.get(table_name)
+                if is_new != (kind == 'new'):
+                    continue
+
+                table_kind, table_delta = get_table_delta(
+                    old_configuration=old_configuration,
+                    schema_name=schema_name,
+                    table_name=table_name,
+                    table_config=table_config,
+                    fingerprints=fingerprints
+                )
+                if table_kind == kind:
+                    yield from get_statements(table_delta)
+
+
+def write_delta_statement(old_configuration: Dict,
+                          new_configuration: Dict,
+                          file: TextIO,
+                          online: bool = False,
+                          coalesce: bool = False) -> int:
+    """Function to write the delta script to a file as it is generated
+
+    The written script is identical to the one returned by get_delta_statement. Sockets can be written to through
+    socket.makefile('w').
+
+    :param Dict old_configuration: The baseline configuration
+    :param new_configuration: The desired configuration
+    :param TextIO file: The text file to write to
+    :param bool online: Whether to alter columns in a way that keeps the tables writable where possible
+    :param bool coalesce: Whether to merge the changes of each altered table into as few statements as possible
+
+    :return: The number of statements written
+    :rtype: int
+    """
+
+    count = 0
+    for statement in iter_delta_statements(old_configuration, new_configuration, online, coalesce):
+        if count:
+            file.write(';\n\n')
+        file.write(statement)
+        count += 1
+
+    if count:
+        file.write(';')
+
+    return count
+
+
+def join_statements(statement_list: List[str]) -> str:
+    """Function to join statements into a delta script
+
+    :param List[str] statement_list: The statements
+
+    :return: Delta script
+    :rtype: str
+    """
 
     if statement_list:
         return ';\n\n'.join(statement_list) + ';'
@@ -231,12 +359,213 @@ def compare_constraints(old_constraints: Dict, new_constraints: Dict) -> Dict:
     return pk_change
 
 
-def _compare_dict(old: Dict, new: Dict, keys: List[str]) -> bool:
+def compare_indexes(old_indexes: Dict, new_indexes: Dict) -> Dict:
+    """Function to figure out which indexes are new and or deleted, a changed index is dropped and created again
+
+    :param Dict old_indexes: The existing indexes
+    :param Dict new_indexes: The desired indexes
+
+    :return: The altered indexes
+    :rtype: Dict
+    """
+
+    index_change = OrderedDict()
+
+    drop_indexes = OrderedDict()
+    for name, index in old_indexes.items():
+        if name not in new_indexes or not _compare_dict(index, new_indexes[name], FINGERPRINT_INDEX_KEYS):
+            drop_indexes[name] = index
+
+    new_indexes_delta = OrderedDict()
+    for name, index in new_indexes.items():
+        if name not in old_indexes or name in drop_indexes:
+            new_indexes_delta[name] = index
+
+    if drop_indexes:
+        index_change['drop_indexes'] = drop_indexes
+    if new_indexes_delta:
+        index_change['new_indexes'] = new_indexes_delta
+
+    return index_change
+
+
+def _map_schemas(function: Callable, old_configuration: Dict, new_configuration: Dict, jobs: Union[int, None]) -> List:
+    """Function for applying a per-schema function to the changed schemas, optionally in a process pool
+
+    The results are returned in schema order either way, so the output does not depend on the number of jobs.
+
+    :param Callable function: Function taking the schema name, the desired and the baseline schema configuration and
+        the fingerprints
+    :param Dict old_configuration: The baseline configuration
+    :param Dict new_configuration: The desired configuration
+    :param Union[int, None] jobs: The number of processes, None to run in this process
+
+    :return: The results of the function for each schema
+    :rtype: List
+    """
+
+    fingerprints = {}
+    schemas = OrderedDict()
+    for schema_name, schema_config in new_configuration.items():
+        old_schema_config = old_configuration.get(schema_name)
+
+        # Skip the schema if none of its tables changed
+        if _is_unchanged_schema(schema_config, old_schema_config, fingerprints):
+            continue
+
+        schemas[schema_name] = (schema_config, old_schema_config)
+
+    if jobs is None or jobs < 2 or len(schemas) < 2:
+        return [
+            function(schema_name, schema_config, old_schema_config, fingerprints)
+            for schema_name, (schema_config, old_schema_config) in schemas.items()
+        ]
+
+    # The schemas are handed to the workers once when they start, which avoids pickling them when the workers are
+    # forked, so only the names are sent with each task. The fingerprints are keyed by id() and do not carry over,
+    # each worker computes them again for its schemas. Several schemas are handed out at a time, while leaving
+    # enough chunks to balance uneven schemas.
+    chunksize = max(1, len(schemas) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_set_worker_schemas, initargs=(schemas, )) as executor:
+        return list(executor.map(partial(_call_with_worker_schema, function), schemas, chunksize=chunksize))
+
+
+def _set_worker_schemas(schemas: Dict):
+    """Function for setting the schemas of a worker process of _map_schemas
+
+    :param Dict schemas: The desired and the baseline configuration of each schema, by name
+    """
+    global _worker_schemas
+    _worker_schemas = schemas
+
+
+def _call_with_worker_schema(function: Callable, schema_name: str):
+    """Function for applying a per-schema function to a schema of the worker process
+
+    :param Callable function: Function taking the schema name, the desired and the baseline schema configuration and
+        the fingerprints
+    :param str schema_name: The name of the schema
+
+    :return: The result of the function
+    """
+    schema_config, old_schema_config = _worker_schemas[schema_name]
+    return function(schema_name, schema_config, old_schema_config, {})
+
+
+def _get_schema_delta(schema_name: str,
+                      schema_config: Dict,
+                      old_schema_config: Union[Dict, None],
+                      fingerprints: Dict[int, str]) -> Tuple[List[Dict], List[Dict]]:
+    """Function to generate the table deltas of a single schema
+
+    :param str schema_name: The name of the schema
+    :param Dict schema_config: The desired schema configuration
+    :param Union[Dict, None] old_schema_config: The baseline schema configuration, None if the schema is new
+    :param Dict[int, str] fingerprints: The fingerprints computed so far, see get_schema_fingerprint
+
+    :return: The new and the altered table deltas
+    :rtype: Tuple[List[Dict], List[Dict]]
+    """
+
+    if _is_unchanged_schema(schema_config, old_schema_config, fingerprints):
+        return [], []
+
+    old_configuration = {schema_name: old_schema_config} if old_schema_config is not None else {}
+
+    table_deltas = OrderedDict(
+        [
+            ('new', []),
+            ('alter', [])
+        ]
+    )
+    for table_name, table_config in schema_config.get('tables', {}).items():
+        kind, table_baseline = get_table_delta(
+            old_configuration=old_configuration,
+            schema_name=schema_name,
+            table_name=table_name,
+            table_config=table_config,
+            fingerprints=fingerprints
+        )
+        if kind is not None:
+            table_deltas[kind].append(table_baseline)
+
+    return table_deltas['new'], table_deltas['alter']
+
+
+def _get_schema_statements(schema_name: str,
+                           schema_config: Dict,
+                           old_schema_config: Union[Dict, None],
+                           fingerprints: Dict[int, str],
+                           online: bool = False,
+                           coalesce: bool = False) -> Tuple[List[str], List[str]]:
+    """Function to generate the table statements of a single schema
+
+    :param str schema_name: The name of the schema
+    :param Dict schema_config: The desired schema configuration
+    :param Union[Dict, None] old_schema_config: The baseline schema configuration, None if the schema is new
+    :param Dict[int, str] fingerprints: The fingerprints computed so far, see get_schema_fingerprint
+    :param bool online: Whether to alter columns in a way that keeps the tables writable where possible
+    :param bool coalesce: Whether to merge the changes of each altered table into as few statements as possible
+
+    :return: The statements creating the new tables and the statements altering the existing ones
+    :rtype: Tuple[List[str], List[str]]
+    """
+
+    new_tables, alter_tables = _get_schema_delta(schema_name, schema_config, old_schema_config, fingerprints)
+
+    new_statements = []
+    for table in new_tables:
+        new_statements.extend(get_new_table_statements(table))
+
+    alter_statements = []
+    for table in alter_tables:
+        alter_statements.extend(get_alter_table_statements(table, online, coalesce))
+
+    return new_statements, alter_statements
+
+
+def _is_unchanged_schema(schema_config: Dict,
+                         old_schema_config: Union[Dict, None],
+                         fingerprints: Dict[int, str]) -> bool:
+    """Function for checking whether a schema is unchanged, computing the fingerprints of both schemas if missing
+
+    :param Dict schema_config: The desired schema configuration
+    :param Union[Dict, None] old_schema_config: The baseline schema configuration, None if the schema is new
+    :param Dict[int, str] fingerprints: The fingerprints computed so far, see get_schema_fingerprint
+
+    :return: Whether both have a fingerprint and the fingerprints match
+    :rtype: bool
+    """
+    if old_schema_config is None:
+        return False
+
+    fingerprint = get_schema_fingerprint(schema_config, fingerprints)
+    return fingerprint is not None and fingerprint == get_schema_fingerprint(old_schema_config, fingerprints)
+
+
+def _is_unchanged(new: Dict, old: Union[Dict, None], fingerprints: Union[Dict[int, str], None]) -> bool:
+    """Function for checking whether a table or column is unchanged based on the fingerprints
+
+    :param Dict new: The desired configuration
+    :param Union[Dict, None] old: The baseline configuration
+    :param Union[Dict[int, str], None] fingerprints: The fingerprints, see get_schema_fingerprint
+
+    :return: Whether both have a fingerprint and the fingerprints match
+    :rtype: bool
+    """
+    if not old or fingerprints is None:
+        return False
+
+    fingerprint = fingerprints.get(id(new))
+    return fingerprint is not None and fingerprint == fingerprints.get(id(old))
+
+
+def _compare_dict(old: Dict, new: Dict, keys: Iterable[str]) -> bool:
     """Function for comparing a flat dictionary across specified keys
 
     :param Dict old: baseline dict
     :param Dict new: comparative dict
-    :param List[str] keys: The keys to compare
+    :param Iterable[str] keys: The keys to compare
 
     :return: Whether the dicts are equal for all keys
     :rtype: bool
@@ -245,9 +574,8 @@ def _compare_dict(old: Dict, new: Dict, keys: List[str]) -> bool:
     try:
         for key in keys:
             if new[key] != old[key]:
-                print(key)
                 return False
-    except:
+    except KeyError:
         return False
 
     return True
@@ -276,3 +604,133 @@ def _check_constraints(active: List[Dict], desired: List[Dict]) -> bool:
             return True
 
     return False
+
+
+def get_new_table_statements(table: Dict) -> List[str]:
+    """Function to generate the statements creating a new table of the delta
+
+    :param Dict table: The table delta
+
+    :return: The statements
+    :rtype: List[str]
+    """
+
+    statement_list = statements.create_table(
+        schema_name=table['schema_name'],
+        table_name=table['table_name'],
+        column_definitions=table['column_definitions']
+    )
+
+    # Add constraints
+    constraint_statements = create_constraint_statements(
+        schema_name=table['schema_name'],
+        table_name=table['table_name'],
+        constraints=table.get('constraints', {}),
+    )
+    statement_list.extend(constraint_statements['create'])
+
+    # Add the indexes
+    index_statements = create_index_statements(
+        schema_name=table['schema_name'],
+        table_name=table['table_name'],
+        indexes=table.get('indexes', {}),
+    )
+    statement_list.extend(index_statements['create'])
+
+    return statement_list
+
+
+def get_alter_table_statements(table: Dict, online: bool = False, coalesce: bool = False) -> List[str]:
+    """Function to generate the statements altering an existing table of the delta
+
+    :param Dict table: The table delta
+    :param bool online: Whether to alter the columns in a way that keeps the table writable where possible
+    :param bool coalesce: Whether to merge the changes into as few statements as possible
+
+    :return: The statements
+    :rtype: List[str]
+    """
+
+    index_statements = create_index_statements(
+        schema_name=table['schema_name'],
+        table_name=table['table_name'],
+        indexes=table.get('indexes', {}),
+    )
+
+    # Drop the indexes first, they may cover columns that are altered or deleted
+    statement_list = list(index_statements['drop'])
+
+    if coalesce:
+        statement_list.extend(get_coalesced_table_statements(table, online))
+
+    else:
+        constraint_statements = create_constraint_statements(
+            schema_name=table['schema_name'],
+            table_name=table['table_name'],
+            constraints=table.get('constraints', {}),
+        )
+
+        # Drop the constraints
+        statement_list.extend(constraint_statements['drop'])
+
+        # Alter the columns
+        statement_list.extend(get_alter_column_statements(table, online))
+
+        # Add the create constraint statements
+        statement_list.extend(constraint_statements['create'])
+
+    # Create the indexes once the columns are in place
+    statement_list.extend(index_statements['create'])
+
+    return statement_list
+
+
+def get_coalesced_table_statements(table: Dict, online: bool = False) -> List[str]:
+    """Function to generate the merged statements altering the columns and constraints of an existing table of the
+    delta, see statements.alter_table_coalesced
+
+    :param Dict table: The table delta
+    :param bool online: Whether to alter the columns in a way that keeps the table writable where possible
+
+    :return: The statements
+    :rtype: List[str]
+    """
+    return statements.alter_table_coalesced(
+        schema_name=table['schema_name'],
+        table_name=table['table_name'],
+        new_column_definitions=table.get('new_column_definitions', {}),
+        alter_column_definitions=table.get('alter_column_definitions', {}),
+        delete_column_definitions=table.get('delete_column_definitions', {}),
+        constraint_actions=create_constraint_actions(table.get('constraints', {})),
+        previous_column_definitions=table.get('previous_column_definitions', {}),
+        online=online
+    )
+
+
+def get_alter_column_statements(table: Dict, online: bool = False) -> List[str]:
+    """Function to generate the statements adding, altering and deleting the columns of an existing table of the delta
+
+    :param Dict table: The table delta
+    :param bool online: Whether to alter the columns in a way that keeps the table writable where possible
+
+    :return: The statements
+    :rtype: List[str]
+    """
+
+    if online:
+        return statements.alter_table_online(
+            schema_name=table['schema_name'],
+            table_name=table['table_name'],
+            new_column_definitions=table.get('new_column_definitions', {}),
+            alter_column_definitions=table.get('alter_column_definitions', {}),
+            delete_column_definitions=table.get('delete_column_definitions', {}),
+            previous_column_definitions=table.get('previous_column_definitions', {})
+        )
+
+    return statements.alter_table(
+        schema_name=table['schema_name'],
+        table_name=table['table_name'],
+        new_column_definitions=table.get('new_column_definitions', {}),
+        alter_column_definitions=table.get('alter_column_definitions', {}),
+        delete_column_definitions=table.get('delete_column_definitions', {})
+    )
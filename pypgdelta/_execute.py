@@ -0,0 +1,248 @@
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Union
+
+from ._plan import get_delta_plan
+from .sql.state._concurrent import _acquire_connections, _release_connections
+
+# The seconds between the cancel requests sent to the statements still running once the execution is stopped
+_CANCEL_INTERVAL = 0.1
+
+
+def execute_delta(delta: Dict,
+                  source: Union[str, psycopg2.pool.AbstractConnectionPool],
+                  max_connections: int = 4,
+                  fail_fast: bool = True,
+                  on_step: Union[Callable[[Dict], None], None] = None,
+                  online: bool = False,
+                  coalesce: bool = False) -> Dict:
+    """Function for applying a delta, running the statements of independent tables concurrently
+
+    The statements are scheduled following get_delta_plan: a statement starts as soon as the statements it depends on
+    have succeeded and a connection is free. Each statement runs in its own transaction on one of at most
+    max_connections connections, except for the concurrent index statements, which can not run inside a transaction
+    block and run in autocommit mode.
+
+    Once the execution is stopped, a statement that finishes anyway is rolled back and reported as cancelled. A
+    concurrent index statement can not be rolled back, it is cancelled repeatedly until it finishes, and reported as
+    succeeded if it completes before a cancel request reaches it.
+
+    :param Dict delta: The delta, as returned by get_delta
+    :param Union[str, psycopg2.pool.AbstractConnectionPool] source: A DSN or a (threaded) connection pool providing
+        the connections
+    :param int max_connections: The maximum number of statements running at the same time, at least 1
+    :param bool fail_fast: Whether to stop at the first failing statement, cancelling the statements still running.
+        Otherwise only the statements depending on a failed statement are skipped
+    :param Union[Callable[[Dict], None], None] on_step: Called with the result of each statement once it finishes
+    :param bool online: Whether to alter columns in a way that keeps the tables writable where possible, see
+        get_delta_statement
+    :param bool coalesce: Whether to merge the changes of each altered table into as few statements as possible
+
+    :return: The summary with the number of succeeded, failed, cancelled and skipped statements, the total duration
+        in seconds and the result of each statement (the plan step with its status, duration and error) in plan order
+    :rtype: Dict
+    """
+
+    if max_connections < 1:
+        raise ValueError(f'max_connections has to be at least 1, got {max_connections}')
+
+    plan = get_delta_plan(delta, online, coalesce)
+    steps = OrderedDict([(step['id'], step) for step in plan])
+    results = OrderedDict(
+        [
+            (step_id, OrderedDict([('id', step_id),
+                                   ('kind', step['kind']),
+                                   ('schema_name', step['schema_name']),
+                                   ('table_name', step['table_name']),
+                                   ('statement', step['statement']),
+                                   ('rewrites', step['rewrites']),
+                                   ('status', 'skipped'),
+                                   ('duration', None),
+                                   ('error', None)]))
+            for step_id, step in steps.items()
+        ]
+    )
+
+    start = time.perf_counter()
+    if plan:
+        _run_steps(steps, results, source, max_connections, fail_fast, on_step)
+
+    summary = OrderedDict()
+    for status in ('succeeded', 'failed', 'cancelled', 'skipped'):
+        summary[status] = sum(1 for result in results.values() if result['status'] == status)
+    summary['duration'] = time.perf_counter() - start
+    summary['steps'] = list(results.values())
+
+    return summary
+
+
+def _run_steps(steps: Dict,
+               results: Dict,
+               source: Union[str, psycopg2.pool.AbstractConnectionPool],
+               max_connections: int,
+               fail_fast: bool,
+               on_step: Union[Callable[[Dict], None], None]):
+    """Function for running the plan steps on a bounded number of connections, see execute_delta
+
+    :param Dict steps: The plan steps by id
+    :param Dict results: The results by id, updated in place
+    :param Union[str, psycopg2.pool.AbstractConnectionPool] source: The DSN or connection pool
+    :param int max_connections: The maximum number of connections
+    :param bool fail_fast: Whether to stop at the first failing statement
+    :param Union[Callable[[Dict], None], None] on_step: Called with the result of each statement once it finishes
+    """
+
+    # Track the number of unfinished dependencies of every step
+    dependents = {step_id: [] for step_id in steps}
+    remaining = {}
+    for step_id, step in steps.items():
+        remaining[step_id] = len(step['depends_on'])
+        for dependency in step['depends_on']:
+            dependents[dependency].append(step_id)
+    ready = deque([step_id for step_id, count in remaining.items() if count == 0])
+
+    connections = _acquire_connections(source, min(max_connections, len(steps)))
+    autocommit = [connection.autocommit for connection in connections]
+    idle = queue.Queue()
+    for connection in connections:
+        idle.put(connection)
+
+    # The connections running a statement, guarded by the lock so cancellation only reaches running statements
+    running_connections = {}
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+            futures = {}
+            while ready or futures:
+                while ready and len(futures) < len(connections):
+                    step_id = ready.popleft()
+                    future = executor.submit(
+                        _run_step, steps[step_id], results[step_id], idle, running_connections, lock, stopped
+                    )
+                    futures[future] = step_id
+
+                # A cancel request reaching a connection before its statement does is lost, so the statements still
+                # running are cancelled again until they finish
+                timeout = _CANCEL_INTERVAL if stopped.is_set() else None
+                done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    _cancel(running_connections, lock, stopped)
+
+                for future in done:
+                    step_id = futures.pop(future)
+                    future.result()
+                    result = results[step_id]
+                    if on_step is not None and result['status'] != 'skipped':
+                        on_step(result)
+
+                    if result['status'] == 'succeeded' and not stopped.is_set():
+                        for dependent in dependents[step_id]:
+                            remaining[dependent] -= 1
+                            if remaining[dependent] == 0:
+                                ready.append(dependent)
+
+                    elif fail_fast and not stopped.is_set():
+                        _cancel(running_connections, lock, stopped)
+                        ready.clear()
+
+    finally:
+        for connection, previous_autocommit in zip(connections, autocommit):
+            if not connection.closed:
+                connection.autocommit = previous_autocommit
+        _release_connections(source, connections)
+
+
+def _run_step(step: Dict,
+              result: Dict,
+              idle: queue.Queue,
+              running_connections: Dict,
+              lock: threading.Lock,
+              stopped: threading.Event):
+    """Function for running the statement of a plan step on an idle connection
+
+    :param Dict step: The plan step
+    :param Dict result: The result of the step, updated in place
+    :param queue.Queue idle: The idle connections
+    :param Dict running_connections: The connections running a statement, by step id
+    :param threading.Lock lock: The lock guarding running_connections
+    :param threading.Event stopped: Set once the execution is stopped, the step is skipped if it did not start yet
+    """
+
+    connection = idle.get()
+    try:
+        with lock:
+            if stopped.is_set():
+                return
+            running_connections[step['id']] = connection
+
+        # The concurrent index statements can not run inside a transaction block
+        transaction = step['kind'] != 'index'
+        start = time.perf_counter()
+        try:
+            connection.autocommit = not transaction
+            with connection.cursor() as cursor:
+                cursor.execute(step['statement'])
+
+            # A cancel request sent before the statement reached the server is lost. Once the step is removed from the
+            # running connections it is no longer cancelled, so it is only committed if the execution was not stopped
+            # by then
+            with lock:
+                del running_connections[step['id']]
+                is_stopped = stopped.is_set()
+
+            if transaction and is_stopped:
+                result['status'] = 'cancelled'
+                result['error'] = 'The execution was stopped while the statement was running'
+            else:
+                if transaction:
+                    connection.commit()
+                result['status'] = 'succeeded'
+
+        except psycopg2.extensions.QueryCanceledError as error:
+            result['status'] = 'cancelled'
+            result['error'] = str(error)
+        except psycopg2.Error as error:
+            result['status'] = 'failed'
+            result['error'] = str(error)
+        finally:
+            result['duration'] = time.perf_counter() - start
+            with lock:
+                running_connections.pop(step['id'], None)
+            if transaction and result['status'] != 'succeeded':
+                _rollback(connection)
+
+    finally:
+        idle.put(connection)
+
+
+def _rollback(connection: psycopg2.extensions.connection):
+    """Function for rolling back the transaction of a failed or cancelled step, so the connection can be reused
+
+    :param psycopg2.extensions.connection connection: The connection
+    """
+    try:
+        connection.rollback()
+    except psycopg2.Error:
+        pass
+
+
+def _cancel(running_connections: Dict, lock: threading.Lock, stopped: threading.Event):
+    """Function for stopping the execution, cancelling the statements that are still running
+
+    :param Dict running_connections: The connections running a statement, by step id
+    :param threading.Lock lock: The lock guarding running_connections
+    :param threading.Event stopped: Set to keep steps that did not start yet from running
+    """
+
+    with lock:
+        stopped.set()
+        for connection in running_connections.values():
+            connection.cancel()
@@ -0,0 +1,125 @@
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Dict, Union
+
+from ._model import Node
+
+# The column keys get_delta compares, these make up the column fingerprints
+FINGERPRINT_COLUMN_KEYS = ('data_type', 'character_maximum_length', 'nullable', 'data_type_stmt')
+
+# The index keys get_delta compares
+FINGERPRINT_INDEX_KEYS = ('columns', 'unique', 'method')
+
+
+def get_configuration_fingerprint(configuration: Dict) -> str:
+    """Function for getting a fingerprint of a configuration, equal configurations get equal fingerprints
+
+    The key order is part of the fingerprint, as it determines the order of the generated statements.
+
+    :param Dict configuration: The configuration, as returned by get_state or construct_configuration
+
+    :return: The hex encoded sha256 digest
+    :rtype: str
+    """
+
+    serialized = json.dumps(configuration, separators=(',', ':'), default=_encode)
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
+def get_schema_fingerprint(schema_config: Mapping, fingerprints: Dict[int, str]) -> Union[str, None]:
+    """Function for getting the fingerprint of a schema, adding the fingerprints of its tables and columns
+
+    The fingerprints hash only the content get_delta looks at: the column types and nullability, the columns of a
+    table in order, its primary key and indexes, and the tables of a schema in order. They are kept in a side table
+    keyed by the id() of each schema, table and column instead of on the configuration, so the side table is only
+    valid while the configurations are alive and unchanged; get_delta builds a new one on every call. Columns missing
+    any of the compared keys get no fingerprint, and neither do the tables and schemas containing them.
+
+    :param Mapping schema_config: The schema configuration
+    :param Dict[int, str] fingerprints: The fingerprints computed so far, by id() of the schema, table or column
+
+    :return: The fingerprint of the schema, None if any of its columns could not be fingerprinted
+    :rtype: Union[str, None]
+    """
+
+    schema_id = id(schema_config)
+    if schema_id in fingerprints:
+        return fingerprints[schema_id]
+
+    column_fingerprints = {}
+    schema_hash = hashlib.blake2b(digest_size=16)
+    for table_name, table_config in schema_config.get('tables', {}).items():
+        table_fingerprint = _get_table_fingerprint(table_config, fingerprints, column_fingerprints)
+        if schema_hash is not None and table_fingerprint is not None:
+            schema_hash.update(f'{table_name}\0{table_fingerprint}\0'.encode('utf-8'))
+        else:
+            schema_hash = None
+
+    schema_fingerprint = schema_hash.hexdigest() if schema_hash is not None else None
+    fingerprints[schema_id] = schema_fingerprint
+    return schema_fingerprint
+
+
+def _get_table_fingerprint(table_config: Mapping, fingerprints: Dict[int, str],
+                           column_fingerprints: Dict) -> Union[str, None]:
+    """Function for getting the fingerprint of a table, adding the fingerprints of its columns
+
+    :param Mapping table_config: The table configuration
+    :param Dict[int, str] fingerprints: The fingerprints computed so far, by id() of the schema, table or column
+    :param Dict column_fingerprints: The column fingerprints computed so far, by column content
+
+    :return: The fingerprint of the table, None if any of its columns could not be fingerprinted
+    :rtype: Union[str, None]
+    """
+
+    parts = []
+    for column_name, column_config in table_config.get('columns', {}).items():
+        try:
+            content = (
+                column_config['data_type'],
+                column_config['character_maximum_length'],
+                column_config['nullable'],
+                column_config['data_type_stmt']
+            )
+        except KeyError:
+            parts = None
+            continue
+
+        # Most columns share their content with many others, so each distinct column content is hashed only once
+        column_fingerprint = column_fingerprints.get(content)
+        if column_fingerprint is None:
+            column_fingerprint = hashlib.blake2b(repr(content).encode('utf-8'), digest_size=16).hexdigest()
+            column_fingerprints[content] = column_fingerprint
+        fingerprints[id(column_config)] = column_fingerprint
+        if parts is not None:
+            parts.append(column_name)
+            parts.append(column_fingerprint)
+
+    table_fingerprint = None
+    if parts is not None:
+        primary_key = table_config.get('constraints', {}).get('primary_key', {})
+        parts.append(repr((primary_key.get('name'), tuple(primary_key.get('columns', [])))))
+
+        indexes = table_config.get('indexes')
+        if indexes:
+            parts.append(repr(sorted(
+                (index_name, tuple(index.get('columns', [])), index.get('unique'), index.get('method'))
+                for index_name, index in indexes.items()
+            )))
+        table_fingerprint = hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+    fingerprints[id(table_config)] = table_fingerprint
+    return table_fingerprint
+
+
+def _encode(value):
+    """Function for serializing the values json does not handle, the object model is serialized as its dict
+
+    :param value: The value
+
+    :return: The serializable value
+    """
+    if isinstance(value, Node):
+        return value.to_dict()
+    return str(value)
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Tuple
+
+import psycopg2
+
+from ._delta import get_delta_statement
+from ._fingerprint import get_configuration_fingerprint
+from .sql.state import get_state
+
+
+def get_fleet_delta_statements(connections: Dict,
+                               new_configuration: Dict,
+                               max_workers: int = 8,
+                               **state_options) -> Tuple[Dict[str, str], Dict[str, psycopg2.Error]]:
+    """Function for generating the delta scripts for many databases against one desired configuration
+
+    The databases are introspected concurrently, and databases with identical states share one delta computation.
+    Each state is fingerprinted as soon as it arrives and dropped once the delta script of its fingerprint is known,
+    so at most max_workers states are kept in memory regardless of the size of the fleet. A database that can not be
+    introspected, e.g. because it is unreachable, does not stop the others: its error is returned instead of a script.
+
+    :param Dict connections: The databases by name, each given as a connection, connection pool or DSN
+    :param Dict new_configuration: The desired configuration
+    :param int max_workers: The maximum number of databases introspected at the same time
+    :param state_options: Additional keyword arguments passed on to get_state, e.g. filters
+
+    :return: The delta script of each database that could be introspected and the error of each database that could
+        not, both by name
+    :rtype: Tuple[Dict[str, str], Dict[str, psycopg2.Error]]
+    """
+
+    fingerprints = {}
+    scripts = {}
+    errors = {}
+    pending = iter(connections.items())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(get_state, connection, **state_options): name
+            for name, connection in islice(pending, max_workers)
+        }
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures.pop(future)
+                try:
+                    state = future.result()
+                except psycopg2.Error as e:
+                    errors[name] = e
+                else:
+                    # Generate one delta script per distinct state
+                    fingerprint = get_configuration_fingerprint(state)
+                    fingerprints[name] = fingerprint
+                    if fingerprint not in scripts:
+                        scripts[fingerprint] = get_delta_statement(state, new_configuration)
+
+                for next_name, connection in islice(pending, 1):
+                    futures[executor.submit(get_state, connection, **state_options)] = next_name
+
+    return (
+        OrderedDict([(name, scripts[fingerprints[name]]) for name in connections if name in fingerprints]),
+        OrderedDict([(name, errors[name]) for name in connections if name in errors])
+    )
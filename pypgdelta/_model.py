@@ -0,0 +1,206 @@
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Iterator
+
+
+class Node(MutableMapping):
+    """Base class of the configuration objects
+
+    The fields are stored in __slots__ instead of a per-instance dict, and identifier strings are interned so equal
+    names share one string. A node behaves like the dict it replaces: fields are read and written by key, and a field
+    that was never set is missing, just like a missing key.
+    """
+
+    __slots__ = ()
+
+    # The fields holding nested configuration: field name -> (node class, whether the field maps names to nodes)
+    _children = {}
+
+    # The fields holding strings to intern
+    _identifiers = ()
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            delattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self.items())!r})'
+
+    @classmethod
+    def from_dict(cls, configuration: Mapping) -> 'Node':
+        """Function for getting the node of a dict configuration
+
+        :param Mapping configuration: The dict configuration
+
+        :return: The node
+        :rtype: Node
+        """
+
+        node = cls()
+        for key, value in configuration.items():
+            if key not in cls.__slots__:
+                raise ValueError(f'Unknown {cls.__name__} key {key}')
+
+            if key in cls._children:
+                node_class, is_mapping = cls._children[key]
+                if is_mapping:
+                    value = OrderedDict(
+                        [
+                            (sys.intern(name), node_class.from_dict(child))
+                            for name, child in value.items()
+                        ]
+                    )
+                elif isinstance(value, list):
+                    value = [node_class.from_dict(child) for child in value]
+                else:
+                    value = node_class.from_dict(value)
+            elif key in cls._identifiers and value is not None:
+                value = sys.intern(value)
+            elif isinstance(value, list):
+                value = [sys.intern(item) if isinstance(item, str) else item for item in value]
+
+            setattr(node, key, value)
+
+        return node
+
+    def to_dict(self) -> Dict:
+        """Function for getting the dict configuration of the node, the keys follow the field order of the class
+
+        :return: The dict configuration
+        :rtype: Dict
+        """
+
+        configuration = OrderedDict()
+        for key, value in self.items():
+            if key in self._children:
+                if self._children[key][1]:
+                    value = OrderedDict([(name, child.to_dict()) for name, child in value.items()])
+                elif isinstance(value, list):
+                    value = [child.to_dict() for child in value]
+                else:
+                    value = value.to_dict()
+            elif isinstance(value, list):
+                value = list(value)
+
+            configuration[key] = value
+
+        return configuration
+
+
+class Constraint(Node):
+    """A constraint, either a complete constraint of a table or a reference to one on a column"""
+
+    __slots__ = ('name', 'type', 'definition', 'foreign_schema', 'foreign_table', 'foreign_columns', 'columns')
+    _identifiers = ('name', 'type', 'foreign_schema', 'foreign_table')
+
+
+class Constraints(Node):
+    """The constraints of a table"""
+
+    __slots__ = ('primary_key', 'foreign_keys', 'unique', 'check')
+    _children = {
+        'primary_key': (Constraint, False),
+        'foreign_keys': (Constraint, True),
+        'unique': (Constraint, True),
+        'check': (Constraint, True),
+    }
+
+
+class Column(Node):
+    """A column of a table or view"""
+
+    __slots__ = ('data_type', 'data_type_stmt', 'character_maximum_length', 'nullable', 'constraints')
+    _children = {
+        'constraints': (Constraint, False),
+    }
+    _identifiers = ('data_type', 'data_type_stmt')
+
+
+class Index(Node):
+    """An index of a table"""
+
+    __slots__ = ('columns', 'unique', 'method')
+    _identifiers = ('method', )
+
+
+class Table(Node):
+    """A table or view"""
+
+    __slots__ = ('columns', 'constraints', 'indexes')
+    _children = {
+        'columns': (Column, True),
+        'constraints': (Constraints, False),
+        'indexes': (Index, True),
+    }
+
+
+class Schema(Node):
+    """A schema"""
+
+    __slots__ = ('tables', 'views')
+    _children = {
+        'tables': (Table, True),
+        'views': (Table, True),
+    }
+
+
+def get_configuration_model(configuration: Mapping) -> Dict[str, Schema]:
+    """Function for converting a dict configuration to the object model
+
+    The model holds the same information in a fraction of the memory and can be passed to get_delta and
+    get_delta_statement like the dict configuration.
+
+    :param Mapping configuration: The configuration, as returned by get_state or construct_configuration
+
+    :return: The schemas by name
+    :rtype: Dict[str, Schema]
+    """
+    return OrderedDict(
+        [
+            (sys.intern(schema_name), Schema.from_dict(schema_config))
+            for schema_name, schema_config in configuration.items()
+        ]
+    )
+
+
+def get_configuration_dict(configuration: Mapping) -> Dict:
+    """Function for converting a configuration in the object model back to nested dicts
+
+    :param Mapping configuration: The schemas by name
+
+    :return: The configuration
+    :rtype: Dict
+    """
+    configuration_dict = OrderedDict()
+    for schema_name, schema_config in configuration.items():
+        if not isinstance(schema_config, Schema):
+            schema_config = Schema.from_dict(schema_config)
+        configuration_dict[schema_name] = schema_config.to_dict()
+
+    return configuration_dict
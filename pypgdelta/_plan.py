@@ -0,0 +1,230 @@
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple, Union
+
+from ._delta import get_alter_column_statements, get_coalesced_table_statements
+from .sql import statements
+from .sql.statements._constraint import create_constraint_statements
+from .sql.statements._index import create_index_statements
+
+
+def get_delta_plan(delta: Dict, online: bool = False, coalesce: bool = False) -> List[Dict]:
+    """Function to generate an execution plan for a delta, with the dependencies between the statements
+
+    Every statement becomes a step depending on the steps that have to be executed before it: a new table depends on
+    the creation of its schema, the constraints and indexes of a table depend on the creation or alteration of the
+    table, and the steps altering one table depend on each other in the order of get_delta_statement. The indexes of
+    one table are built one after the other. Each step is assigned to a wave, one more than the latest wave it depends
+    on, so the steps of one wave are independent of each other and can run at the same time.
+
+    Between tables, the plan knows about the foreign keys of the baseline (as introspected by get_state): altering a
+    table locks the tables referencing it, so the steps of an altered table wait for the steps of the altered tables
+    its foreign keys reference. Dropping a primary key cascades to the foreign keys referencing it from other tables:
+    such a step is a barrier, running after every step before it, and the steps of the tables altered after it wait
+    for it. Other dependencies between tables, e.g. on views that are not part of the configuration, are not detected.
+
+    :param Dict delta: The delta, as returned by get_delta
+    :param bool online: Whether to alter columns in a way that keeps the tables writable where possible, see
+        get_delta_statement
+    :param bool coalesce: Whether to merge the changes of each altered table into as few statements as possible. The
+        merged statements are table steps
+
+    :return: The steps in topological order, each with the keys id, kind ('schema', 'table', 'column', 'constraint'
+        or 'index'), schema_name, table_name, statement, depends_on (the ids of the steps it depends on), wave and
+        rewrites (the columns whose type change in the statement rewrites the table under an ACCESS EXCLUSIVE lock)
+    :rtype: List[Dict]
+    """
+
+    steps = []
+
+    # Schemas
+    schema_steps = {}
+    for schema_name in delta['schema']['new']:
+        schema_steps[schema_name] = _add_step(
+            steps, 'schema', schema_name, None, statements.create_schema(schema_name), []
+        )
+
+    # New tables
+    for table in delta['tables']['new']:
+        schema_name = table['schema_name']
+        table_name = table['table_name']
+
+        depends_on = [schema_steps[schema_name]] if schema_name in schema_steps else []
+        for statement in statements.create_table(schema_name, table_name, table['column_definitions']):
+            table_step = _add_step(steps, 'table', schema_name, table_name, statement, depends_on)
+            depends_on = [table_step]
+
+        constraint_statements = create_constraint_statements(
+            schema_name=schema_name,
+            table_name=table_name,
+            constraints=table.get('constraints', {}),
+        )
+        for statement in constraint_statements['create']:
+            _add_step(steps, 'constraint', schema_name, table_name, statement, depends_on)
+
+        index_statements = create_index_statements(
+            schema_name=schema_name,
+            table_name=table_name,
+            indexes=table.get('indexes', {}),
+        )
+        for statement in index_statements['create']:
+            depends_on = [_add_step(steps, 'index', schema_name, table_name, statement, depends_on)]
+
+    # Altered tables, the steps of one table run one after the other
+    barrier = None
+    last_steps = {}
+    for table in _order_by_references(delta['tables']['alter']):
+        schema_name = table['schema_name']
+        table_name = table['table_name']
+
+        index_statements = create_index_statements(
+            schema_name=schema_name,
+            table_name=table_name,
+            indexes=table.get('indexes', {}),
+        )
+
+        # The statements dropping the primary key cascade to other tables
+        drops_primary_key = 'drop_pk' in table.get('constraints', {})
+        if coalesce:
+            table_steps = (('index', index_statements['drop'], False),
+                           ('table', get_coalesced_table_statements(table, online), drops_primary_key),
+                           ('index', index_statements['create'], False))
+        else:
+            constraint_statements = create_constraint_statements(
+                schema_name=schema_name,
+                table_name=table_name,
+                constraints=table.get('constraints', {}),
+            )
+            table_steps = (('index', index_statements['drop'], False),
+                           ('constraint', constraint_statements['drop'], drops_primary_key),
+                           ('column', get_alter_column_statements(table, online), False),
+                           ('constraint', constraint_statements['create'], False),
+                           ('index', index_statements['create'], False))
+
+        depends_on = [barrier] if barrier is not None else []
+        for referenced_schema, referenced_table in table.get('referenced_tables', []):
+            if (referenced_schema, referenced_table) in last_steps:
+                depends_on.append(last_steps[(referenced_schema, referenced_table)])
+
+        for kind, table_statements, cascades in table_steps:
+            for statement in table_statements:
+                if cascades:
+                    depends_on = _get_leaves(steps)
+                rewrites = [
+                    name for name in table.get('rewritten_columns', []) if f'ALTER COLUMN {name} TYPE ' in statement
+                ]
+                depends_on = [_add_step(steps, kind, schema_name, table_name, statement, depends_on, rewrites)]
+                if cascades:
+                    barrier = depends_on[0]
+                last_steps[(schema_name, table_name)] = depends_on[0]
+
+    # Every step is added after the steps it depends on, so ordering by wave keeps the order topological
+    return sorted(steps, key=lambda step: (step['wave'], step['id']))
+
+
+def get_plan_waves(plan: List[Dict]) -> List[List[Dict]]:
+    """Function to group the steps of a plan into waves of independent steps
+
+    :param List[Dict] plan: The plan, as returned by get_delta_plan
+
+    :return: The waves in execution order, each a list of steps that can be executed concurrently
+    :rtype: List[List[Dict]]
+    """
+
+    waves = []
+    for step in plan:
+        while len(waves) <= step['wave']:
+            waves.append([])
+        waves[step['wave']].append(step)
+
+    return waves
+
+
+def _order_by_references(tables: List[Dict]) -> List[Dict]:
+    """Function for ordering the altered tables of a delta so the tables referenced by foreign keys come first
+
+    Otherwise the order of the delta is kept. A cycle of references is broken at the table found first.
+
+    :param List[Dict] tables: The altered tables of the delta
+
+    :return: The tables
+    :rtype: List[Dict]
+    """
+
+    tables_by_name = OrderedDict([((table['schema_name'], table['table_name']), table) for table in tables])
+    ordered = OrderedDict()
+    for name in tables_by_name:
+        _add_referenced_first(name, tables_by_name, ordered, set())
+
+    return list(ordered.values())
+
+
+def _add_referenced_first(name: Tuple[str, str], tables_by_name: Dict, ordered: Dict, visiting: Set):
+    """Function for adding a table after the tables it references, see _order_by_references
+
+    :param Tuple[str, str] name: The schema and table name
+    :param Dict tables_by_name: The altered tables by schema and table name
+    :param Dict ordered: The ordered tables so far, updated in place
+    :param Set visiting: The tables whose references are being added
+    """
+
+    if name in ordered or name in visiting:
+        return
+
+    visiting.add(name)
+    for referenced_schema, referenced_table in tables_by_name[name].get('referenced_tables', []):
+        if (referenced_schema, referenced_table) in tables_by_name:
+            _add_referenced_first((referenced_schema, referenced_table), tables_by_name, ordered, visiting)
+    ordered[name] = tables_by_name[name]
+
+
+def _get_leaves(steps: List[Dict]) -> List[int]:
+    """Function for getting the steps no other step depends on, a step depending on these runs after every step
+
+    :param List[Dict] steps: The steps so far
+
+    :return: The ids of the steps
+    :rtype: List[int]
+    """
+
+    dependencies = {dependency for step in steps for dependency in step['depends_on']}
+    return [step['id'] for step in steps if step['id'] not in dependencies]
+
+
+def _add_step(steps: List[Dict],
+              kind: str,
+              schema_name: str,
+              table_name: Union[str, None],
+              statement: str,
+              depends_on: List[int],
+              rewrites: Union[List[str], None] = None) -> int:
+    """Function for adding a step to the plan
+
+    :param List[Dict] steps: The steps so far, the ids are the positions in this list
+    :param str kind: The kind of object the statement creates or alters
+    :param str schema_name: The name of the schema
+    :param Union[str, None] table_name: The name of the table, None for schema steps
+    :param str statement: The statement
+    :param List[int] depends_on: The ids of the steps that have to be executed first
+    :param Union[List[str], None] rewrites: The columns whose type change in the statement rewrites the table
+
+    :return: The id of the step
+    :rtype: int
+    """
+
+    step_id = len(steps)
+    steps.append(
+        OrderedDict(
+            [
+                ('id', step_id),
+                ('kind', kind),
+                ('schema_name', schema_name),
+                ('table_name', table_name),
+                ('statement', statement),
+                ('depends_on', list(depends_on)),
+                ('wave', max([steps[dependency]['wave'] + 1 for dependency in depends_on], default=0)),
+                ('rewrites', list(rewrites or []))
+            ]
+        )
+    )
+
+    return step_id
@@ -0,0 +1,111 @@
+import json
+import mmap
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Iterator
+
+from ._model import Node
+
+SNAPSHOT_FORMAT = 'pypgdelta-state'
+SNAPSHOT_VERSION = 1
+
+
+def save_state(configuration: Dict, path: str):
+    """Function for saving a configuration to a snapshot file
+
+    The snapshot is a JSON-lines file: a version header, one line per schema and a trailing index with the byte
+    offset of every schema line, which allows load_state to read single schemas without parsing the whole file.
+
+    :param Dict configuration: The configuration, as returned by get_state or construct_configuration
+    :param str path: The file to write
+    """
+
+    index = []
+    with open(path, 'wb') as f:
+        header = {'format': SNAPSHOT_FORMAT, 'version': SNAPSHOT_VERSION}
+        f.write(json.dumps(header).encode('utf-8') + b'\n')
+
+        for schema_name, schema_config in configuration.items():
+            if isinstance(schema_config, Node):
+                schema_config = schema_config.to_dict()
+            line = json.dumps([schema_name, schema_config], separators=(',', ':')).encode('utf-8')
+            index.append([schema_name, f.tell(), len(line)])
+            f.write(line + b'\n')
+
+        f.write(json.dumps({'index': index}, separators=(',', ':')).encode('utf-8') + b'\n')
+
+
+def load_state(path: str) -> 'LazyState':
+    """Function for loading a configuration from a snapshot file
+
+    The file is memory-mapped, and a schema is only parsed the first time it is accessed. The state keeps the memory
+    map open until it is closed, use it as a context manager or call close when done.
+
+    :param str path: The snapshot file
+
+    :return: The configuration as a read-only mapping of schema names to schema configurations
+    :rtype: LazyState
+    """
+    return LazyState(path)
+
+
+class LazyState(Mapping):
+    """Read-only configuration backed by a memory-mapped snapshot file, see save_state
+
+    The state is only usable until it is closed: reading a schema afterwards raises a ValueError.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            # Verify the header
+            header = json.loads(self._map[:self._map.find(b'\n')])
+            if header.get('format') != SNAPSHOT_FORMAT or header.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f'Unsupported snapshot {path}: {header}')
+
+            # Read the index from the last line
+            index_start = self._map.rfind(b'\n', 0, len(self._map) - 1) + 1
+            self._index = OrderedDict(
+                [
+                    (schema_name, (offset, length))
+                    for schema_name, offset, length in json.loads(self._map[index_start:])['index']
+                ]
+            )
+        except Exception:
+            self._map.close()
+            raise
+
+        self._schemas = {}
+
+    def __enter__(self) -> 'LazyState':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getitem__(self, schema_name: str) -> Dict:
+        if self._map.closed:
+            raise ValueError('The snapshot is closed')
+
+        if schema_name not in self._schemas:
+            offset, length = self._index[schema_name]
+            _, schema_config = json.loads(self._map[offset:offset + length], object_pairs_hook=OrderedDict)
+            self._schemas[schema_name] = schema_config
+
+        return self._schemas[schema_name]
+
+    def __contains__(self, schema_name) -> bool:
+        return schema_name in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self):
+        """Function for closing the underlying memory map, closing it again has no effect"""
+        self._map.close()
+        self._schemas = {}
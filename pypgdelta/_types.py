@@ -0,0 +1,221 @@
+import re
+from collections import OrderedDict, namedtuple
+from typing import Dict, Iterable, List, Tuple, Union
+
+# A registered type: the information_schema data_type, the name used in statements and the kind of modifiers the
+# type accepts ('length', 'precision', 'precision_scale' or None)
+TypeInfo = namedtuple('TypeInfo', ['data_type', 'statement', 'modifier'])
+
+# The built-in types keyed on their internal (pg_type.typname / udt_name) name
+TYPES = {
+    'bool': TypeInfo('boolean', 'boolean', None),
+    'int2': TypeInfo('smallint', 'smallint', None),
+    'int4': TypeInfo('integer', 'integer', None),
+    'int8': TypeInfo('bigint', 'bigint', None),
+    'float4': TypeInfo('real', 'real', None),
+    'float8': TypeInfo('double precision', 'double precision', None),
+    'numeric': TypeInfo('numeric', 'numeric', 'precision_scale'),
+    'money': TypeInfo('money', 'money', None),
+    'oid': TypeInfo('oid', 'oid', None),
+    'text': TypeInfo('text', 'text', None),
+    'name': TypeInfo('name', 'name', None),
+    'varchar': TypeInfo('character varying', 'varchar', 'length'),
+    'bpchar': TypeInfo('character', 'char', 'length'),
+    'bit': TypeInfo('bit', 'bit', 'length'),
+    'varbit': TypeInfo('bit varying', 'varbit', 'length'),
+    'bytea': TypeInfo('bytea', 'bytea', None),
+    'date': TypeInfo('date', 'date', None),
+    'time': TypeInfo('time without time zone', 'time', 'precision'),
+    'timetz': TypeInfo('time with time zone', 'timetz', 'precision'),
+    'timestamp': TypeInfo('timestamp without time zone', 'timestamp', 'precision'),
+    'timestamptz': TypeInfo('timestamp with time zone', 'timestamptz', 'precision'),
+    'interval': TypeInfo('interval', 'interval', None),
+    'uuid': TypeInfo('uuid', 'uuid', None),
+    'json': TypeInfo('json', 'json', None),
+    'jsonb': TypeInfo('jsonb', 'jsonb', None),
+    'xml': TypeInfo('xml', 'xml', None),
+    'inet': TypeInfo('inet', 'inet', None),
+    'cidr': TypeInfo('cidr', 'cidr', None),
+    'macaddr': TypeInfo('macaddr', 'macaddr', None),
+    'macaddr8': TypeInfo('macaddr8', 'macaddr8', None),
+    'point': TypeInfo('point', 'point', None),
+    'line': TypeInfo('line', 'line', None),
+    'lseg': TypeInfo('lseg', 'lseg', None),
+    'box': TypeInfo('box', 'box', None),
+    'path': TypeInfo('path', 'path', None),
+    'polygon': TypeInfo('polygon', 'polygon', None),
+    'circle': TypeInfo('circle', 'circle', None),
+    'tsvector': TypeInfo('tsvector', 'tsvector', None),
+    'tsquery': TypeInfo('tsquery', 'tsquery', None),
+    'pg_lsn': TypeInfo('pg_lsn', 'pg_lsn', None),
+    'int4range': TypeInfo('int4range', 'int4range', None),
+    'int8range': TypeInfo('int8range', 'int8range', None),
+    'numrange': TypeInfo('numrange', 'numrange', None),
+    'tsrange': TypeInfo('tsrange', 'tsrange', None),
+    'tstzrange': TypeInfo('tstzrange', 'tstzrange', None),
+    'daterange': TypeInfo('daterange', 'daterange', None),
+}
+
+# The precision used by the server when none is given, normalized away so both spellings compare equal
+_DEFAULT_DATETIME_PRECISION = 6
+
+# The internal type names by statement name, and the pattern splitting a statement into the name and the modifiers
+_STATEMENT_TYPES = {type_info.statement: type_name for type_name, type_info in TYPES.items()}
+_TYPE_STATEMENT_PATTERN = re.compile(r'^([a-z0-9_ ]+?)(?:\(([0-9,]+)\))?$')
+
+
+def normalize_type_name(names: Iterable[str]) -> Union[str, None]:
+    """Function for getting the internal type name from the, possibly qualified, type name of a column definition
+
+    The parser already maps the SQL spellings (integer, character varying, timestamp with time zone, ...) to the
+    internal names, so only the pg_catalog qualification needs to be removed.
+
+    :param Iterable[str] names: The type name parts, e.g. ('pg_catalog', 'int8') or ('uuid', )
+
+    :return: The internal type name or None when the type is not a registered built-in type
+    :rtype: Union[str, None]
+    """
+
+    names = tuple(names)
+    if len(names) == 2 and names[0] == 'pg_catalog':
+        names = names[1:]
+    if len(names) != 1:
+        return None
+
+    if names[0] not in TYPES:
+        return None
+    return names[0]
+
+
+def get_type_definition(type_name: str, modifiers: Iterable[int] = (), array: bool = False) -> Union[Dict, None]:
+    """Function for getting the data type keys of a column configuration
+
+    Element modifiers of array types are not exposed by information_schema, so they are dropped for arrays on both
+    the construct and the state side.
+
+    :param str type_name: The internal type name, see normalize_type_name
+    :param Iterable[int] modifiers: The type modifiers, e.g. (10, 2) for numeric(10,2)
+    :param bool array: Whether the column is an array of the type
+
+    :return: The data_type, data_type_stmt and character_maximum_length or None when the type is not registered
+    :rtype: Union[Dict, None]
+    """
+
+    type_info = TYPES.get(type_name)
+    if type_info is None:
+        return None
+
+    modifiers = [modifier for modifier in modifiers if modifier is not None]
+    if array:
+        return OrderedDict(
+            [
+                ('data_type', 'ARRAY'),
+                ('data_type_stmt', f'{type_info.statement}[]'),
+                ('character_maximum_length', None)
+            ]
+        )
+
+    statement = type_info.statement
+    max_length = None
+    if type_info.modifier == 'length' and modifiers:
+        max_length = modifiers[0]
+        statement = f'{statement}({max_length})'
+    elif type_info.modifier == 'precision_scale' and modifiers:
+        scale = modifiers[1] if len(modifiers) > 1 else 0
+        statement = f'{statement}({modifiers[0]},{scale})'
+    elif type_info.modifier == 'precision' and modifiers and modifiers[0] != _DEFAULT_DATETIME_PRECISION:
+        statement = f'{statement}({modifiers[0]})'
+
+    return OrderedDict(
+        [
+            ('data_type', type_info.data_type),
+            ('data_type_stmt', statement),
+            ('character_maximum_length', max_length)
+        ]
+    )
+
+
+def is_metadata_only_change(old_statement: Union[str, None], new_statement: str) -> bool:
+    """Function for checking whether changing a column type only updates the catalog, without rewriting or scanning
+    the table
+
+    This holds for binary compatible changes that do not restrict the values: widening or removing the length of a
+    varchar or varbit, varchar to text and back to an unbounded varchar, raising the precision of a numeric with the
+    same scale or removing it, and raising or removing the precision of the time and timestamp types.
+
+    :param Union[str, None] old_statement: The current data_type_stmt
+    :param str new_statement: The desired data_type_stmt
+
+    :return: Whether the change is metadata only
+    :rtype: bool
+    """
+
+    if old_statement == new_statement:
+        return True
+
+    old_type = _parse_type_statement(old_statement)
+    new_type = _parse_type_statement(new_statement)
+    if old_type is None or new_type is None:
+        return False
+
+    old_name, old_modifiers = old_type
+    new_name, new_modifiers = new_type
+
+    # varchar and text share their representation
+    if old_name in ('varchar', 'text') and new_name in ('varchar', 'text'):
+        return new_name == 'text' or _is_widened(old_modifiers, new_modifiers)
+
+    if old_name != new_name:
+        return False
+
+    if old_name == 'varbit':
+        return _is_widened(old_modifiers, new_modifiers)
+
+    if old_name == 'numeric':
+        return not new_modifiers or (_is_widened(old_modifiers, new_modifiers) and new_modifiers[1] == old_modifiers[1])
+
+    if TYPES[old_name].modifier == 'precision':
+        old_precision = old_modifiers[0] if old_modifiers else _DEFAULT_DATETIME_PRECISION
+        new_precision = new_modifiers[0] if new_modifiers else _DEFAULT_DATETIME_PRECISION
+        return new_precision >= old_precision
+
+    return False
+
+
+def _parse_type_statement(statement: Union[str, None]) -> Union[Tuple[str, List[int]], None]:
+    """Function for splitting a data_type_stmt as generated by get_type_definition into the type and its modifiers
+
+    :param Union[str, None] statement: The data_type_stmt
+
+    :return: The internal type name and the modifiers, None for arrays and unregistered types
+    :rtype: Union[Tuple[str, List[int]], None]
+    """
+
+    if statement is None:
+        return None
+
+    match = _TYPE_STATEMENT_PATTERN.match(statement)
+    if match is None:
+        return None
+
+    type_name = _STATEMENT_TYPES.get(match.group(1))
+    if type_name is None:
+        return None
+
+    modifiers = [int(modifier) for modifier in match.group(2).split(',')] if match.group(2) else []
+    return type_name, modifiers
+
+
+def _is_widened(old_modifiers: List[int], new_modifiers: List[int]) -> bool:
+    """Function for checking whether a length or precision modifier is removed or raised
+
+    :param List[int] old_modifiers: The current modifiers
+    :param List[int] new_modifiers: The desired modifiers
+
+    :return: Whether the type accepts at least the values it accepted before
+    :rtype: bool
+    """
+
+    if not new_modifiers:
+        return True
+    return bool(old_modifiers) and new_modifiers[0] >= old_modifiers[0]
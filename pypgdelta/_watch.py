@@ -0,0 +1,220 @@
+import json
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Set, Tuple, Union
+
+from ._delta import get_alter_table_statements, get_new_table_statements, get_table_delta, join_statements
+from .construct._cache import create_fragment, merge_fragments
+from .locate import _parse_sql_files, iter_json_files, iter_sql_files
+from .sql import statements
+
+
+def watch_delta_statement(old_configuration: Dict,
+                          root_dir: str,
+                          callback: Callable[[str], None] = print,
+                          interval: float = 0.25,
+                          on_error: Union[Callable[[Exception], None], None] = None,
+                          stop_event: Union[threading.Event, None] = None):
+    """Function for watching the schema files in a directory, passing the delta script to the callback on every change
+
+    The directory is polled for changed, new and removed json and sql files. Only the changed files are parsed again,
+    and the delta is only recomputed for the tables they define, see DeltaWatcher.
+
+    :param Dict old_configuration: The baseline configuration
+    :param str root_dir: The directory containing the libpg_query json files and/or sql files
+    :param Callable[[str], None] callback: Called with the delta script initially and whenever it changes
+    :param float interval: The number of seconds between polls
+    :param Union[Callable[[Exception], None], None] on_error: Called when a file can not be processed, e.g. while it
+        is half written. Defaults to printing the error to stderr. The file is retried on the next poll.
+    :param Union[threading.Event, None] stop_event: If given, watching stops once the event is set
+    """
+
+    if on_error is None:
+        on_error = _print_error
+    if stop_event is None:
+        stop_event = threading.Event()
+
+    watcher = DeltaWatcher(old_configuration, root_dir)
+    while True:
+        try:
+            if watcher.refresh():
+                callback(watcher.statement)
+        except Exception as error:
+            on_error(error)
+
+        if stop_event.wait(interval):
+            return
+
+
+class DeltaWatcher:
+    """Delta script of the schema files in a directory against a baseline configuration, kept up to date by refresh
+
+    The per-file configuration fragments and the per-table statements are kept between refreshes, so a refresh only
+    parses the changed files and only recomputes the delta of the tables defined in them.
+    """
+
+    def __init__(self, old_configuration: Dict, root_dir: str):
+        self.old_configuration = old_configuration
+        self.root_dir = root_dir
+        self.configuration = OrderedDict()
+        self.statement = None
+
+        self._files = OrderedDict()
+        self._fragments = OrderedDict()
+        self._tables = OrderedDict()
+
+    def refresh(self) -> bool:
+        """Function for processing the files changed since the last refresh
+
+        :return: Whether the delta script changed, the first refresh always counts as a change
+        :rtype: bool
+        """
+
+        files = _scan_files(self.root_dir)
+        changed = [path for path, signature in files.items() if self._files.get(path) != signature]
+        removed = [path for path in self._files if path not in files]
+        if self.statement is not None and not changed and not removed:
+            return False
+
+        # Parse the changed files before updating anything, so a failing file leaves the watcher untouched
+        fragments = OrderedDict([(path, _read_fragment(path)) for path in changed])
+
+        # Collect the tables defined before and after the change
+        affected = set()
+        for path in removed:
+            affected.update(_get_table_keys(self._fragments.pop(path)))
+
+        for path, fragment in fragments.items():
+            affected.update(_get_table_keys(self._fragments.get(path, {})))
+            affected.update(_get_table_keys(fragment))
+            self._fragments[path] = fragment
+
+        # Merge in the order the files are found, matching construct_configuration
+        self._fragments = OrderedDict([(path, self._fragments[path]) for path in files])
+        self._files = OrderedDict([(path, files[path]) for path in files])
+        self.configuration = merge_fragments(list(self._fragments.values()))
+
+        statement = self._get_statement(affected)
+        is_changed = statement != self.statement
+        self.statement = statement
+        return is_changed
+
+    def _get_statement(self, affected: Set[Tuple[str, str]]) -> str:
+        """Function for building the delta script, reusing the statements of the tables that are not affected
+
+        :param Set[Tuple[str, str]] affected: The schema and table names of the tables to recompute
+
+        :return: The delta script, matching get_delta_statement
+        :rtype: str
+        """
+
+        statement_list = [
+            statements.create_schema(schema_name)
+            for schema_name in self.configuration
+            if schema_name not in self.old_configuration
+        ]
+
+        tables = OrderedDict()
+        for schema_name, schema_config in self.configuration.items():
+            for table_name, table_config in schema_config.get('tables', {}).items():
+                key = (schema_name, table_name)
+                if key in affected or key not in self._tables:
+                    tables[key] = _get_table_statements(
+                        self.old_configuration,
+                        schema_name,
+                        table_name,
+                        table_config
+                    )
+                else:
+                    tables[key] = self._tables[key]
+        self._tables = tables
+
+        # New tables are created before the existing ones are altered
+        for kind in ('new', 'alter'):
+            for table_kind, table_statements in tables.values():
+                if table_kind == kind:
+                    statement_list.extend(table_statements)
+
+        return join_statements(statement_list)
+
+
+def _get_table_statements(old_configuration: Dict,
+                          schema_name: str,
+                          table_name: str,
+                          table_config: Dict) -> Tuple[Union[str, None], list]:
+    """Function for getting the kind of change and the statements of a single table
+
+    :param Dict old_configuration: The baseline configuration
+    :param str schema_name: The name of the schema the table belongs to
+    :param str table_name: The name of the table
+    :param Dict table_config: The desired table configuration
+
+    :return: The kind of change and the statements
+    :rtype: Tuple[Union[str, None], list]
+    """
+
+    kind, table_delta = get_table_delta(old_configuration, schema_name, table_name, table_config)
+    if kind == 'new':
+        return kind, get_new_table_statements(table_delta)
+    elif kind == 'alter':
+        return kind, get_alter_table_statements(table_delta)
+    return kind, []
+
+
+def _scan_files(root_dir: str) -> Dict[str, Tuple[int, int]]:
+    """Function for getting the modification time and size of the schema files in a directory
+
+    :param str root_dir: The directory
+
+    :return: The modification time in nanoseconds and size of each file, by path
+    :rtype: Dict[str, Tuple[int, int]]
+    """
+
+    files = OrderedDict()
+    for file in list(iter_json_files(root_dir)) + list(iter_sql_files(root_dir)):
+        stat = file.stat()
+        files[file.path] = (stat.st_mtime_ns, stat.st_size)
+
+    return files
+
+
+def _read_fragment(path: str) -> Dict:
+    """Function for getting the configuration fragment of a json or sql file
+
+    :param str path: The file
+
+    :return: The fragment
+    :rtype: Dict
+    """
+
+    if path.endswith('.sql'):
+        parsed = _parse_sql_files([path])[0]
+    else:
+        with open(path, 'r') as f:
+            parsed = json.load(f)
+
+    return create_fragment(parsed.get('stmts', []))
+
+
+def _get_table_keys(fragment: Dict) -> Iterable[Tuple[str, str]]:
+    """Function for getting the schema and table names of the tables in a fragment
+
+    :param Dict fragment: The fragment
+
+    :return: The schema and table names
+    :rtype: Iterable[Tuple[str, str]]
+    """
+    return [
+        (schema_name, table_name)
+        for schema_name, schema_config in fragment.items()
+        for table_name in schema_config.get('tables', {})
+    ]
+
+
+def _print_error(error: Exception):
+    """Function for reporting an error on stderr
+
+    :param Exception error: The error
+    """
+    print(f'pypgdelta: {error}', file=sys.stderr)
@@ -1 +1,3 @@
+from ._cache import construct_cached_configuration
 from ._construct import construct_configuration
+from ._dispatch import dispatch_statements, register_handler
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List
+
+from ..locate import iter_json_files
+from ._dispatch import dispatch_statements
+from ._index import INDEX_ONLY_KEY, merge_table, remove_index_only_tables
+from ._table import ALTERATIONS_KEY, apply_alterations
+
+# Part of every cache key, bump when the fragment layout or the construction logic changes
+_CACHE_VERSION = b'1'
+
+
+def construct_cached_configuration(root_dir: str, cache_dir: str) -> Dict:
+    """Function for getting the configuration based on the json files in a directory, caching the per-file results
+
+    The configuration fragment of each file is cached on disk, keyed by a hash of the file contents. Only new
+    or changed files are processed again, and cache entries no longer matching any file are removed. The entries
+    are kept in a subdirectory per root directory, so several projects can share the cache directory.
+
+    :param str root_dir: The directory containing the libpg_query json files
+    :param str cache_dir: The directory holding the cached fragments
+
+    :return: The configuration
+    :rtype: Dict
+    """
+
+    root_key = hashlib.sha256(os.path.realpath(root_dir).encode()).hexdigest()
+    cache_dir = os.path.join(cache_dir, root_key)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    fragments = []
+    keys = set()
+    for file in iter_json_files(root_dir):
+        with open(file.path, 'rb') as f:
+            content = f.read()
+
+        key = hashlib.sha256(_CACHE_VERSION + b'\0' + content).hexdigest()
+        keys.add(key)
+        fragments.append(_get_fragment(os.path.join(cache_dir, f'{key}.json'), content))
+
+    _evict(cache_dir, keys)
+
+    return merge_fragments(fragments)
+
+
+def create_fragment(statements: List[Dict]) -> Dict:
+    """Function for getting the configuration fragment of the statements of a single file
+
+    :param List[Dict] statements: The statements of the file
+
+    :return: The fragment
+    :rtype: Dict
+    """
+    return dispatch_statements(statements)
+
+
+def merge_fragments(fragments: List[Dict]) -> Dict:
+    """Function for merging the per-file fragments into the configuration
+
+    The result matches construct_configuration over all the files.
+
+    :param List[Dict] fragments: The fragments in file order
+
+    :return: The configuration
+    :rtype: Dict
+    """
+
+    configuration = OrderedDict()
+    for fragment in fragments:
+        for schema_name, schema_config in fragment.items():
+            if schema_name not in configuration:
+                configuration[schema_name] = OrderedDict(
+                    [
+                        ('tables', OrderedDict())
+                    ]
+                )
+                if schema_config.get(INDEX_ONLY_KEY):
+                    configuration[schema_name][INDEX_ONLY_KEY] = True
+            elif not schema_config.get(INDEX_ONLY_KEY):
+                configuration[schema_name].pop(INDEX_ONLY_KEY, None)
+
+            for table_name, table_config in schema_config['tables'].items():
+                merge_table(configuration[schema_name]['tables'], table_name, table_config)
+
+                # Alter table statements of a table created in an earlier file
+                if ALTERATIONS_KEY in table_config:
+                    apply_alterations(configuration[schema_name]['tables'], table_name, table_config[ALTERATIONS_KEY])
+
+    return remove_index_only_tables(configuration)
+
+
+def _get_fragment(cache_path: str, content: bytes) -> Dict:
+    """Function for getting the fragment of a file from the cache, creating the cache entry if missing
+
+    :param str cache_path: The cache file
+    :param bytes content: The contents of the json file
+
+    :return: The fragment
+    :rtype: Dict
+    """
+
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            return json.load(f, object_pairs_hook=OrderedDict)
+
+    fragment = create_fragment(json.loads(content).get('stmts', []))
+
+    # Write to a temporary file first so concurrent runs never see a partial entry
+    temporary_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'w') as f:
+        json.dump(fragment, f)
+    os.replace(temporary_path, cache_path)
+
+    return fragment
+
+
+def _evict(cache_dir: str, keys: set):
+    """Function for removing the cache entries that do not belong to any of the current files
+
+    :param str cache_dir: The directory holding the cached fragments of the root directory
+    :param set keys: The keys of the current files
+    """
+
+    for elem in os.scandir(cache_dir):
+        key, extension = os.path.splitext(elem.name)
+        if extension == '.json' and len(key) == 64 and key not in keys:
+            os.remove(elem.path)
@@ -1,5 +1,7 @@
 from collections import OrderedDict
-from typing import Dict
+from typing import Dict, Union
+
+from .._types import get_type_definition, normalize_type_name
 
 
 def create_column_config(column_def: Dict) -> Dict:
@@ -16,36 +18,27 @@ def create_column_config(column_def: Dict) -> Dict:
     configuration[column_def['colname']] = column_config
 
     # Get the column udt type
-    col_type = tuple([name['String']['str'] for name in column_def['typeName']['names']])
+    type_names = tuple([_get_string(name) for name in column_def['typeName']['names']])
+    type_name = normalize_type_name(type_names)
+
+    # Collect the type modifiers, e.g. the maximum length of a varchar
+    type_modifiers = []
+    for type_mod in column_def['typeName'].get('typmods', []):
+        if 'A_Const' in type_mod:
+            type_modifiers.append(_get_integer(type_mod['A_Const']))
 
     # Set the appropriate type
-    if col_type == ('pg_catalog', 'int8'):
-        column_config['data_type'] = 'bigint'
-        column_config['data_type_stmt'] = 'bigint'
-        column_config['character_maximum_length'] = None
-
-    # Deal with varchar
-    elif col_type == ('pg_catalog', 'varchar'):
-        column_config['data_type'] = 'character varying'
-        column_config['data_type_stmt'] = f'varchar'
-
-        # Determine the maximum character length
-        max_length = None
-        for type_mod in column_def['typeName'].get('typmods', []):
-            if 'A_Const' in type_mod:
-                max_length = type_mod['A_Const'].get('val', {}).get('Integer', {}).get('ival', None)
-                break
-
-        if max_length is not None:
-            column_config['data_type_stmt'] = f'varchar({max_length})'
-
-        column_config['character_maximum_length'] = max_length
-
-    # Deal with uuid columns
-    if col_type == ('uuid', ):
-        column_config['data_type'] = 'uuid'
-        column_config['data_type_stmt'] = 'uuid'
-        column_config['character_maximum_length'] = None
+    type_definition = None
+    if type_name is not None:
+        type_definition = get_type_definition(
+            type_name,
+            type_modifiers,
+            array=bool(column_def['typeName'].get('arrayBounds'))
+        )
+
+    if type_definition is None:
+        raise TypeError(f'Unable to handle column type {type_names}')
+    column_config.update(type_definition)
 
     # Check nullability
     column_config['nullable'] = True
@@ -64,6 +57,39 @@ def create_column_config(column_def: Dict) -> Dict:
                 }
             )
 
-    if 'data_type' not in column_config:
-        raise TypeError(f'Unable to handle column type {col_type}')
     return configuration
+
+
+def _get_string(node: Dict) -> str:
+    """Function for getting the value of a String node
+
+    libpg_query keeps the value under str up to PostgreSQL 14 and under sval from PostgreSQL 15 on.
+
+    :param Dict node: The node
+
+    :return: The string
+    :rtype: str
+    """
+
+    value = node['String']
+    if 'sval' in value:
+        return value['sval']
+    return value['str']
+
+
+def _get_integer(constant: Dict) -> Union[int, None]:
+    """Function for getting the integer value of an A_Const node
+
+    Up to PostgreSQL 14 the value is wrapped as val.Integer.ival, from PostgreSQL 15 on it is ival.ival. A zero value
+    is left out of the json in both layouts.
+
+    :param Dict constant: The A_Const node
+
+    :return: The integer, None if the constant is not an integer
+    :rtype: Union[int, None]
+    """
+
+    value = constant.get('ival', constant.get('val', {}).get('Integer'))
+    if value is None:
+        return None
+    return value.get('ival', 0)
@@ -1,24 +1,30 @@
 from collections import OrderedDict
-from typing import List, Dict
+from typing import Dict, Iterable
 
-from ._schema import create_schema_baseline
-from ._table import create_table_config
+from .._model import get_configuration_model
+from ._dispatch import dispatch_statements
+from ._index import remove_index_only_tables
 
 
-def construct_configuration(statements: List[Dict]) -> Dict:
+def construct_configuration(statements: Iterable[Dict], model: bool = False) -> Dict:
     """Function for getting the configuration based on the input statements (as dicts)
 
-    :param List[Dict] statements: The statements upon which to base the configuration
+    The statements are consumed one file at a time, so a generator such as locate.iter_json can be passed without
+    keeping every parsed file in memory.
+
+    :param Iterable[Dict] statements: The statements upon which to base the configuration
+    :param bool model: Whether to return the schemas as objects of the compact object model, see
+        get_configuration_model
 
     :return: The configuration
     :rtype: Dict
     """
 
-    statements_list = []
+    configuration = OrderedDict()
     for statement in statements:
-        statements_list.extend(statement.get('stmts', []))
-
-    configuration = create_schema_baseline(statements_list)
-    configuration = create_table_config(statements_list, configuration)
+        dispatch_statements(statement.get('stmts', []), configuration)
 
+    remove_index_only_tables(configuration)
+    if model:
+        return get_configuration_model(configuration)
     return configuration
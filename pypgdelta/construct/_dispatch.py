@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Union
+
+from ._index import add_index
+from ._schema import add_schema
+from ._table import add_table, alter_table
+
+# Handlers by parse tree node type, each called with the node and the configuration to update
+_HANDLERS = OrderedDict(
+    [
+        ('CreateSchemaStmt', add_schema),
+        ('CreateStmt', add_table),
+        ('IndexStmt', add_index),
+        ('AlterTableStmt', alter_table),
+    ]
+)
+
+
+def register_handler(node_type: str, handler: Callable[[Dict, Dict], None]):
+    """Function for registering the handler of a parse tree node type
+
+    :param str node_type: The node type, e.g. 'ViewStmt'
+    :param Callable[[Dict, Dict], None] handler: Function updating the configuration (second argument) in place
+        based on the node (first argument)
+    """
+    _HANDLERS[node_type] = handler
+
+
+def dispatch_statements(statements: Iterable[Dict], configuration: Union[Dict, None] = None) -> Dict:
+    """Function for building the configuration in a single pass, routing each statement to the handler of its type
+
+    Statements without a registered handler are ignored.
+
+    :param Iterable[Dict] statements: The statements (the stmts entries of the parsed files)
+    :param Union[Dict, None] configuration: A configuration to update in place
+
+    :return: The configuration
+    :rtype: Dict
+    """
+
+    if configuration is None:
+        configuration = OrderedDict()
+
+    for statement in statements:
+        for node_type, node in statement.get('stmt', {}).items():
+            handler = _HANDLERS.get(node_type)
+            if handler is not None:
+                handler(node, configuration)
+
+    return configuration
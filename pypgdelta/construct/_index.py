@@ -0,0 +1,134 @@
+from collections import OrderedDict
+from typing import Dict
+
+# Marks a schema that was only added for the indexes of its tables, until a create schema or table statement is found
+INDEX_ONLY_KEY = 'index_only'
+
+
+def add_index(index_statement: Dict, configuration: Dict):
+    """Function for adding the index of a create index statement to the configuration
+
+    Only indexes on plain columns are managed: expression indexes, partial indexes and indexes with included columns
+    are ignored, just like they are left out of the database state. An index on a table that is not in the
+    configuration (yet) is kept under the table until its create table statement is found, see add_table.
+
+    :param Dict index_statement: The IndexStmt node
+    :param Dict configuration: The configuration to update
+    """
+
+    if index_statement.get('whereClause') or index_statement.get('indexIncludingParams'):
+        return
+
+    columns = []
+    column_names = []
+    for element in index_statement.get('indexParams', []):
+        index_element = element.get('IndexElem', {})
+        if index_element.get('name') is None:
+            return
+
+        column_names.append(index_element['name'])
+        columns.append(index_element['name'] + _get_ordering(index_element))
+
+    # Get the properties
+    relation = index_statement['relation']
+    schema_name = relation['schemaname']
+    table_name = relation['relname']
+
+    # Name the index like the server does when no name is given
+    index_name = index_statement.get('idxname')
+    if index_name is None:
+        index_name = f"{table_name}_{'_'.join(column_names)}_idx"
+
+    # Create schema if not in the configuration
+    if schema_name not in configuration:
+        configuration[schema_name] = OrderedDict(
+            [
+                (
+                    'tables',
+                    OrderedDict()
+                ),
+                (INDEX_ONLY_KEY, True)
+            ]
+        )
+
+    table_configuration = configuration[schema_name]['tables'].setdefault(table_name, OrderedDict())
+    index_configurations = table_configuration.setdefault('indexes', OrderedDict())
+    index_configurations[index_name] = OrderedDict(
+        [
+            ('columns', columns),
+            ('unique', bool(index_statement.get('unique', False))),
+            ('method', index_statement.get('accessMethod', 'btree'))
+        ]
+    )
+
+
+def merge_table(tables: Dict, table_name: str, table_config: Dict):
+    """Function for merging a table of a configuration fragment into the tables of the configuration
+
+    A table replaces the columns and constraints of an earlier definition, while the indexes of all fragments are
+    combined, so a table and its indexes can be defined in different files. The configurations of the fragments are
+    not modified.
+
+    :param Dict tables: The tables of the configuration to update
+    :param str table_name: The name of the table
+    :param Dict table_config: The table configuration of the fragment
+    """
+
+    existing = tables.get(table_name)
+    if existing is None or ('columns' in table_config and not existing.get('indexes')):
+        tables[table_name] = table_config
+        return
+
+    if 'columns' in table_config:
+        merged = OrderedDict(table_config)
+    else:
+        merged = OrderedDict(existing)
+
+    indexes = OrderedDict(existing.get('indexes', {}))
+    indexes.update(table_config.get('indexes', {}))
+    if indexes:
+        merged['indexes'] = indexes
+    tables[table_name] = merged
+
+
+def remove_index_only_tables(configuration: Dict) -> Dict:
+    """Function for removing the tables that only have indexes, i.e. whose create table statement was not found
+
+    Schemas that were only added through the indexes of such tables are removed as well, while schemas of a create
+    schema statement are kept.
+
+    :param Dict configuration: The configuration to update in place
+
+    :return: The configuration
+    :rtype: Dict
+    """
+
+    for schema_name in list(configuration):
+        tables = configuration[schema_name].get('tables', {})
+        index_only = [table_name for table_name, table_config in tables.items() if 'columns' not in table_config]
+        for table_name in index_only:
+            del tables[table_name]
+
+        if configuration[schema_name].pop(INDEX_ONLY_KEY, False) and not tables:
+            del configuration[schema_name]
+
+    return configuration
+
+
+def _get_ordering(index_element: Dict) -> str:
+    """Function for getting the sort order of an index column as the database state reports it
+
+    :param Dict index_element: The IndexElem node
+
+    :return: The sort order to append to the column name, empty for the default order
+    :rtype: str
+    """
+
+    if index_element.get('ordering') == 'SORTBY_DESC':
+        if index_element.get('nulls_ordering') == 'SORTBY_NULLS_LAST':
+            return ' DESC NULLS LAST'
+        return ' DESC'
+
+    if index_element.get('nulls_ordering') == 'SORTBY_NULLS_FIRST':
+        return ' NULLS FIRST'
+    return ''
@@ -1,31 +1,27 @@
 from collections import OrderedDict
-from typing import Iterable, Dict
+from typing import Dict
 
+from ._index import INDEX_ONLY_KEY
 
-def create_schema_baseline(statements: Iterable[Dict]) -> Dict:
-    """Function for getting the baseline schema configuration based on create schema statements
 
-    :param List[Dict] statements: The statements upon which to base the configuration
+def add_schema(schema_statement: Dict, configuration: Dict):
+    """Function for adding the schema of a create schema statement to the configuration
 
-    :return: The configuration
-    :rtype: Dict
+    Schemas already in the configuration, e.g. through one of their tables, are kept as they are, apart from no longer
+    being removed with their index only tables, see remove_index_only_tables.
+
+    :param Dict schema_statement: The CreateSchemaStmt node
+    :param Dict configuration: The configuration to update
     """
 
-    schema_statements = [statement for statement in statements if 'CreateSchemaStmt' in statement.get('stmt', {})]
-    configuration = OrderedDict(
-        [
-            (
-                statement['stmt']['CreateSchemaStmt']['schemaname'], OrderedDict(
-                    [
-                        (
-                            'tables',
-                            OrderedDict()
-                        )
-                    ]
+    if schema_statement['schemaname'] in configuration:
+        configuration[schema_statement['schemaname']].pop(INDEX_ONLY_KEY, None)
+    else:
+        configuration[schema_statement['schemaname']] = OrderedDict(
+            [
+                (
+                    'tables',
+                    OrderedDict()
                 )
-            )
-            for statement in schema_statements
-        ]
-    )
-
-    return configuration
+            ]
+        )
@@ -1,87 +1,220 @@
 from collections import OrderedDict
 from copy import deepcopy
-from typing import Iterable, Dict, Union
+from typing import Dict, List
 
-from ._column import create_column_config
+from ._column import _get_string, create_column_config
+from ._index import INDEX_ONLY_KEY
 
+# Holds the alter table commands of a table that is not in the configuration (yet), see alter_table
+ALTERATIONS_KEY = 'alterations'
 
-def create_table_config(statements: Iterable[Dict], baseline: Union[Dict, None] = None) -> Dict:
-    """Function for getting the table configuration based on supplied table statements
 
-    :param List[Dict] statements: The statements upon which to base the configuration
-    :param Dict baseline: A baseline configuration upon which to add the table configurations
+def add_table(table_statement: Dict, configuration: Dict):
+    """Function for adding the table of a create table statement to the configuration
 
-    :return: The configuration
-    :rtype: Dict
+    :param Dict table_statement: The CreateStmt node
+    :param Dict configuration: The configuration to update
     """
 
-    if not baseline:
-        baseline = OrderedDict()
-
-    baseline = deepcopy(baseline)
-
-    # Identify create table statements
-    table_statements = [statement for statement in statements if 'CreateStmt' in statement.get('stmt', {})]
-
-    # Add each of the tables to the configuration
-    for statement in table_statements:
-
-        # Get the properties
-        table_statement = statement['stmt']['CreateStmt']
-        relation = table_statement['relation']
-        schema_name = relation['schemaname']
-        table_name = relation['relname']
-
-        # Create schema if not in the baseline
-        if schema_name not in baseline:
-            baseline[schema_name] = OrderedDict(
-                [
-                    (
-                        'tables',
-                        OrderedDict()
-                    )
-                ]
-            )
-
-        # Add the table to the configuration
-        # Schema
-        schema = baseline[schema_name]
-
-        # Table
-        table_configuration = OrderedDict()
-        schema['tables'][table_name] = table_configuration
-
-        # Column
-        column_configurations = OrderedDict()
-        table_configuration['columns'] = column_configurations
-
-        # Set the column configurations
-        for element in table_statement.get('tableElts', []):
-            if 'ColumnDef' in element:
-                column_configuration = create_column_config(element['ColumnDef'])
-                column_configurations.update(column_configuration)
-
-        # Constraints
-        constraint_configurations = OrderedDict(
+    # Get the properties
+    relation = table_statement['relation']
+    schema_name = relation['schemaname']
+    table_name = relation['relname']
+
+    # Create schema if not in the configuration
+    if schema_name not in configuration:
+        configuration[schema_name] = OrderedDict(
+            [
+                (
+                    'tables',
+                    OrderedDict()
+                )
+            ]
+        )
+
+    # Add the table to the configuration
+    # Schema
+    schema = configuration[schema_name]
+
+    # Table, keeping the indexes found before the table itself
+    indexes = schema['tables'].get(table_name, {}).get('indexes')
+    table_configuration = OrderedDict()
+    schema['tables'][table_name] = table_configuration
+
+    # Column
+    column_configurations = OrderedDict()
+    table_configuration['columns'] = column_configurations
+
+    # Set the column configurations
+    for element in table_statement.get('tableElts', []):
+        if 'ColumnDef' in element:
+            column_configuration = create_column_config(element['ColumnDef'])
+            column_configurations.update(column_configuration)
+
+    # Constraints
+    constraint_configurations = OrderedDict(
+        [
+            ('primary_key', OrderedDict())
+        ]
+    )
+    pk_config = constraint_configurations['primary_key']
+    table_configuration['constraints'] = constraint_configurations
+
+    # Get the primary key constraints
+    for k, v in column_configurations.items():
+        _add_column_primary_key(table_name, k, v, pk_config)
+
+    # Indexes
+    if indexes:
+        table_configuration['indexes'] = indexes
+
+
+def alter_table(alter_statement: Dict, configuration: Dict):
+    """Function for applying the commands of an alter table statement to the configuration
+
+    Adding, dropping and retyping columns, setting and dropping NOT NULL, adding a primary key and dropping the
+    primary key constraint are applied, other commands are ignored. The commands for a table that is not in the
+    configuration are kept under the table, as the table may be created in another file, see apply_alterations.
+
+    :param Dict alter_statement: The AlterTableStmt node
+    :param Dict configuration: The configuration to update
+    """
+
+    # The object type is called relkind before PostgreSQL 14
+    if alter_statement.get('objtype', alter_statement.get('relkind')) != 'OBJECT_TABLE':
+        return
+
+    relation = alter_statement['relation']
+    schema_name = relation['schemaname']
+    table_name = relation['relname']
+    commands = [command['AlterTableCmd'] for command in alter_statement.get('cmds', []) if 'AlterTableCmd' in command]
+
+    table_configuration = configuration.get(schema_name, {}).get('tables', {}).get(table_name)
+    if table_configuration is not None and 'columns' in table_configuration:
+        _apply_commands(table_name, table_configuration, commands)
+        return
+
+    # Keep the commands until the table is found, marking the schema like the one of an index only table
+    if schema_name not in configuration:
+        configuration[schema_name] = OrderedDict(
             [
-                ('primary_key', OrderedDict())
+                (
+                    'tables',
+                    OrderedDict()
+                ),
+                (INDEX_ONLY_KEY, True)
             ]
         )
-        pk_config = constraint_configurations['primary_key']
-        table_configuration['constraints'] = constraint_configurations
-
-        # Get the primary key constraints
-        for k, v in column_configurations.items():
-            for constraint in v.get('constraints', []):
-                if constraint['type'] == 'p':
-                    if constraint.get('name', None) is None:
-                        constraint['name'] = f"{table_name}_pkey"
-
-                    # Set the properties for the primary key
-                    pk_config['name'] = constraint['name']
-                    if 'columns' not in pk_config:
-                        pk_config['columns'] = []
-                    if k not in pk_config['columns']:
-                        pk_config['columns'].append(k)
-
-    return baseline
+    table_configuration = configuration[schema_name]['tables'].setdefault(table_name, OrderedDict())
+    table_configuration.setdefault(ALTERATIONS_KEY, []).extend(commands)
+
+
+def apply_alterations(tables: Dict, table_name: str, alterations: List[Dict]):
+    """Function for applying the alter table commands of a configuration fragment to a table of an earlier fragment
+
+    The table is copied before it is altered, so the configurations of the fragments are not modified.
+
+    :param Dict tables: The tables of the configuration to update
+    :param str table_name: The name of the table
+    :param List[Dict] alterations: The AlterTableCmd nodes kept by alter_table
+    """
+
+    table_configuration = tables.get(table_name)
+    if table_configuration is None or 'columns' not in table_configuration:
+        return
+
+    altered = OrderedDict(table_configuration)
+    altered['columns'] = deepcopy(table_configuration['columns'])
+    altered['constraints'] = deepcopy(table_configuration.get('constraints', OrderedDict()))
+    _apply_commands(table_name, altered, alterations)
+    tables[table_name] = altered
+
+
+def _apply_commands(table_name: str, table_configuration: Dict, commands: List[Dict]):
+    """Function for applying alter table commands to a table configuration in place
+
+    :param str table_name: The name of the table
+    :param Dict table_configuration: The table configuration
+    :param List[Dict] commands: The AlterTableCmd nodes
+    """
+
+    columns = table_configuration['columns']
+    primary_key = table_configuration.setdefault('constraints', OrderedDict()).setdefault('primary_key', OrderedDict())
+
+    for command in commands:
+        subtype = command.get('subtype')
+        column = columns.get(command.get('name'))
+
+        if subtype == 'AT_AddColumn':
+            for column_name, column_config in create_column_config(command['def']['ColumnDef']).items():
+                columns[column_name] = column_config
+                _add_column_primary_key(table_name, column_name, column_config, primary_key)
+
+        elif subtype == 'AT_DropColumn' and column is not None:
+            del columns[command['name']]
+
+            # Dropping a column of the primary key drops the primary key
+            if command['name'] in primary_key.get('columns', []):
+                _drop_primary_key(columns, primary_key)
+
+        elif subtype == 'AT_AlterColumnType' and column is not None:
+            column_def = OrderedDict(command['def']['ColumnDef'])
+            column_def['colname'] = command['name']
+            for key, value in create_column_config(column_def)[command['name']].items():
+                if key not in ('nullable', 'constraints'):
+                    column[key] = value
+
+        elif subtype in ('AT_SetNotNull', 'AT_DropNotNull') and column is not None:
+            column['nullable'] = subtype == 'AT_DropNotNull'
+
+        elif subtype == 'AT_AddConstraint':
+            constraint = command['def'].get('Constraint', {})
+            if constraint.get('contype') != 'CONSTR_PRIMARY':
+                continue
+
+            _drop_primary_key(columns, primary_key)
+            for key in constraint.get('keys', []):
+                column_config = columns.get(_get_string(key))
+                if column_config is not None:
+                    column_config['nullable'] = False
+                    column_config['constraints'].append({'type': 'p', 'name': constraint.get('conname')})
+                    _add_column_primary_key(table_name, _get_string(key), column_config, primary_key)
+
+        elif subtype == 'AT_DropConstraint' and command.get('name') == primary_key.get('name'):
+            _drop_primary_key(columns, primary_key)
+
+
+def _add_column_primary_key(table_name: str, column_name: str, column_config: Dict, primary_key: Dict):
+    """Function for adding a column to the primary key if it has a primary key constraint
+
+    :param str table_name: The name of the table
+    :param str column_name: The name of the column
+    :param Dict column_config: The column configuration
+    :param Dict primary_key: The primary key configuration to update
+    """
+
+    for constraint in column_config.get('constraints', []):
+        if constraint['type'] == 'p':
+            if constraint.get('name', None) is None:
+                constraint['name'] = f"{table_name}_pkey"
+
+            # Set the properties for the primary key
+            primary_key['name'] = constraint['name']
+            if 'columns' not in primary_key:
+                primary_key['columns'] = []
+            if column_name not in primary_key['columns']:
+                primary_key['columns'].append(column_name)
+
+
+def _drop_primary_key(columns: Dict, primary_key: Dict):
+    """Function for removing the primary key, the columns stay NOT NULL
+
+    :param Dict columns: The column configurations
+    :param Dict primary_key: The primary key configuration to clear
+    """
+
+    primary_key.clear()
+    for column_config in columns.values():
+        column_config['constraints'] = [
+            constraint for constraint in column_config.get('constraints', []) if constraint['type'] != 'p'
+        ]
@@ -1,7 +1,10 @@
 import json
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from os import DirEntry
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Union
 
 
 def find_json_files(root_dir) -> List[DirEntry]:
@@ -12,15 +15,46 @@ def find_json_files(root_dir) -> List[DirEntry]:
     :return: List of directories
     :rtype: List[DirEntry]
     """
-    files = []
+    return list(iter_json_files(root_dir))
+
+
+def iter_json_files(root_dir) -> Iterator[DirEntry]:
+    """Function for lazily locating json files in a directory
+
+    :param str root_dir: The directory to search
+
+    :return: Generator yielding the files as they are found
+    :rtype: Iterator[DirEntry]
+    """
+    return _iter_files(root_dir, '.json')
+
+
+def iter_sql_files(root_dir) -> Iterator[DirEntry]:
+    """Function for lazily locating sql files in a directory
+
+    :param str root_dir: The directory to search
+
+    :return: Generator yielding the files as they are found
+    :rtype: Iterator[DirEntry]
+    """
+    return _iter_files(root_dir, '.sql')
+
+
+def _iter_files(root_dir, suffix: str) -> Iterator[DirEntry]:
+    """Function for lazily locating files with the given suffix in a directory
+
+    :param str root_dir: The directory to search
+    :param str suffix: The file name suffix
+
+    :return: Generator yielding the files as they are found
+    :rtype: Iterator[DirEntry]
+    """
     for elem in os.scandir(root_dir):
         if elem.is_dir():
-            sub_files = find_json_files(elem.path)
-            files.extend(sub_files)
+            yield from _iter_files(elem.path, suffix)
         else:
-            if elem.name.endswith('.json'):
-                files.append(elem)
-    return files
+            if elem.name.endswith(suffix):
+                yield elem
 
 
 def find_and_read_json(root_dir) -> List[Dict]:
@@ -31,11 +65,149 @@ def find_and_read_json(root_dir) -> List[Dict]:
     :return: List of directories
     :rtype: List[DirEntry]
     """
+    return list(iter_json(root_dir))
+
+
+def iter_json(root_dir,
+              processes: Union[int, None] = None,
+              decoder: str = 'json',
+              chunksize: int = 16) -> Iterator[Dict]:
+    """Function for locating and reading json files in a directory, yielding the parsed files one at a time
+
+    :param str root_dir: The directory to search
+    :param Union[int, None] processes: If set, parse the files in a process pool with this many processes
+    :param str decoder: The json decoder to use, either 'json' or 'orjson' (requires the orjson package)
+    :param int chunksize: The number of files handed to a worker process at a time
+
+    :return: Generator yielding the parsed files in the order they are found
+    :rtype: Iterator[Dict]
+    """
+
+    paths = (file.path for file in iter_json_files(root_dir))
+    return _read_files(paths, _read_json_files, (decoder, ), processes, chunksize)
+
+
+def find_and_read_sql(root_dir) -> List[Dict]:
+    """Function for locating and parsing sql files in a directory
+
+    :param str root_dir: The directory to search
+
+    :return: List of parse trees in the libpg_query json structure
+    :rtype: List[Dict]
+    """
+    return list(iter_sql(root_dir))
+
+
+def iter_sql(root_dir,
+             processes: Union[int, None] = None,
+             chunksize: int = 16) -> Iterator[Dict]:
+    """Function for locating and parsing sql files in a directory, yielding the parse trees one at a time
+
+    The files are parsed in-process with the libpg_query binding provided by the pglast package, so no intermediate
+    json files are needed. The parse trees can be passed straight to construct_configuration.
+
+    :param str root_dir: The directory to search
+    :param Union[int, None] processes: If set, parse the files in a process pool with this many processes
+    :param int chunksize: The number of files handed to a worker process at a time
+
+    :return: Generator yielding the parse trees in the order the files are found
+    :rtype: Iterator[Dict]
+    """
 
-    files = find_json_files(root_dir)
-    statements = []
-    for file in files:
-        with open(file, 'r') as f:
-            statements.append(json.load(f))
+    paths = (file.path for file in iter_sql_files(root_dir))
+    return _read_files(paths, _parse_sql_files, (), processes, chunksize)
 
-    return statements
+
+def _read_files(paths: Iterable[str],
+                reader,
+                arguments: tuple,
+                processes: Union[int, None],
+                chunksize: int) -> Iterator[Dict]:
+    """Function for reading files with the given reader, optionally spread across a process pool
+
+    :param Iterable[str] paths: The files
+    :param reader: Function taking a list of paths followed by the arguments, returning the parsed files
+    :param tuple arguments: The additional reader arguments
+    :param Union[int, None] processes: If set, read the files in a process pool with this many processes
+    :param int chunksize: The number of files handed to a worker process at a time
+
+    :return: Generator yielding the parsed files in order
+    :rtype: Iterator[Dict]
+    """
+
+    if processes is None:
+        for path in paths:
+            yield from reader([path], *arguments)
+        return
+
+    # Only keep a bounded number of chunks in flight so memory does not grow with the number of files
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = deque()
+        for chunk in _chunks(paths, chunksize):
+            pending.append(executor.submit(reader, chunk, *arguments))
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _read_json_files(paths: List[str], decoder: str) -> List[Dict]:
+    """Function for reading and parsing json files
+
+    :param List[str] paths: The files
+    :param str decoder: The json decoder to use, either 'json' or 'orjson'
+
+    :return: The parsed files
+    :rtype: List[Dict]
+    """
+
+    if decoder == 'json':
+        loads = json.loads
+    elif decoder == 'orjson':
+        import orjson
+        loads = orjson.loads
+    else:
+        raise ValueError(f'Unknown json decoder {decoder}')
+
+    parsed = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            parsed.append(loads(f.read()))
+
+    return parsed
+
+
+def _parse_sql_files(paths: List[str]) -> List[Dict]:
+    """Function for reading and parsing sql files with libpg_query
+
+    :param List[str] paths: The files
+
+    :return: The parse trees
+    :rtype: List[Dict]
+    """
+
+    from pglast.parser import parse_sql_json
+
+    parsed = []
+    for path in paths:
+        with open(path, 'r') as f:
+            parsed.append(json.loads(parse_sql_json(f.read())))
+
+    return parsed
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    """Function for splitting an iterable into lists of the given size
+
+    :param Iterable items: The items
+    :param int size: The maximum size of each list
+
+    :return: Generator yielding the lists
+    :rtype: Iterator[List]
+    """
+    iterator = iter(items)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
@@ -1 +1,3 @@
-from ._state import get_state
+from ._async import connect_async
+from ._changelog import get_change_log_watermark, install_change_log, prune_change_log, refresh_state
+from ._state import get_state, get_state_async
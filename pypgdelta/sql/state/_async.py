@@ -0,0 +1,84 @@
+import asyncio
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
+from typing import Dict, List, Union
+
+
+async def connect_async(dsn: str) -> psycopg2.extensions.connection:
+    """Function for opening an asynchronous connection that can be used with the *_async functions
+
+    :param str dsn: The connection string
+
+    :return: The asynchronous connection
+    :rtype: psycopg2.extensions.connection
+    """
+    connection = psycopg2.connect(dsn, async_=True)
+    await wait_async(connection)
+
+    return connection
+
+
+async def fetch_rows_async(connection: psycopg2.extensions.connection,
+                           query: str,
+                           parameters: Union[Dict, None] = None) -> List[psycopg2.extras.RealDictRow]:
+    """Function for running a query on an asynchronous connection and getting the resulting rows
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param str query: The query to run
+    :param Union[Dict, None] parameters: The query parameters
+
+    :return: List of rows using key-value pairs for the data
+    :rtype: List[psycopg2.extras.RealDictRow]
+    """
+    cursor = connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+    try:
+        cursor.execute(query, parameters)
+        await wait_async(connection)
+
+        results = cursor.fetchall()
+    finally:
+        cursor.close()
+    return results
+
+
+async def wait_async(connection: psycopg2.extensions.connection):
+    """Function for waiting on an asynchronous connection without blocking the event loop
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :return: Returns when the pending operation on the connection has completed
+    """
+
+    loop = asyncio.get_running_loop()
+    while True:
+        state = connection.poll()
+        if state == psycopg2.extensions.POLL_OK:
+            return
+        elif state == psycopg2.extensions.POLL_READ:
+            await _wait_for_socket(connection.fileno(), loop.add_reader, loop.remove_reader)
+        elif state == psycopg2.extensions.POLL_WRITE:
+            await _wait_for_socket(connection.fileno(), loop.add_writer, loop.remove_writer)
+        else:
+            raise psycopg2.OperationalError(f'Unexpected poll state {state}')
+
+
+async def _wait_for_socket(fileno: int, add_callback, remove_callback):
+    """Function for waiting until the socket is ready using the given event loop registration methods
+
+    :param int fileno: The socket file descriptor
+    :param add_callback: The event loop method registering the callback (add_reader or add_writer)
+    :param remove_callback: The event loop method removing the callback (remove_reader or remove_writer)
+    :return: Returns when the socket is ready
+    """
+
+    future = asyncio.get_running_loop().create_future()
+
+    def _ready():
+        if not future.done():
+            future.set_result(None)
+
+    add_callback(fileno, _ready)
+    try:
+        await future
+    finally:
+        remove_callback(fileno)
@@ -0,0 +1,346 @@
+import psycopg2
+import psycopg2.extras
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple, Union
+
+from ._async import fetch_rows_async
+from ._constraint import _add_constraint
+from ._cursor import fetch_rows
+from ._filter import build_filter
+from ._index import _add_index
+from ._table import _add_table_column
+
+_CATALOG_QUERY_TEMPLATE = """SELECT 'schema'::text       AS kind,
+                           nsp.nspname::text    AS schema_name,
+                           NULL::text           AS table_schema,
+                           NULL::text           AS table_name,
+                           NULL::text           AS table_type,
+                           NULL::text           AS column_name,
+                           NULL::text           AS data_type,
+                           NULL::integer        AS character_maximum_length,
+                           NULL::text           AS udt_name,
+                           NULL::integer        AS numeric_precision,
+                           NULL::integer        AS numeric_scale,
+                           NULL::integer        AS datetime_precision,
+                           NULL::text           AS is_nullable,
+                           NULL::text           AS name,
+                           NULL::text           AS type,
+                           NULL::text           AS "schema",
+                           NULL::text           AS "table",
+                           NULL::text           AS "column",
+                           NULL::integer        AS position,
+                           NULL::text           AS foreign_schema,
+                           NULL::text           AS foreign_table,
+                           NULL::text           AS foreign_column,
+                           NULL::text           AS definition,
+                           NULL::text           AS method,
+                           NULL::boolean        AS is_unique
+                    FROM pg_catalog.pg_namespace nsp
+                    WHERE (pg_catalog.pg_has_role(nsp.nspowner, 'USAGE')
+                           OR pg_catalog.has_schema_privilege(nsp.oid, 'CREATE, USAGE'))
+                      {schema_filter}
+                    UNION ALL
+                    SELECT 'column',
+                           NULL,
+                           nsp.nspname,
+                           rel.relname,
+                           CASE
+                               WHEN nsp.oid = pg_catalog.pg_my_temp_schema() THEN 'LOCAL TEMPORARY'
+                               WHEN rel.relkind IN ('r', 'p') THEN 'BASE TABLE'
+                               WHEN rel.relkind = 'v' THEN 'VIEW'
+                               WHEN rel.relkind = 'f' THEN 'FOREIGN'
+                           END,
+                           att.attname,
+                           CASE
+                               WHEN typ.typtype = 'd' THEN
+                                   CASE
+                                       WHEN btyp.typelem <> 0 AND btyp.typlen = -1 THEN 'ARRAY'
+                                       WHEN btnsp.nspname = 'pg_catalog'
+                                           THEN pg_catalog.format_type(typ.typbasetype, NULL)
+                                       ELSE 'USER-DEFINED'
+                                   END
+                               WHEN typ.typelem <> 0 AND typ.typlen = -1 THEN 'ARRAY'
+                               WHEN tnsp.nspname = 'pg_catalog' THEN pg_catalog.format_type(att.atttypid, NULL)
+                               ELSE 'USER-DEFINED'
+                           END,
+                           information_schema._pg_char_max_length(
+                               information_schema._pg_truetypid(att.*, typ.*),
+                               information_schema._pg_truetypmod(att.*, typ.*)
+                           )::integer,
+                           COALESCE(btyp.typname, typ.typname)::text,
+                           information_schema._pg_numeric_precision(
+                               information_schema._pg_truetypid(att.*, typ.*),
+                               information_schema._pg_truetypmod(att.*, typ.*)
+                           )::integer,
+                           information_schema._pg_numeric_scale(
+                               information_schema._pg_truetypid(att.*, typ.*),
+                               information_schema._pg_truetypmod(att.*, typ.*)
+                           )::integer,
+                           information_schema._pg_datetime_precision(
+                               information_schema._pg_truetypid(att.*, typ.*),
+                               information_schema._pg_truetypmod(att.*, typ.*)
+                           )::integer,
+                           CASE WHEN att.attnotnull OR (typ.typtype = 'd' AND typ.typnotnull) THEN 'NO' ELSE 'YES' END,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           att.attnum::integer,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL
+                    FROM pg_catalog.pg_attribute att
+                             INNER JOIN pg_catalog.pg_class rel
+                                        ON rel.oid = att.attrelid
+                             INNER JOIN pg_catalog.pg_namespace nsp
+                                        ON nsp.oid = rel.relnamespace
+                             INNER JOIN pg_catalog.pg_type typ
+                                        ON typ.oid = att.atttypid
+                             INNER JOIN pg_catalog.pg_namespace tnsp
+                                        ON tnsp.oid = typ.typnamespace
+                             LEFT JOIN pg_catalog.pg_type btyp
+                                       ON btyp.oid = typ.typbasetype
+                             LEFT JOIN pg_catalog.pg_namespace btnsp
+                                       ON btnsp.oid = btyp.typnamespace
+                    WHERE att.attnum > 0
+                      AND NOT att.attisdropped
+                      AND rel.relkind IN ('r', 'v', 'f', 'p')
+                      AND NOT pg_catalog.pg_is_other_temp_schema(nsp.oid)
+                      AND (pg_catalog.pg_has_role(rel.relowner, 'USAGE')
+                           OR pg_catalog.has_column_privilege(rel.oid, att.attnum,
+                                                              'SELECT, INSERT, UPDATE, REFERENCES'))
+                      {relation_filter}
+                    UNION ALL
+                    SELECT 'constraint',
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           con.conname,
+                           con.contype::text,
+                           nsp.nspname,
+                           rel.relname,
+                           att.attname,
+                           con_key.position::integer,
+                           fnsp.nspname,
+                           frel.relname,
+                           fatt.attname,
+                           CASE WHEN con.contype = 'c' THEN pg_catalog.pg_get_constraintdef(con.oid) END,
+                           NULL,
+                           NULL
+                    FROM pg_catalog.pg_constraint con
+                             INNER JOIN pg_catalog.pg_class rel
+                                        ON rel.oid = con.conrelid
+                             INNER JOIN pg_catalog.pg_namespace nsp
+                                        ON nsp.oid = rel.relnamespace
+                             LEFT JOIN LATERAL unnest(con.conkey, con.confkey)
+                                 WITH ORDINALITY AS con_key(attnum, foreign_attnum, position)
+                                       ON true
+                             LEFT JOIN pg_catalog.pg_attribute att
+                                       ON att.attrelid = con.conrelid
+                                           AND att.attnum = con_key.attnum
+                             LEFT JOIN pg_catalog.pg_class frel
+                                       ON frel.oid = con.confrelid
+                             LEFT JOIN pg_catalog.pg_namespace fnsp
+                                       ON fnsp.oid = frel.relnamespace
+                             LEFT JOIN pg_catalog.pg_attribute fatt
+                                       ON fatt.attrelid = con.confrelid
+                                           AND fatt.attnum = con_key.foreign_attnum
+                    WHERE con.contype IN ('p', 'f', 'u', 'c')
+                      {relation_filter}
+                    UNION ALL
+                    SELECT 'index',
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           idx.relname,
+                           NULL,
+                           nsp.nspname,
+                           rel.relname,
+                           att.attname || CASE
+                               WHEN idx_key.option & 1 = 1 AND idx_key.option & 2 = 0 THEN ' DESC NULLS LAST'
+                               WHEN idx_key.option & 1 = 1 THEN ' DESC'
+                               WHEN idx_key.option & 2 = 2 THEN ' NULLS FIRST'
+                               ELSE ''
+                           END,
+                           idx_key.position::integer,
+                           NULL,
+                           NULL,
+                           NULL,
+                           NULL,
+                           am.amname::text,
+                           ind.indisunique
+                    FROM pg_catalog.pg_index ind
+                             INNER JOIN pg_catalog.pg_class idx
+                                        ON idx.oid = ind.indexrelid
+                             INNER JOIN pg_catalog.pg_class rel
+                                        ON rel.oid = ind.indrelid
+                             INNER JOIN pg_catalog.pg_namespace nsp
+                                        ON nsp.oid = rel.relnamespace
+                             INNER JOIN pg_catalog.pg_am am
+                                        ON am.oid = idx.relam
+                             INNER JOIN LATERAL unnest(ind.indkey::smallint[], ind.indoption::smallint[])
+                                 WITH ORDINALITY AS idx_key(attnum, option, position)
+                                        ON true
+                             INNER JOIN pg_catalog.pg_attribute att
+                                        ON att.attrelid = ind.indrelid
+                                            AND att.attnum = idx_key.attnum
+                    WHERE rel.relkind IN ('r', 'p')
+                      AND ind.indexprs IS NULL
+                      AND ind.indpred IS NULL
+                      AND ind.indnatts = ind.indnkeyatts
+                      AND NOT EXISTS (SELECT
+                                      FROM pg_catalog.pg_constraint con
+                                      WHERE con.conindid = ind.indexrelid
+                                        AND con.conrelid = ind.indrelid
+                                        AND con.contype IN ('p', 'u', 'x'))
+                      {relation_filter}
+                    ORDER BY kind, schema_name, table_schema, table_name, "schema", "table", name, position"""
+
+# Restricts the catalog query to the relations given in the relation_ids parameter
+_RELATION_CATALOG_QUERY = _CATALOG_QUERY_TEMPLATE.format(
+    schema_filter='AND false',
+    relation_filter='AND rel.oid = ANY(%(relation_ids)s::oid[])'
+)
+
+
+def get_catalog_sql(connection: psycopg2.extensions.connection,
+                    itersize: Union[int, None] = None,
+                    filters: Union[Dict, None] = None) -> Iterable[psycopg2.extras.RealDictRow]:
+    """Function for getting the schemas, columns, constraints and indexes for a sql database in a single query
+
+    The information is read directly from pg_catalog rather than the information_schema views. Each row has a kind
+    ('schema', 'column', 'constraint' or 'index') and carries the same keys as the rows returned by get_schema_names,
+    get_sql_tables_and_views, get_constraints_sql and get_indexes_sql respectively.
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: The rows using key-value pairs for the data
+    :rtype: Iterable[psycopg2.extras.RealDictRow]
+    """
+    query, parameters = _get_query(filters)
+    return fetch_rows(connection, query, parameters, itersize=itersize)
+
+
+async def get_catalog_sql_async(connection: psycopg2.extensions.connection,
+                                filters: Union[Dict, None] = None) -> List[psycopg2.extras.RealDictRow]:
+    """Function for getting the schemas, columns, constraints and indexes for a sql database using an asynchronous
+    connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: List of rows using key-value pairs for the data
+    :rtype: List[psycopg2.extras.RealDictRow]
+    """
+    query, parameters = _get_query(filters)
+    return await fetch_rows_async(connection, query, parameters)
+
+
+def get_relation_catalog_sql(connection: psycopg2.extensions.connection,
+                             relation_ids: List[int]) -> List[psycopg2.extras.RealDictRow]:
+    """Function for getting the columns, constraints and indexes of the given relations in a single query
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param List[int] relation_ids: The oids of the relations
+
+    :return: List of rows using key-value pairs for the data
+    :rtype: List[psycopg2.extras.RealDictRow]
+    """
+    return fetch_rows(connection, _RELATION_CATALOG_QUERY, {'relation_ids': relation_ids})
+
+
+def get_catalog_dicts(connection: psycopg2.extensions.connection,
+                      itersize: Union[int, None] = None,
+                      filters: Union[Dict, None] = None) -> Tuple[Dict, Dict, Dict, Dict]:
+    """Function for getting the schema, table, constraint and index configurations using a single catalog query
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: The schema, table, constraint and index configurations, matching get_schemadict, get_table_dict,
+        get_constraints_dict and get_index_dict respectively
+    :rtype: Tuple[Dict, Dict, Dict, Dict]
+    """
+    return _build_catalog_dicts(get_catalog_sql(connection, itersize=itersize, filters=filters))
+
+
+async def get_catalog_dicts_async(connection: psycopg2.extensions.connection,
+                                  filters: Union[Dict, None] = None) -> Tuple[Dict, Dict, Dict, Dict]:
+    """Function for getting the schema, table, constraint and index configurations using a single catalog query on
+    an asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: The schema, table, constraint and index configurations
+    :rtype: Tuple[Dict, Dict, Dict, Dict]
+    """
+    return _build_catalog_dicts(await get_catalog_sql_async(connection, filters=filters))
+
+
+def _get_query(filters: Union[Dict, None]) -> Tuple[str, Dict]:
+    """Function for getting the catalog query with the filters applied
+
+    :param Union[Dict, None] filters: The schema/table include and exclude filters
+
+    :return: The query and its parameters
+    :rtype: Tuple[str, Dict]
+    """
+    schema_condition, parameters = build_filter(filters, 'nsp.nspname')
+    relation_condition, relation_parameters = build_filter(filters, 'nsp.nspname', 'rel.relname')
+    parameters.update(relation_parameters)
+
+    query = _CATALOG_QUERY_TEMPLATE.format(schema_filter=schema_condition, relation_filter=relation_condition)
+    return query, parameters
+
+
+def _build_catalog_dicts(catalog_information: Iterable[psycopg2.extras.RealDictRow]) -> Tuple[Dict, Dict, Dict, Dict]:
+    """Function for building the schema, table, constraint and index configurations from the catalog rows
+
+    :param Iterable[psycopg2.extras.RealDictRow] catalog_information: The catalog rows from the database
+
+    :return: The schema, table, constraint and index configurations
+    :rtype: Tuple[Dict, Dict, Dict, Dict]
+    """
+
+    schemas = OrderedDict()
+    tables = OrderedDict()
+    constraints = OrderedDict()
+    indexes = OrderedDict()
+
+    for row in catalog_information:
+        if row['kind'] == 'schema':
+            schemas[row['schema_name']] = OrderedDict()
+        elif row['kind'] == 'column':
+            _add_table_column(tables, row)
+        elif row['kind'] == 'constraint':
+            _add_constraint(constraints, row)
+        else:
+            _add_index(indexes, row)
+
+    return schemas, tables, constraints, indexes
@@ -0,0 +1,265 @@
+import psycopg2
+import psycopg2.extras
+from collections import OrderedDict
+from typing import Dict, Union
+
+from ..._model import Schema, Table
+from ._catalog import _build_catalog_dicts, get_relation_catalog_sql
+from ._cursor import fetch_rows
+from ._filter import build_filter
+from ._state import _merge_state
+
+_RELATIONS_QUERY = """SELECT rel.oid     AS relation_id,
+                             nsp.nspname AS schema,
+                             rel.relname AS name,
+                             CASE
+                                 WHEN rel.relkind IN ('r', 'p') AND nsp.oid <> pg_catalog.pg_my_temp_schema()
+                                     THEN 'tables'
+                                 ELSE 'views'
+                             END         AS kind
+                      FROM pg_catalog.pg_class rel
+                               INNER JOIN pg_catalog.pg_namespace nsp
+                                          ON nsp.oid = rel.relnamespace
+                      WHERE rel.relkind IN ('r', 'v', 'f', 'p')
+                        AND (rel.oid = ANY(%(relation_ids)s::oid[])
+                          OR nsp.nspname = ANY(%(schemas)s::text[])) {filter}"""
+
+_SCHEMAS_QUERY = """SELECT nsp.nspname AS name
+                    FROM pg_catalog.pg_namespace nsp
+                    WHERE nsp.nspname = ANY(%(schemas)s::text[]) {filter}"""
+
+
+def install_change_log(connection: psycopg2.extensions.connection, schema_name: str = 'pypgdelta'):
+    """Function for installing the DDL event triggers that record changed objects in a log table
+
+    Creating event triggers requires superuser privileges. The log is used by refresh_state to update a previously
+    fetched state without re-reading the whole catalog, and is kept small with prune_change_log.
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param str schema_name: The schema holding the log table and trigger functions
+    """
+
+    statements = [
+        f"CREATE SCHEMA IF NOT EXISTS {schema_name}",
+        f"""CREATE TABLE IF NOT EXISTS {schema_name}.ddl_change_log (
+                id          bigserial PRIMARY KEY,
+                relation_id oid,
+                object_type text        NOT NULL,
+                schema_name text,
+                object_name text,
+                dropped     boolean     NOT NULL DEFAULT false,
+                logged_at   timestamptz NOT NULL DEFAULT now()
+            )""",
+        f"""CREATE OR REPLACE FUNCTION {schema_name}.log_ddl_command() RETURNS event_trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO {schema_name}.ddl_change_log (relation_id, object_type, schema_name, object_name)
+                SELECT CASE
+                           WHEN cmd.classid = 'pg_catalog.pg_namespace'::regclass THEN NULL
+                           WHEN cmd.object_type = 'index'
+                               THEN (SELECT idx.indrelid FROM pg_catalog.pg_index idx WHERE idx.indexrelid = cmd.objid)
+                           WHEN cmd.object_type = 'table constraint'
+                               THEN (SELECT con.conrelid FROM pg_catalog.pg_constraint con WHERE con.oid = cmd.objid)
+                           ELSE cmd.objid
+                       END,
+                       cmd.object_type,
+                       cmd.schema_name,
+                       cmd.object_identity
+                FROM pg_catalog.pg_event_trigger_ddl_commands() cmd
+                WHERE cmd.classid IN ('pg_catalog.pg_class'::regclass, 'pg_catalog.pg_namespace'::regclass)
+                   OR cmd.object_type = 'table constraint';
+            END
+            $$""",
+        f"""CREATE OR REPLACE FUNCTION {schema_name}.log_dropped_objects() RETURNS event_trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO {schema_name}.ddl_change_log (relation_id, object_type, schema_name, object_name, dropped)
+                SELECT CASE WHEN obj.object_type = 'schema' THEN NULL ELSE obj.objid END,
+                       obj.object_type,
+                       obj.schema_name,
+                       obj.object_name,
+                       true
+                FROM pg_catalog.pg_event_trigger_dropped_objects() obj
+                WHERE obj.object_type IN ('schema', 'table', 'view', 'foreign table', 'index');
+            END
+            $$""",
+        f"DROP EVENT TRIGGER IF EXISTS {schema_name}_ddl_command_end",
+        f"""CREATE EVENT TRIGGER {schema_name}_ddl_command_end ON ddl_command_end
+            EXECUTE PROCEDURE {schema_name}.log_ddl_command()""",
+        f"DROP EVENT TRIGGER IF EXISTS {schema_name}_sql_drop",
+        f"""CREATE EVENT TRIGGER {schema_name}_sql_drop ON sql_drop
+            EXECUTE PROCEDURE {schema_name}.log_dropped_objects()""",
+    ]
+
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def get_change_log_watermark(connection: psycopg2.extensions.connection, schema_name: str = 'pypgdelta') -> int:
+    """Function for getting the id of the latest change log entry
+
+    Read the watermark before calling get_state, and pass it to refresh_state later on.
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param str schema_name: The schema holding the log table
+
+    :return: The watermark
+    :rtype: int
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT coalesce(max(id), 0) FROM {schema_name}.ddl_change_log")
+
+        watermark = cursor.fetchone()[0]
+    return watermark
+
+
+def prune_change_log(connection: psycopg2.extensions.connection,
+                     watermark: int,
+                     schema_name: str = 'pypgdelta') -> int:
+    """Function for deleting the change log entries at or below a watermark, which refresh_state no longer needs
+
+    The log grows with every DDL statement, prune it once the states kept elsewhere are refreshed. When several states
+    are refreshed from the same log, pass the lowest of their watermarks.
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param int watermark: The watermark, as returned by get_change_log_watermark or refresh_state
+    :param str schema_name: The schema holding the log table
+
+    :return: The number of deleted entries
+    :rtype: int
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {schema_name}.ddl_change_log WHERE id <= %(watermark)s", {'watermark': watermark})
+
+        deleted = cursor.rowcount
+    return deleted
+
+
+def refresh_state(previous_state: Dict,
+                  connection: psycopg2.extensions.connection,
+                  watermark: int,
+                  schema_name: str = 'pypgdelta',
+                  filters: Union[Dict, None] = None) -> int:
+    """Function for patching a previously fetched state with the DDL changes logged since the watermark
+
+    Only the relations touched since the watermark, and all relations of the schemas created or renamed since then,
+    are introspected again. Requires install_change_log.
+
+    :param Dict previous_state: The state to update in place, as returned by get_state, either as dicts or using the
+        object model
+    :param psycopg2.extensions.connection connection: The connection
+    :param int watermark: The watermark the previous state corresponds to
+    :param str schema_name: The schema holding the log table
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, pass the filters the previous
+        state was fetched with, see get_state
+
+    :return: The new watermark
+    :rtype: int
+    """
+
+    changes = fetch_rows(
+        connection,
+        f"""SELECT id, relation_id, object_type, schema_name, object_name, dropped
+            FROM {schema_name}.ddl_change_log
+            WHERE id > %(watermark)s
+            ORDER BY id""",
+        {'watermark': watermark}
+    )
+    if not changes:
+        return watermark
+
+    # Keep the object model if the state uses it
+    model = any(isinstance(schema_definition, Schema) for schema_definition in previous_state.values())
+
+    # Apply the schema drops in order, and collect the touched relations
+    relation_ids = set()
+    changed_schemas = []
+    dropped_indexes = []
+    for change in changes:
+        if change['object_type'] == 'schema':
+            if change['dropped']:
+                previous_state.pop(change['object_name'], None)
+            elif change['object_name'] not in changed_schemas:
+                changed_schemas.append(change['object_name'])
+        elif change['object_type'] == 'index' and change['dropped']:
+            dropped_indexes.append((change['schema_name'], change['object_name']))
+        elif change['relation_id'] is not None and not change['dropped']:
+            relation_ids.add(change['relation_id'])
+
+    # Remove the schemas that no longer exist, e.g. the old name of a renamed schema, and add the created ones
+    schema_filter, schema_parameters = build_filter(filters, 'nsp.nspname')
+    existing_schemas = {
+        schema['name']
+        for schema in fetch_rows(
+            connection,
+            _SCHEMAS_QUERY.format(filter=schema_filter),
+            dict(schema_parameters, schemas=list(previous_state) + changed_schemas)
+        )
+    }
+    for schema in [schema for schema in previous_state if schema not in existing_schemas]:
+        del previous_state[schema]
+
+    new_schemas = set()
+    for schema in changed_schemas:
+        if schema in existing_schemas and schema not in previous_state:
+            previous_state[schema] = Schema() if model else OrderedDict()
+            new_schemas.add(schema)
+
+    # Get the current location of the touched relations and of every relation in the known schemas, this is cheap
+    # compared to reading the columns
+    relation_filter, relation_parameters = build_filter(filters, 'nsp.nspname', 'rel.relname')
+    relations = OrderedDict(
+        [
+            (relation['relation_id'], relation)
+            for relation in fetch_rows(
+                connection,
+                _RELATIONS_QUERY.format(filter=relation_filter),
+                dict(relation_parameters, relation_ids=sorted(relation_ids), schemas=list(previous_state))
+            )
+        ]
+    )
+
+    # Every relation of a created or renamed schema is new to the state
+    relation_ids.update(
+        relation_id for relation_id, relation in relations.items() if relation['schema'] in new_schemas
+    )
+
+    # Dropped indexes are logged without their table, which is looked up in the previous state
+    relation_ids_by_name = {
+        (relation['schema'], relation['kind'], relation['name']): relation_id
+        for relation_id, relation in relations.items()
+    }
+    for schema, index_name in dropped_indexes:
+        for table_name, definition in previous_state.get(schema, {}).get('tables', {}).items():
+            if index_name in definition.get('indexes', {}):
+                relation_id = relation_ids_by_name.get((schema, 'tables', table_name))
+                if relation_id is not None:
+                    relation_ids.add(relation_id)
+
+    # Remove dropped, renamed, moved and excluded relations
+    for schema, schema_definition in previous_state.items():
+        for kind in ('tables', 'views'):
+            definitions = schema_definition.get(kind, {})
+            for name in [name for name in definitions if (schema, kind, name) not in relation_ids_by_name]:
+                del definitions[name]
+
+    # Introspect the touched relations again and patch them into the state
+    refreshed_ids = sorted(relation_id for relation_id in relation_ids if relation_id in relations)
+    _, tables, constraints, indexes = _build_catalog_dicts(get_relation_catalog_sql(connection, refreshed_ids))
+    refreshed = _merge_state(OrderedDict(), tables, constraints, indexes)
+    for relation_id in refreshed_ids:
+        relation = relations[relation_id]
+
+        schema_definition = previous_state.setdefault(relation['schema'], Schema() if model else OrderedDict())
+        if 'tables' not in schema_definition:
+            schema_definition['tables'] = OrderedDict()
+            schema_definition['views'] = OrderedDict()
+        definitions = schema_definition.setdefault(relation['kind'], OrderedDict())
+        definition = refreshed.get(relation['schema'], {}).get(relation['kind'], {}).get(relation['name'])
+        if definition is None:
+            definitions.pop(relation['name'], None)
+        else:
+            definitions[relation['name']] = Table.from_dict(definition) if model else definition
+
+    return max(change['id'] for change in changes)
@@ -0,0 +1,134 @@
+import psycopg2
+import psycopg2.pool
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+from ._constraint import get_constraints_dict
+from ._index import get_index_dict
+from ._schema import get_schemadict
+from ._table import get_table_dict
+
+
+def get_concurrent_dicts(source: Union[str, psycopg2.pool.AbstractConnectionPool],
+                         itersize: Union[int, None] = None,
+                         filters: Union[Dict, None] = None) -> Tuple[Dict, Dict, Dict, Dict]:
+    """Function for getting the schema, table, constraint and index configurations by running their queries in
+    parallel
+
+    The schema, table, constraint and index queries run on separate connections. All of them read from the same
+    snapshot, exported by the first connection through pg_export_snapshot, so the result is consistent.
+
+    :param Union[str, psycopg2.pool.AbstractConnectionPool] source: A DSN or a (threaded) connection pool providing
+        the connections
+    :param Union[int, None] itersize: If set, stream the rows through server-side cursors with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the queries
+
+    :return: The schema, table, constraint and index configurations
+    :rtype: Tuple[Dict, Dict, Dict, Dict]
+    """
+
+    builders = [get_schemadict, get_table_dict, get_constraints_dict, get_index_dict]
+    connections = _acquire_connections(source, len(builders))
+    autocommit = [connection.autocommit for connection in connections]
+    try:
+        _share_snapshot(connections)
+
+        with ThreadPoolExecutor(max_workers=len(builders)) as executor:
+            futures = [
+                executor.submit(builder, connection, itersize, filters)
+                for builder, connection in zip(builders, connections)
+            ]
+            schemas, tables, constraints, indexes = [future.result() for future in futures]
+
+    finally:
+        try:
+            for connection, previous_autocommit in zip(connections, autocommit):
+                _end_snapshot(connection, previous_autocommit)
+        finally:
+            _release_connections(source, connections)
+
+    return schemas, tables, constraints, indexes
+
+
+def _end_snapshot(connection: psycopg2.extensions.connection, autocommit: bool):
+    """Function for ending the transaction opened by _share_snapshot and restoring the autocommit mode
+
+    Errors are ignored, so a broken connection does not hide the error that broke it.
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param bool autocommit: The autocommit mode to restore
+    """
+
+    if connection.closed:
+        return
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("ROLLBACK")
+    except psycopg2.Error:
+        pass
+
+    try:
+        connection.autocommit = autocommit
+    except psycopg2.Error:
+        pass
+
+
+def _share_snapshot(connections: List[psycopg2.extensions.connection]):
+    """Function for opening read only transactions on the connections that all see the same snapshot
+
+    :param List[psycopg2.extensions.connection] connections: The connections, the first one exports the snapshot
+    :return: Leaves a transaction open on each of the connections
+    """
+
+    snapshot = None
+    for connection in connections:
+        # The transactions are started explicitly, as SET TRANSACTION SNAPSHOT has to be their first statement
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute("BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            if snapshot is None:
+                cursor.execute("SELECT pg_catalog.pg_export_snapshot()")
+                snapshot = cursor.fetchone()[0]
+            else:
+                cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+
+
+def _acquire_connections(source: Union[str, psycopg2.pool.AbstractConnectionPool],
+                         count: int) -> List[psycopg2.extensions.connection]:
+    """Function for getting connections from a DSN or a connection pool
+
+    :param Union[str, psycopg2.pool.AbstractConnectionPool] source: The DSN or connection pool
+    :param int count: The number of connections
+
+    :return: The connections
+    :rtype: List[psycopg2.extensions.connection]
+    """
+
+    connections = []
+    try:
+        for _ in range(count):
+            if isinstance(source, psycopg2.pool.AbstractConnectionPool):
+                connections.append(source.getconn())
+            else:
+                connections.append(psycopg2.connect(source))
+    except Exception:
+        _release_connections(source, connections)
+        raise
+
+    return connections
+
+
+def _release_connections(source: Union[str, psycopg2.pool.AbstractConnectionPool],
+                         connections: List[psycopg2.extensions.connection]):
+    """Function for handing connections back to the pool, or closing them if they were created from a DSN
+
+    :param Union[str, psycopg2.pool.AbstractConnectionPool] source: The DSN or connection pool
+    :param List[psycopg2.extensions.connection] connections: The connections
+    """
+
+    for connection in connections:
+        if isinstance(source, psycopg2.pool.AbstractConnectionPool):
+            source.putconn(connection)
+        else:
+            connection.close()
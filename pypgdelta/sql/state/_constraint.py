@@ -1,77 +1,170 @@
 from collections import OrderedDict
-from typing import List, Dict
+from typing import Dict, Iterable, List, Tuple, Union
 
 import psycopg2
-
-
-def get_constraints_sql(connection: psycopg2.extensions.connection) -> List[psycopg2.extras.RealDictRow]:
+import psycopg2.extras
+
+from ._async import fetch_rows_async
+from ._cursor import fetch_rows
+from ._filter import build_filter
+
+_CONSTRAINTS_QUERY = """SELECT con.conname                                AS name,
+                               con.contype::text                          AS type,
+                               nsp.nspname                                AS schema,
+                               rel.relname                                AS table,
+                               att.attname                                AS column,
+                               con_key.position::integer                  AS position,
+                               fnsp.nspname                               AS foreign_schema,
+                               frel.relname                               AS foreign_table,
+                               fatt.attname                               AS foreign_column,
+                               CASE
+                                   WHEN con.contype = 'c' THEN pg_catalog.pg_get_constraintdef(con.oid)
+                               END                                        AS definition
+                        FROM pg_catalog.pg_constraint con
+                                 INNER JOIN pg_catalog.pg_class rel
+                                            ON rel.oid = con.conrelid
+                                 INNER JOIN pg_catalog.pg_namespace nsp
+                                            ON nsp.oid = rel.relnamespace
+                                 LEFT JOIN LATERAL unnest(con.conkey, con.confkey)
+                                     WITH ORDINALITY AS con_key(attnum, foreign_attnum, position)
+                                           ON true
+                                 LEFT JOIN pg_catalog.pg_attribute att
+                                           ON att.attrelid = con.conrelid
+                                               AND att.attnum = con_key.attnum
+                                 LEFT JOIN pg_catalog.pg_class frel
+                                           ON frel.oid = con.confrelid
+                                 LEFT JOIN pg_catalog.pg_namespace fnsp
+                                           ON fnsp.oid = frel.relnamespace
+                                 LEFT JOIN pg_catalog.pg_attribute fatt
+                                           ON fatt.attrelid = con.confrelid
+                                               AND fatt.attnum = con_key.foreign_attnum
+                        WHERE con.contype IN ('p', 'f', 'u', 'c') {filter}
+                        ORDER BY nsp.nspname, rel.relname, con.conname, con_key.position"""
+
+
+def get_constraints_sql(connection: psycopg2.extensions.connection,
+                        itersize: Union[int, None] = None,
+                        filters: Union[Dict, None] = None) -> Iterable[psycopg2.extras.RealDictRow]:
     """Function for getting the constraints for a sql database
 
     :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: The rows using key-value pairs for the data
+    :rtype: Iterable[psycopg2.extras.RealDictRow]
+    """
+    query, parameters = _get_query(filters)
+    return fetch_rows(connection, query, parameters, itersize=itersize)
+
+
+async def get_constraints_sql_async(connection: psycopg2.extensions.connection,
+                                    filters: Union[Dict, None] = None) -> List[psycopg2.extras.RealDictRow]:
+    """Function for getting the constraints for a sql database using an asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
 
     :return: List of rows using key-value pairs for the data
     :rtype: List[psycopg2.extras.RealDictRow]
     """
-    with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-        query = """SELECT con.conname      AS name,
-                          con.contype      AS type,
-                          ccu.table_schema AS schema,
-                          ccu.table_name   AS table,
-                          ccu.column_name  AS column
-                   FROM pg_catalog.pg_constraint con
-                            INNER JOIN pg_catalog.pg_class rel
-                                       ON rel.oid = con.conrelid
-                            INNER JOIN pg_catalog.pg_namespace nsp
-                                       ON nsp.oid = con.connamespace
-                            LEFT JOIN information_schema.constraint_column_usage ccu
-                                      ON con.conname = ccu.constraint_name
-                                          AND nsp.nspname = ccu.constraint_schema"""
-        cursor.execute(query)
-
-        results = cursor.fetchall()
-    return results
-
-
-def get_constraints_dict(connection: psycopg2.extensions.connection) -> Dict:
+    query, parameters = _get_query(filters)
+    return await fetch_rows_async(connection, query, parameters)
+
+
+def get_constraints_dict(connection: psycopg2.extensions.connection,
+                         itersize: Union[int, None] = None,
+                         filters: Union[Dict, None] = None) -> Dict:
     """Function for getting the constraints for a sql database as a dict
 
     :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
 
     :return: Current database setup as a nested dictionary
     :rtype: Dict
     """
+    return _build_constraints_dict(get_constraints_sql(connection, itersize=itersize, filters=filters))
 
-    configuration = OrderedDict()
-    constraint_information = get_constraints_sql(connection)
 
+async def get_constraints_dict_async(connection: psycopg2.extensions.connection,
+                                     filters: Union[Dict, None] = None) -> Dict:
+    """Function for getting the constraints for a sql database as a dict using an asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    return _build_constraints_dict(await get_constraints_sql_async(connection, filters=filters))
+
+
+def _get_query(filters: Union[Dict, None]) -> Tuple[str, Dict]:
+    """Function for getting the constraints query with the filters applied
+
+    :param Union[Dict, None] filters: The schema/table include and exclude filters
+
+    :return: The query and its parameters
+    :rtype: Tuple[str, Dict]
+    """
+    condition, parameters = build_filter(filters, 'nsp.nspname', 'rel.relname')
+    return _CONSTRAINTS_QUERY.format(filter=condition), parameters
+
+
+def _build_constraints_dict(constraint_information: Iterable[psycopg2.extras.RealDictRow]) -> Dict:
+    """Function for building the constraint dict from the constraint column rows
+
+    :param Iterable[psycopg2.extras.RealDictRow] constraint_information: The constraint rows from the database
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+
+    configuration = OrderedDict()
     for constraint in constraint_information:
+        _add_constraint(configuration, constraint)
 
-        # Set the schema
-        if constraint['schema'] not in configuration:
-            configuration[constraint['schema']] = OrderedDict(
-                [
-                    ('tables', OrderedDict())
-                ]
-            )
+    return configuration
 
-        schema_information = configuration[constraint['schema']]
 
-        # Set the table
-        if constraint['table'] not in schema_information['tables']:
-            schema_information['tables'][constraint['table']] = OrderedDict(
-                [
-                    ('columns', OrderedDict()),
-                    ('constraints', OrderedDict(
-                        [
-                            ('primary_key', OrderedDict())
-                        ]
-                    )),
-                ]
-            )
+def _add_constraint(configuration: Dict, constraint: psycopg2.extras.RealDictRow):
+    """Function for adding a single constraint column row to the configuration
+
+    The rows of a constraint have to arrive in column position order for the column lists to be ordered.
+
+    :param Dict configuration: The configuration to update
+    :param psycopg2.extras.RealDictRow constraint: The constraint row from the database
+    """
 
-        table_information = schema_information['tables'][constraint['table']]
+    # Set the schema
+    if constraint['schema'] not in configuration:
+        configuration[constraint['schema']] = OrderedDict(
+            [
+                ('tables', OrderedDict())
+            ]
+        )
+
+    schema_information = configuration[constraint['schema']]
+
+    # Set the table
+    if constraint['table'] not in schema_information['tables']:
+        schema_information['tables'][constraint['table']] = OrderedDict(
+            [
+                ('columns', OrderedDict()),
+                ('constraints', OrderedDict(
+                    [
+                        ('primary_key', OrderedDict())
+                    ]
+                )),
+            ]
+        )
 
-        # Set the column
+    table_information = schema_information['tables'][constraint['table']]
+    table_constraints = table_information['constraints']
+
+    # Set the column, check constraints do not necessarily reference any columns
+    if constraint['column'] is not None:
         if constraint['column'] not in table_information['columns']:
             table_information['columns'][constraint['column']] = OrderedDict(
                 [
@@ -88,31 +181,54 @@ def get_constraints_dict(connection: psycopg2.extensions.connection) -> Dict:
             }
         )
 
-        # Get the constraint configuration
-        if 'constraints' not in table_information:
-            table_constraints = OrderedDict(
+    # Set the primary key
+    if constraint['type'] == 'p':
+        constraint_information = table_constraints['primary_key']
+        constraint_information['name'] = constraint['name']
+
+    # Set the foreign keys
+    elif constraint['type'] == 'f':
+        foreign_keys = table_constraints.setdefault('foreign_keys', OrderedDict())
+        if constraint['name'] not in foreign_keys:
+            foreign_keys[constraint['name']] = OrderedDict(
                 [
-                    ('primary_key', OrderedDict())
+                    ('name', constraint['name']),
+                    ('foreign_schema', constraint['foreign_schema']),
+                    ('foreign_table', constraint['foreign_table']),
+                    ('foreign_columns', [])
                 ]
             )
 
-            # Get the primary key information
-            pk_information = table_constraints['primary_key']
-        else:
-            table_constraints = table_information['constraints']
-            if 'primary_key' not in table_constraints:
-                pk_information = OrderedDict()
-                table_constraints['primary_key'] = pk_information
-            else:
-                pk_information = table_constraints['primary_key']
-
-        # Set the primary key
-        if constraint['type'] == 'p':
-            pk_information['name'] = constraint['name']
-
-            # Verify column information for primary keys
-            pk_information['columns'] = pk_information.get('columns', [])
-            if constraint['column'] not in pk_information['columns']:
-                pk_information['columns'].append(constraint['column'])
+        constraint_information = foreign_keys[constraint['name']]
+        if constraint['foreign_column'] is not None:
+            constraint_information['foreign_columns'].append(constraint['foreign_column'])
 
-    return configuration
+    # Set the unique constraints
+    elif constraint['type'] == 'u':
+        unique_constraints = table_constraints.setdefault('unique', OrderedDict())
+        constraint_information = unique_constraints.setdefault(
+            constraint['name'],
+            OrderedDict(
+                [
+                    ('name', constraint['name'])
+                ]
+            )
+        )
+
+    # Set the check constraints
+    else:
+        check_constraints = table_constraints.setdefault('check', OrderedDict())
+        constraint_information = check_constraints.setdefault(
+            constraint['name'],
+            OrderedDict(
+                [
+                    ('name', constraint['name']),
+                    ('definition', constraint['definition'])
+                ]
+            )
+        )
+
+    # Set the ordered column list
+    constraint_information['columns'] = constraint_information.get('columns', [])
+    if constraint['column'] is not None and constraint['column'] not in constraint_information['columns']:
+        constraint_information['columns'].append(constraint['column'])
@@ -0,0 +1,55 @@
+import psycopg2
+import psycopg2.extras
+from typing import Dict, Iterable, Iterator, Union
+from uuid import uuid4
+
+
+def fetch_rows(connection: psycopg2.extensions.connection,
+               query: str,
+               parameters: Union[Dict, None] = None,
+               itersize: Union[int, None] = None) -> Iterable[psycopg2.extras.RealDictRow]:
+    """Function for running a query and getting the resulting rows
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param str query: The query to run
+    :param Union[Dict, None] parameters: The query parameters
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor fetching this many rows
+        per round trip instead of fetching every row up front
+
+    :return: The rows using key-value pairs for the data
+    :rtype: Iterable[psycopg2.extras.RealDictRow]
+    """
+    if itersize is not None:
+        return _stream_rows(connection, query, parameters, itersize)
+
+    with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+        cursor.execute(query, parameters)
+
+        results = cursor.fetchall()
+    return results
+
+
+def _stream_rows(connection: psycopg2.extensions.connection,
+                 query: str,
+                 parameters: Union[Dict, None],
+                 itersize: int) -> Iterator[psycopg2.extras.RealDictRow]:
+    """Function for streaming the rows of a query through a named (server-side) cursor
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param str query: The query to run
+    :param Union[Dict, None] parameters: The query parameters
+    :param int itersize: The number of rows to fetch per round trip
+
+    :return: Generator yielding the rows one at a time
+    :rtype: Iterator[psycopg2.extras.RealDictRow]
+    """
+
+    # Server-side cursors only live within a transaction unless declared WITH HOLD
+    with connection.cursor(name=f'pypgdelta_{uuid4().hex}',
+                           cursor_factory=psycopg2.extras.RealDictCursor,
+                           withhold=connection.autocommit) as cursor:
+        cursor.itersize = itersize
+        cursor.execute(query, parameters)
+
+        for row in cursor:
+            yield row
@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, List, Tuple, Union
+
+
+def build_filter(filters: Union[Dict, None],
+                 schema_column: str,
+                 table_column: Union[str, None] = None) -> Tuple[str, Dict]:
+    """Function for building the WHERE clause conditions for the schema and table include/exclude filters
+
+    The filters dict accepts the keys include_schemas, exclude_schemas, include_tables and exclude_tables. Each value
+    is either a single pattern or a list of patterns, where * matches any number of characters and ? matches a
+    single character. Table filters are only applied when a table column is given.
+
+    :param Union[Dict, None] filters: The filters
+    :param str schema_column: The sql expression holding the schema name
+    :param Union[str, None] table_column: The sql expression holding the table name
+
+    :return: The conditions, each prefixed with AND, and the query parameters they use
+    :rtype: Tuple[str, Dict]
+    """
+
+    conditions = []
+    parameters = {}
+    if not filters:
+        return '', parameters
+
+    columns = [('schemas', schema_column)]
+    if table_column is not None:
+        columns.append(('tables', table_column))
+
+    for kind, column in columns:
+        for mode in ('include', 'exclude'):
+            key = f'{mode}_{kind}'
+            patterns = _to_like_patterns(filters.get(key))
+            if not patterns:
+                continue
+
+            parameters[key] = patterns
+            if mode == 'include':
+                conditions.append(f"AND {column} LIKE ANY(%({key})s)")
+            else:
+                conditions.append(f"AND NOT {column} LIKE ANY(%({key})s)")
+
+    return ' '.join(conditions), parameters
+
+
+def _to_like_patterns(patterns: Union[str, Iterable[str], None]) -> List[str]:
+    """Function for converting glob style patterns to LIKE patterns
+
+    :param Union[str, Iterable[str], None] patterns: The pattern or patterns
+
+    :return: The LIKE patterns
+    :rtype: List[str]
+    """
+
+    if patterns is None:
+        return []
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    like_patterns = []
+    for pattern in patterns:
+        pattern = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        like_patterns.append(pattern.replace('*', '%').replace('?', '_'))
+
+    return like_patterns
@@ -0,0 +1,176 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple, Union
+
+import psycopg2
+import psycopg2.extras
+
+from ._async import fetch_rows_async
+from ._cursor import fetch_rows
+from ._filter import build_filter
+
+_INDEXES_QUERY = """SELECT idx.relname                                AS name,
+                           nsp.nspname                                AS schema,
+                           rel.relname                                AS table,
+                           att.attname || CASE
+                               WHEN idx_key.option & 1 = 1 AND idx_key.option & 2 = 0 THEN ' DESC NULLS LAST'
+                               WHEN idx_key.option & 1 = 1 THEN ' DESC'
+                               WHEN idx_key.option & 2 = 2 THEN ' NULLS FIRST'
+                               ELSE ''
+                           END                                        AS column,
+                           idx_key.position::integer                  AS position,
+                           am.amname::text                            AS method,
+                           ind.indisunique                            AS is_unique
+                    FROM pg_catalog.pg_index ind
+                             INNER JOIN pg_catalog.pg_class idx
+                                        ON idx.oid = ind.indexrelid
+                             INNER JOIN pg_catalog.pg_class rel
+                                        ON rel.oid = ind.indrelid
+                             INNER JOIN pg_catalog.pg_namespace nsp
+                                        ON nsp.oid = rel.relnamespace
+                             INNER JOIN pg_catalog.pg_am am
+                                        ON am.oid = idx.relam
+                             INNER JOIN LATERAL unnest(ind.indkey::smallint[], ind.indoption::smallint[])
+                                 WITH ORDINALITY AS idx_key(attnum, option, position)
+                                        ON true
+                             INNER JOIN pg_catalog.pg_attribute att
+                                        ON att.attrelid = ind.indrelid
+                                            AND att.attnum = idx_key.attnum
+                    WHERE rel.relkind IN ('r', 'p')
+                      AND ind.indexprs IS NULL
+                      AND ind.indpred IS NULL
+                      AND ind.indnatts = ind.indnkeyatts
+                      AND NOT EXISTS (SELECT
+                                      FROM pg_catalog.pg_constraint con
+                                      WHERE con.conindid = ind.indexrelid
+                                        AND con.conrelid = ind.indrelid
+                                        AND con.contype IN ('p', 'u', 'x')) {filter}
+                    ORDER BY nsp.nspname, rel.relname, idx.relname, idx_key.position"""
+
+
+def get_indexes_sql(connection: psycopg2.extensions.connection,
+                    itersize: Union[int, None] = None,
+                    filters: Union[Dict, None] = None) -> Iterable[psycopg2.extras.RealDictRow]:
+    """Function for getting the indexes for a sql database
+
+    Indexes backing a primary key, unique or exclusion constraint are part of the constraint, and expression indexes,
+    partial indexes and indexes with included columns are not managed, so these are left out.
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: The rows using key-value pairs for the data
+    :rtype: Iterable[psycopg2.extras.RealDictRow]
+    """
+    query, parameters = _get_query(filters)
+    return fetch_rows(connection, query, parameters, itersize=itersize)
+
+
+async def get_indexes_sql_async(connection: psycopg2.extensions.connection,
+                                filters: Union[Dict, None] = None) -> List[psycopg2.extras.RealDictRow]:
+    """Function for getting the indexes for a sql database using an asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: List of rows using key-value pairs for the data
+    :rtype: List[psycopg2.extras.RealDictRow]
+    """
+    query, parameters = _get_query(filters)
+    return await fetch_rows_async(connection, query, parameters)
+
+
+def get_index_dict(connection: psycopg2.extensions.connection,
+                   itersize: Union[int, None] = None,
+                   filters: Union[Dict, None] = None) -> Dict:
+    """Function for getting the indexes for a sql database as a dict
+
+    :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    return _build_index_dict(get_indexes_sql(connection, itersize=itersize, filters=filters))
+
+
+async def get_index_dict_async(connection: psycopg2.extensions.connection,
+                               filters: Union[Dict, None] = None) -> Dict:
+    """Function for getting the indexes for a sql database as a dict using an asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    return _build_index_dict(await get_indexes_sql_async(connection, filters=filters))
+
+
+def _get_query(filters: Union[Dict, None]) -> Tuple[str, Dict]:
+    """Function for getting the indexes query with the filters applied
+
+    :param Union[Dict, None] filters: The schema/table include and exclude filters
+
+    :return: The query and its parameters
+    :rtype: Tuple[str, Dict]
+    """
+    condition, parameters = build_filter(filters, 'nsp.nspname', 'rel.relname')
+    return _INDEXES_QUERY.format(filter=condition), parameters
+
+
+def _build_index_dict(index_information: Iterable[psycopg2.extras.RealDictRow]) -> Dict:
+    """Function for building the index dict from the index column rows
+
+    :param Iterable[psycopg2.extras.RealDictRow] index_information: The index rows from the database
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+
+    configuration = OrderedDict()
+    for index in index_information:
+        _add_index(configuration, index)
+
+    return configuration
+
+
+def _add_index(configuration: Dict, index: psycopg2.extras.RealDictRow):
+    """Function for adding a single index column row to the configuration
+
+    The rows of an index have to arrive in column position order for the column list to be ordered.
+
+    :param Dict configuration: The configuration to update
+    :param psycopg2.extras.RealDictRow index: The index row from the database
+    """
+
+    # Set the schema
+    if index['schema'] not in configuration:
+        configuration[index['schema']] = OrderedDict(
+            [
+                ('tables', OrderedDict())
+            ]
+        )
+
+    # Set the table
+    tables = configuration[index['schema']]['tables']
+    if index['table'] not in tables:
+        tables[index['table']] = OrderedDict(
+            [
+                ('indexes', OrderedDict())
+            ]
+        )
+
+    # Set the index
+    indexes = tables[index['table']]['indexes']
+    if index['name'] not in indexes:
+        indexes[index['name']] = OrderedDict(
+            [
+                ('columns', []),
+                ('unique', index['is_unique']),
+                ('method', index['method'])
+            ]
+        )
+
+    indexes[index['name']]['columns'].append(index['column'])
@@ -1,35 +1,95 @@
 import psycopg2
 import psycopg2.extras
 from collections import OrderedDict
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple, Union
 
+from ._async import fetch_rows_async
+from ._cursor import fetch_rows
+from ._filter import build_filter
 
-def get_schema_names(connection: psycopg2.extensions.connection) -> List[psycopg2.extras.RealDictRow]:
+_SCHEMA_QUERY = """SELECT *
+                   FROM information_schema.schemata
+                   WHERE true {filter}
+                   ORDER BY schema_name"""
+
+
+def get_schema_names(connection: psycopg2.extensions.connection,
+                     itersize: Union[int, None] = None,
+                     filters: Union[Dict, None] = None) -> Iterable[psycopg2.extras.RealDictRow]:
     """Function for getting the schema information from the given connection
 
     :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: The rows using key-value pairs for the data
+    :rtype: Iterable[psycopg2.extras.RealDictRow]
+    """
+    query, parameters = _get_query(filters)
+    return fetch_rows(connection, query, parameters, itersize=itersize)
+
+
+async def get_schema_names_async(connection: psycopg2.extensions.connection,
+                                 filters: Union[Dict, None] = None) -> List[psycopg2.extras.RealDictRow]:
+    """Function for getting the schema information from the given asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
 
     :return: List of rows using key-value pairs for the data
     :rtype: List[psycopg2.extras.RealDictRow]
     """
-    with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-        query = """SELECT *
-                   FROM information_schema.schemata"""
-        cursor.execute(query)
+    query, parameters = _get_query(filters)
+    return await fetch_rows_async(connection, query, parameters)
 
-        results = cursor.fetchall()
-    return results
 
-
-def get_schemadict(connection: psycopg2.extensions.connection) -> Dict:
+def get_schemadict(connection: psycopg2.extensions.connection,
+                   itersize: Union[int, None] = None,
+                   filters: Union[Dict, None] = None) -> Dict:
     """Function for getting the schema information from the given connection as a dict
 
     :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    return _build_schemadict(get_schema_names(connection, itersize=itersize, filters=filters))
+
+
+async def get_schemadict_async(connection: psycopg2.extensions.connection, filters: Union[Dict, None] = None) -> Dict:
+    """Function for getting the schema information from the given asynchronous connection as a dict
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    return _build_schemadict(await get_schema_names_async(connection, filters=filters))
+
+
+def _get_query(filters: Union[Dict, None]) -> Tuple[str, Dict]:
+    """Function for getting the schema query with the filters applied
+
+    :param Union[Dict, None] filters: The schema include and exclude filters
+
+    :return: The query and its parameters
+    :rtype: Tuple[str, Dict]
+    """
+    condition, parameters = build_filter(filters, 'schema_name')
+    return _SCHEMA_QUERY.format(filter=condition), parameters
+
+
+def _build_schemadict(schema_information: Iterable[psycopg2.extras.RealDictRow]) -> Dict:
+    """Function for building the schema dict from the schema rows
+
+    :param Iterable[psycopg2.extras.RealDictRow] schema_information: The schema rows from the database
 
     :return: Current database setup as a nested dictionary
     :rtype: Dict
     """
-    schema_information = get_schema_names(connection)
     database_setup = OrderedDict(
         [
             (schema['schema_name'], OrderedDict())
@@ -1,24 +1,124 @@
 import psycopg2
-from typing import Dict
+import psycopg2.pool
+from typing import Dict, Union
 
-from ._constraint import get_constraints_dict
-from ._schema import get_schemadict
-from ._table import get_table_dict
+from ..._model import get_configuration_model
+from ._async import connect_async
+from ._catalog import get_catalog_dicts, get_catalog_dicts_async
+from ._concurrent import _acquire_connections, _release_connections, get_concurrent_dicts
+from ._constraint import get_constraints_dict, get_constraints_dict_async
+from ._index import get_index_dict, get_index_dict_async
+from ._schema import get_schemadict, get_schemadict_async
+from ._table import get_table_dict, get_table_dict_async
 
 
-def get_state(connection: psycopg2.extensions.connection) -> Dict:
+def get_state(connection: Union[psycopg2.extensions.connection, psycopg2.pool.AbstractConnectionPool, str],
+              use_catalog: bool = False,
+              itersize: Union[int, None] = None,
+              filters: Union[Dict, None] = None,
+              model: bool = False) -> Dict:
     """Function for getting the current database state as a dict
 
-    :param psycopg2.extensions.connection connection: The connection
+    :param Union[psycopg2.extensions.connection, psycopg2.pool.AbstractConnectionPool, str] connection: The
+        connection. If a connection pool or a DSN is given instead, the schema, table, constraint and index queries run
+        in parallel on separate connections reading from one exported snapshot
+    :param bool use_catalog: Whether to read pg_catalog directly in a single round trip instead of querying the
+        information_schema views one after another. With a connection pool or a DSN the query runs on a single
+        connection taken from the pool, or opened and closed again
+    :param Union[int, None] itersize: If set, stream the rows through server-side cursors fetching this many rows per
+        round trip, so that peak memory depends on the resulting configuration rather than the raw row count
+    :param Union[Dict, None] filters: Schema and table filters applied in the catalog queries. Accepts the keys
+        include_schemas, exclude_schemas, include_tables and exclude_tables, each a pattern or a list of patterns
+        where * and ? work as wildcards, e.g. {'exclude_schemas': ['pg_*', 'information_schema']}
+    :param bool model: Whether to return the schemas as objects of the compact object model, see
+        get_configuration_model
 
     :return: Current database setup as a nested dictionary
     :rtype: Dict
     """
-    configuration = get_schemadict(connection)
-    configuration.update(get_table_dict(connection))
+    if use_catalog and isinstance(connection, (str, psycopg2.pool.AbstractConnectionPool)):
+        connections = _acquire_connections(connection, 1)
+        try:
+            return get_state(connections[0], use_catalog=use_catalog, itersize=itersize, filters=filters, model=model)
+        finally:
+            _release_connections(connection, connections)
 
-    constraints = get_constraints_dict(connection)
+    if use_catalog:
+        schemas, tables, constraints, indexes = get_catalog_dicts(connection, itersize=itersize, filters=filters)
+    elif isinstance(connection, (str, psycopg2.pool.AbstractConnectionPool)):
+        schemas, tables, constraints, indexes = get_concurrent_dicts(connection, itersize=itersize, filters=filters)
+    else:
+        schemas = get_schemadict(connection, itersize=itersize, filters=filters)
+        tables = get_table_dict(connection, itersize=itersize, filters=filters)
+        constraints = get_constraints_dict(connection, itersize=itersize, filters=filters)
+        indexes = get_index_dict(connection, itersize=itersize, filters=filters)
+
+    return _get_result(_merge_state(schemas, tables, constraints, indexes), model)
+
+
+async def get_state_async(connection: Union[psycopg2.extensions.connection, str],
+                          use_catalog: bool = False,
+                          filters: Union[Dict, None] = None,
+                          model: bool = False) -> Dict:
+    """Function for getting the current database state as a dict without blocking the event loop
+
+    :param Union[psycopg2.extensions.connection, str] connection: An asynchronous connection (see connect_async), or
+        a DSN for which a connection is opened and closed again
+    :param bool use_catalog: Whether to read pg_catalog directly in a single round trip instead of querying the
+        information_schema views one after another
+    :param Union[Dict, None] filters: Schema and table filters applied in the catalog queries, see get_state
+    :param bool model: Whether to return the schemas as objects of the compact object model, see get_state
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    if isinstance(connection, str):
+        async_connection = await connect_async(connection)
+        try:
+            return await get_state_async(async_connection, use_catalog=use_catalog, filters=filters, model=model)
+        finally:
+            async_connection.close()
+
+    if use_catalog:
+        schemas, tables, constraints, indexes = await get_catalog_dicts_async(connection, filters=filters)
+    else:
+        schemas = await get_schemadict_async(connection, filters=filters)
+        tables = await get_table_dict_async(connection, filters=filters)
+        constraints = await get_constraints_dict_async(connection, filters=filters)
+        indexes = await get_index_dict_async(connection, filters=filters)
+
+    return _get_result(_merge_state(schemas, tables, constraints, indexes), model)
+
+
+def _get_result(configuration: Dict, model: bool) -> Dict:
+    """Function for converting the database state to the object model if requested
+
+    :param Dict configuration: The database state
+    :param bool model: Whether to convert the state
+
+    :return: The database state
+    :rtype: Dict
+    """
+    if model:
+        return get_configuration_model(configuration)
+    return configuration
+
+
+def _merge_state(schemas: Dict, tables: Dict, constraints: Dict, indexes: Dict) -> Dict:
+    """Function for merging the schema, table, constraint and index configurations into the database state
+
+    :param Dict schemas: The schema configuration
+    :param Dict tables: The table configuration
+    :param Dict constraints: The constraint configuration
+    :param Dict indexes: The index configuration
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    configuration = schemas
+    configuration.update(tables)
     _recursive_update(configuration, constraints)
+    _recursive_update(configuration, indexes)
 
     return configuration
 
@@ -1,78 +1,154 @@
 import psycopg2
 import psycopg2.extras
 from collections import OrderedDict
-from typing import Dict, List
-
-
-def get_sql_tables_and_views(connection: psycopg2.extensions.connection) -> List[psycopg2.extras.RealDictRow]:
+from typing import Dict, Iterable, List, Tuple, Union
+
+from ..._types import TYPES, TypeInfo, get_type_definition
+from ._async import fetch_rows_async
+from ._cursor import fetch_rows
+from ._filter import build_filter
+
+_TABLES_AND_VIEWS_QUERY = """SELECT t.table_schema,
+                                    t.table_name,
+                                    t.table_type,
+                                    c.character_maximum_length,
+                                    c.column_name,
+                                    c.data_type,
+                                    c.udt_name,
+                                    c.numeric_precision,
+                                    c.numeric_scale,
+                                    c.datetime_precision,
+                                    c.is_nullable
+                             FROM information_schema.columns c
+                             INNER JOIN information_schema.tables t
+                             ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+                             WHERE true {filter}
+                             ORDER BY t.table_schema, t.table_name, c.ordinal_position"""
+
+
+def get_sql_tables_and_views(connection: psycopg2.extensions.connection,
+                             itersize: Union[int, None] = None,
+                             filters: Union[Dict, None] = None) -> Iterable[psycopg2.extras.RealDictRow]:
     """Function for getting the tables and views for a sql database
 
     :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: The rows using key-value pairs for the data
+    :rtype: Iterable[psycopg2.extras.RealDictRow]
+    """
+    query, parameters = _get_query(filters)
+    return fetch_rows(connection, query, parameters, itersize=itersize)
+
+
+async def get_sql_tables_and_views_async(
+        connection: psycopg2.extensions.connection,
+        filters: Union[Dict, None] = None) -> List[psycopg2.extras.RealDictRow]:
+    """Function for getting the tables and views for a sql database using an asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
 
     :return: List of rows using key-value pairs for the data
     :rtype: List[psycopg2.extras.RealDictRow]
     """
-    with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-        query = """SELECT t.table_schema,
-                          t.table_name,
-                          t.table_type,
-                          c.character_maximum_length,
-                          c.column_name,
-                          c.data_type,
-                          c.is_nullable
-                   FROM information_schema.columns c
-                   INNER JOIN information_schema.tables t
-                   ON t.table_schema = c.table_schema AND t.table_name = c.table_name"""
-        cursor.execute(query)
-
-        results = cursor.fetchall()
-    return results
-
-
-def get_table_dict(connection: psycopg2.extensions.connection) -> Dict:
+    query, parameters = _get_query(filters)
+    return await fetch_rows_async(connection, query, parameters)
+
+
+def get_table_dict(connection: psycopg2.extensions.connection,
+                   itersize: Union[int, None] = None,
+                   filters: Union[Dict, None] = None) -> Dict:
     """Function for getting the tables and views for a sql database a dict
 
     :param psycopg2.extensions.connection connection: The connection
+    :param Union[int, None] itersize: If set, stream the rows through a server-side cursor with this itersize
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    return _build_table_dict(get_sql_tables_and_views(connection, itersize=itersize, filters=filters))
+
+
+async def get_table_dict_async(connection: psycopg2.extensions.connection,
+                               filters: Union[Dict, None] = None) -> Dict:
+    """Function for getting the tables and views for a sql database a dict using an asynchronous connection
+
+    :param psycopg2.extensions.connection connection: The asynchronous connection
+    :param Union[Dict, None] filters: The schema/table include and exclude filters, applied in the query
+
+    :return: Current database setup as a nested dictionary
+    :rtype: Dict
+    """
+    return _build_table_dict(await get_sql_tables_and_views_async(connection, filters=filters))
+
+
+def _get_query(filters: Union[Dict, None]) -> Tuple[str, Dict]:
+    """Function for getting the tables and views query with the filters applied
+
+    :param Union[Dict, None] filters: The schema/table include and exclude filters
+
+    :return: The query and its parameters
+    :rtype: Tuple[str, Dict]
+    """
+    condition, parameters = build_filter(filters, 't.table_schema', 't.table_name')
+    return _TABLES_AND_VIEWS_QUERY.format(filter=condition), parameters
+
+
+def _build_table_dict(table_information: Iterable[psycopg2.extras.RealDictRow]) -> Dict:
+    """Function for building the table dict from the table/view column rows
+
+    :param Iterable[psycopg2.extras.RealDictRow] table_information: The column rows from the database
 
     :return: Current database setup as a nested dictionary
     :rtype: Dict
     """
 
     configuration = OrderedDict()
-    table_information = get_sql_tables_and_views(connection)
     for table_col in table_information:
+        _add_table_column(configuration, table_col)
+
+    return configuration
 
-        # Instantiate the schema object
-        if table_col['table_schema'] not in configuration:
-            configuration[table_col['table_schema']] = OrderedDict(
+
+def _add_table_column(configuration: Dict, table_col: psycopg2.extras.RealDictRow):
+    """Function for adding a single table/view column row to the configuration
+
+    :param Dict configuration: The configuration to update
+    :param psycopg2.extras.RealDictRow table_col: The column row from the database
+    """
+
+    # Instantiate the schema object
+    if table_col['table_schema'] not in configuration:
+        configuration[table_col['table_schema']] = OrderedDict(
+            [
+                ('tables', OrderedDict()),
+                ('views', OrderedDict())
+            ]
+        )
+
+    # Limit operations to selected table/view definition
+    schema_definition = configuration[table_col['table_schema']]
+    if table_col['table_type'] == 'BASE TABLE':
+        if table_col['table_name'] not in schema_definition['tables']:
+            schema_definition['tables'][table_col['table_name']] = OrderedDict(
                 [
-                    ('tables', OrderedDict()),
-                    ('views', OrderedDict())
+                    ('columns', OrderedDict())
                 ]
             )
+        table_definition = schema_definition['tables'][table_col['table_name']]
+    else:
+        if table_col['table_name'] not in schema_definition['tables']:
+            schema_definition['views'][table_col['table_name']] = OrderedDict(
+                [
+                    ('columns', OrderedDict())
+                ]
+            )
+        table_definition = schema_definition['views'][table_col['table_name']]
 
-        # Limit operations to selected table/view definition
-        schema_definition = configuration[table_col['table_schema']]
-        if table_col['table_type'] == 'BASE TABLE':
-            if table_col['table_name'] not in schema_definition['tables']:
-                schema_definition['tables'][table_col['table_name']] = OrderedDict(
-                    [
-                        ('columns', OrderedDict())
-                    ]
-                )
-            table_definition = schema_definition['tables'][table_col['table_name']]
-        else:
-            if table_col['table_name'] not in schema_definition['tables']:
-                schema_definition['views'][table_col['table_name']] = OrderedDict(
-                    [
-                        ('columns', OrderedDict())
-                    ]
-                )
-            table_definition = schema_definition['views'][table_col['table_name']]
-
-        table_definition['columns'].update(_generate_column_definitions(table_col))
-
-    return configuration
+    table_definition['columns'].update(_generate_column_definitions(table_col))
 
 
 def _generate_column_definitions(column_definition: psycopg2.extras.RealDictRow) -> Dict:
@@ -91,19 +167,40 @@ def _generate_column_definitions(column_definition: psycopg2.extras.RealDictRow)
     column_information['character_maximum_length'] = column_definition['character_maximum_length']
     column_information['nullable'] = column_definition['is_nullable'] == 'YES'
 
-    # Set the data type statement
-    if column_information['data_type'] == 'bigint':
-        column_information['data_type_stmt'] = "bigint"
+    # Set the data type statement, arrays are reported with the element type prefixed by an underscore
+    type_name = column_definition['udt_name']
+    array = column_information['data_type'] == 'ARRAY'
+    if array:
+        type_name = type_name[1:]
 
-    elif column_information['data_type'] == 'character varying':
-        if column_information['character_maximum_length'] is not None:
-            column_information['data_type_stmt'] = f"varchar({column_information['character_maximum_length']})"
-        else:
-            column_information['data_type_stmt'] = f"varchar"
-    elif column_information['data_type'] == 'uuid':
-        column_information['data_type_stmt'] = "uuid"
+    type_info = TYPES.get(type_name)
+    type_definition = None
+    if type_info is not None:
+        type_definition = get_type_definition(type_name, _get_type_modifiers(column_definition, type_info), array)
 
+    if type_definition is not None:
+        column_information['data_type_stmt'] = type_definition['data_type_stmt']
     else:
         column_information['data_type_stmt'] = None
 
     return column_setup
+
+
+def _get_type_modifiers(column_definition: psycopg2.extras.RealDictRow, type_info: TypeInfo) -> List[int]:
+    """Function for getting the type modifiers of a column as they would be written in a column definition
+
+    :param psycopg2.extras.RealDictRow column_definition: The column definition from the database
+    :param TypeInfo type_info: The registered type of the column
+
+    :return: The type modifiers
+    :rtype: List[int]
+    """
+
+    if type_info.modifier == 'length':
+        return [column_definition['character_maximum_length']]
+    elif type_info.modifier == 'precision_scale' and column_definition['numeric_precision'] is not None:
+        return [column_definition['numeric_precision'], column_definition['numeric_scale']]
+    elif type_info.modifier == 'precision':
+        return [column_definition['datetime_precision']]
+
+    return []
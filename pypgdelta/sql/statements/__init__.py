@@ -1,2 +1,2 @@
 from ._schema import create_schema
-from ._table import alter_table, create_table
+from ._table import alter_table, alter_table_coalesced, alter_table_online, create_table
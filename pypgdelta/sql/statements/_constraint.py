@@ -17,7 +17,23 @@ def create_constraint_statements(schema_name: str,
     :rtype: str
     """
 
-    statements = OrderedDict(
+    statements = OrderedDict()
+    for kind, actions in create_constraint_actions(constraints).items():
+        statements[kind] = [f"ALTER TABLE {schema_name}.{table_name} {action}" for action in actions]
+
+    return statements
+
+
+def create_constraint_actions(constraints: Dict) -> Dict:
+    """Function for generating the alter table actions of the primary key definitions, see create_constraint_statements
+
+    :param Dict constraints: The constraint definitions
+
+    :return: The drop and create actions
+    :rtype: Dict
+    """
+
+    actions = OrderedDict(
         [
             ('drop', []),
             ('create', [])
@@ -25,11 +41,11 @@ def create_constraint_statements(schema_name: str,
     )
 
     if 'new_pk' in constraints:
-        statement = f"ALTER TABLE {schema_name}.{table_name} ADD CONSTRAINT {constraints['new_pk']['name']}"
-        statement += f" PRIMARY KEY({','.join(constraints['new_pk']['columns'])})"
-        statements['create'].append(statement)
+        action = f"ADD CONSTRAINT {constraints['new_pk']['name']}"
+        action += f" PRIMARY KEY({','.join(constraints['new_pk']['columns'])})"
+        actions['create'].append(action)
     if 'drop_pk' in constraints:
-        statement = f"ALTER TABLE {schema_name}.{table_name} DROP CONSTRAINT IF EXISTS {constraints['drop_pk']['name']} CASCADE"
-        statements['drop'].append(statement)
+        action = f"DROP CONSTRAINT IF EXISTS {constraints['drop_pk']['name']} CASCADE"
+        actions['drop'].append(action)
 
-    return statements
+    return actions
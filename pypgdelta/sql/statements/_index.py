@@ -0,0 +1,38 @@
+from collections import OrderedDict
+from typing import Dict
+
+
+def create_index_statements(schema_name: str,
+                            table_name: str,
+                            indexes: Dict,
+                            **kwargs) -> Dict:
+    """Function for generating the index definitions
+
+    The indexes are built and dropped concurrently, so writes to the table are not blocked. These statements can not
+    run inside a transaction block, each has to be executed on its own in autocommit mode.
+
+    :param str schema_name: The name of the schema the table belongs to
+    :param str table_name: The name of the table
+    :param Dict indexes: The index definitions to drop and create
+    :param kwargs:
+
+    :return: The drop and create statements
+    :rtype: Dict
+    """
+
+    statements = OrderedDict(
+        [
+            ('drop', []),
+            ('create', [])
+        ]
+    )
+
+    for name in indexes.get('drop_indexes', {}):
+        statements['drop'].append(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_name}.{name}")
+
+    for name, index in indexes.get('new_indexes', {}).items():
+        statement = f"CREATE {'UNIQUE ' if index['unique'] else ''}INDEX CONCURRENTLY {name}"
+        statement += f" ON {schema_name}.{table_name} USING {index['method']} ({', '.join(index['columns'])})"
+        statements['create'].append(statement)
+
+    return statements
@@ -1,7 +1,12 @@
-from typing import Dict, List
+import hashlib
+from typing import Dict, List, Tuple, Union
 
+from ..._types import is_metadata_only_change
 from ._column import alter_column_statement, create_column_statement
 
+# The maximum length of an identifier in bytes, NAMEDATALEN - 1
+_MAX_IDENTIFIER_LENGTH = 63
+
 
 def create_table(schema_name: str, table_name: str, column_definitions: Dict) -> List[str]:
     """Function for generating a create table statement
@@ -48,63 +53,295 @@ def alter_table(schema_name: str, table_name: str,
     :rtype: List[str]
     """
 
-    # create the columns
-    new_column_statements = ',\n'.join(
+    # Set the column additions, alterations and deletions to be separate commands
+    table_statement = ';\n\n'.join(
         [
-            'ADD COLUMN ' + create_column_statement(
-                name=name,
-                data_type=properties['data_type_stmt'],
-                nullable=properties['nullable'],
-                constraints=properties.get('constraints', [])
-            )
-            for name, properties in new_column_definitions.items()
+            _alter_table_command(schema_name, table_name, actions)
+            for actions in (_add_column_actions(new_column_definitions),
+                            _alter_column_actions(alter_column_definitions),
+                            _drop_column_actions(delete_column_definitions))
+            if actions
         ]
     )
 
-    alter_column_statements = ',\n'.join(
-        [
-            alter_column_statement(
-                name=name,
-                data_type=properties['data_type_stmt'],
-                nullable=properties['nullable'],
-                constraints=properties.get('constraints', [])
-            )
-            for name, properties in alter_column_definitions.items()
-        ]
+    # Return the statement as a list
+    if table_statement:
+        return [table_statement]
+    return []
+
+
+def alter_table_online(schema_name: str, table_name: str,
+                       new_column_definitions: Dict,
+                       alter_column_definitions: Dict,
+                       delete_column_definitions: Dict,
+                       previous_column_definitions: Dict) -> List[str]:
+    """Function for generating alter table statements that keep the table writable where possible
+
+    Unlike alter_table, a column type is only changed when it differs from the previous definition. A type change
+    that needs a table rewrite can not be avoided, such columns are listed under rewritten_columns in the delta.
+    Setting NOT NULL adds a NOT VALID check constraint first, which is validated without blocking writes and lets SET
+    NOT NULL skip the full table scan (PostgreSQL 12+).
+    The helper constraint is dropped afterwards.
+
+    :param str schema_name: The name of the schema that the table belongs to
+    :param str table_name: The name of the table in question
+    :param Dict new_column_definitions: The column definitions to be added
+    :param Dict alter_column_definitions: The column definitions to be altered
+    :param Dict delete_column_definitions: The column definitions to be deleted
+    :param Dict previous_column_definitions: The current definitions of the columns to be altered
+
+    :return: The sql queries
+    :rtype: List[str]
+    """
+
+    column_actions, _, not_null_columns = _alter_column_online_actions(
+        alter_column_definitions,
+        previous_column_definitions
     )
 
-    delete_column_statements = ',\n'.join(
-        [
-            f"DROP COLUMN {name}"
-            for name, properties in delete_column_definitions.items()
-        ]
+    statement_list = alter_table(schema_name, table_name, new_column_definitions, {}, {})
+
+    if column_actions:
+        statement_list.append(_alter_table_command(schema_name, table_name, column_actions))
+
+    if not_null_columns:
+        for name in not_null_columns:
+            add_action, validate_action, _ = _not_null_check_actions(table_name, name)
+            statement_list.append(f"ALTER TABLE {schema_name}.{table_name} {add_action}")
+            statement_list.append(f"ALTER TABLE {schema_name}.{table_name} {validate_action}")
+
+        statement_list.append(
+            _alter_table_command(
+                schema_name,
+                table_name,
+                [f"ALTER COLUMN {name} SET NOT NULL" for name in not_null_columns]
+            )
+        )
+        statement_list.append(
+            _alter_table_command(
+                schema_name,
+                table_name,
+                [_not_null_check_actions(table_name, name)[2] for name in not_null_columns]
+            )
+        )
+
+    statement_list.extend(alter_table(schema_name, table_name, {}, {}, delete_column_definitions))
+
+    return statement_list
+
+
+def alter_table_coalesced(schema_name: str, table_name: str,
+                          new_column_definitions: Dict,
+                          alter_column_definitions: Dict,
+                          delete_column_definitions: Dict,
+                          constraint_actions: Dict,
+                          previous_column_definitions: Union[Dict, None] = None,
+                          online: bool = False) -> List[str]:
+    """Function for generating the fewest alter table statements that apply all changes of a table
+
+    The constraint drops, the column additions, alterations and deletions and the constraint creations are merged
+    into a single command, so the lock is taken once and the table is scanned or rewritten at most once. The server
+    runs the drops before the additions and alterations within a command, whatever their order.
+
+    In online mode (see alter_table_online) the NOT NULL checks still have to be validated in a command of their own,
+    followed by a command setting the columns NOT NULL and creating the constraints, and one dropping the checks.
+    Without columns to set NOT NULL that is a single command as well.
+
+    :param str schema_name: The name of the schema that the table belongs to
+    :param str table_name: The name of the table in question
+    :param Dict new_column_definitions: The column definitions to be added
+    :param Dict alter_column_definitions: The column definitions to be altered
+    :param Dict delete_column_definitions: The column definitions to be deleted
+    :param Dict constraint_actions: The drop and create actions of the constraints, see create_constraint_actions
+    :param Union[Dict, None] previous_column_definitions: The current definitions of the columns to be altered,
+        required in online mode
+    :param bool online: Whether to keep the table writable where possible
+
+    :return: The sql queries
+    :rtype: List[str]
+    """
+
+    actions = list(constraint_actions['drop'])
+    actions.extend(_add_column_actions(new_column_definitions))
+
+    if not online:
+        actions.extend(_alter_column_actions(alter_column_definitions))
+        actions.extend(_drop_column_actions(delete_column_definitions))
+        actions.extend(constraint_actions['create'])
+        if actions:
+            return [_alter_table_command(schema_name, table_name, actions)]
+        return []
+
+    column_actions, _, not_null_columns = _alter_column_online_actions(
+        alter_column_definitions,
+        previous_column_definitions or {}
     )
+    actions.extend(column_actions)
+    actions.extend(_drop_column_actions(delete_column_definitions))
+
+    if not not_null_columns:
+        actions.extend(constraint_actions['create'])
+        if actions:
+            return [_alter_table_command(schema_name, table_name, actions)]
+        return []
+
+    check_actions = [_not_null_check_actions(table_name, name) for name in not_null_columns]
+    actions.extend([add_action for add_action, _, _ in check_actions])
 
-    table_statement = ''
+    # The checks are dropped in a later command, so SET NOT NULL can rely on them
+    return [
+        _alter_table_command(schema_name, table_name, actions),
+        _alter_table_command(schema_name, table_name, [validate_action for _, validate_action, _ in check_actions]),
+        _alter_table_command(
+            schema_name,
+            table_name,
+            [f"ALTER COLUMN {name} SET NOT NULL" for name in not_null_columns] + constraint_actions['create']
+        ),
+        _alter_table_command(schema_name, table_name, [drop_action for _, _, drop_action in check_actions])
+    ]
 
-    if new_column_definitions:
-        # Create the alter table statement based on the columns
-        table_statement = f"ALTER TABLE {schema_name}.{table_name} \n{new_column_statements}"
 
-    # Create the alter column statements
-    if alter_column_definitions:
+def _alter_table_command(schema_name: str, table_name: str, actions: List[str]) -> str:
+    """Function for generating an alter table command from its actions
 
-        # Set the column alterations to be a separate command
-        if table_statement:
-            table_statement += ';\n\n'
+    :param str schema_name: The name of the schema that the table belongs to
+    :param str table_name: The name of the table in question
+    :param List[str] actions: The actions
 
-        table_statement += f"ALTER TABLE {schema_name}.{table_name} \n{alter_column_statements}"
+    :return: The sql query
+    :rtype: str
+    """
 
-    # Create the delete column statements
-    if delete_column_definitions:
+    actions_statement = ',\n'.join(actions)
+    return f"ALTER TABLE {schema_name}.{table_name} \n{actions_statement}"
 
-        # Set the column deletions to be a separate command
-        if table_statement:
-            table_statement += ';\n\n'
 
-        table_statement += f"ALTER TABLE {schema_name}.{table_name} \n{delete_column_statements}"
+def _add_column_actions(new_column_definitions: Dict) -> List[str]:
+    """Function for generating the actions adding columns
 
-    # Return the statement as a list
-    if table_statement:
-        return [table_statement]
-    return []
+    :param Dict new_column_definitions: The column definitions to be added
+
+    :return: The actions
+    :rtype: List[str]
+    """
+    return [
+        'ADD COLUMN ' + create_column_statement(
+            name=name,
+            data_type=properties['data_type_stmt'],
+            nullable=properties['nullable'],
+            constraints=properties.get('constraints', [])
+        )
+        for name, properties in new_column_definitions.items()
+    ]
+
+
+def _alter_column_actions(alter_column_definitions: Dict) -> List[str]:
+    """Function for generating the actions altering columns
+
+    :param Dict alter_column_definitions: The column definitions to be altered
+
+    :return: The actions
+    :rtype: List[str]
+    """
+    return [
+        alter_column_statement(
+            name=name,
+            data_type=properties['data_type_stmt'],
+            nullable=properties['nullable'],
+            constraints=properties.get('constraints', [])
+        )
+        for name, properties in alter_column_definitions.items()
+    ]
+
+
+def _drop_column_actions(delete_column_definitions: Dict) -> List[str]:
+    """Function for generating the actions deleting columns
+
+    :param Dict delete_column_definitions: The column definitions to be deleted
+
+    :return: The actions
+    :rtype: List[str]
+    """
+    return [f"DROP COLUMN {name}" for name in delete_column_definitions]
+
+
+def _alter_column_online_actions(alter_column_definitions: Dict,
+                                 previous_column_definitions: Dict) -> Tuple[List[str], List[str], List[str]]:
+    """Function for generating the actions altering columns in online mode, see alter_table_online
+
+    :param Dict alter_column_definitions: The column definitions to be altered
+    :param Dict previous_column_definitions: The current definitions of the columns to be altered
+
+    :return: The type and nullability actions, the columns whose type change rewrites the table and the columns to
+        set NOT NULL through a check constraint
+    :rtype: Tuple[List[str], List[str], List[str]]
+    """
+
+    column_actions = []
+    rewritten_columns = []
+    not_null_columns = []
+    for name, properties in alter_column_definitions.items():
+        previous = previous_column_definitions.get(name, {})
+
+        nullable = properties['nullable']
+        for constraint in properties.get('constraints') or []:
+            if constraint['type'] == 'p':
+                nullable = False
+
+        data_type = properties['data_type_stmt']
+        if data_type != previous.get('data_type_stmt'):
+            column_actions.append(f"ALTER COLUMN {name} TYPE {data_type}")
+            if not is_metadata_only_change(previous.get('data_type_stmt'), data_type):
+                rewritten_columns.append(name)
+
+        if nullable and not previous.get('nullable', True):
+            column_actions.append(f"ALTER COLUMN {name} DROP NOT NULL")
+        elif not nullable and previous.get('nullable', True):
+            not_null_columns.append(name)
+
+    # A rewrite scans the table anyway, so the columns are set NOT NULL in the same command
+    if rewritten_columns:
+        column_actions.extend([f"ALTER COLUMN {name} SET NOT NULL" for name in not_null_columns])
+        not_null_columns = []
+
+    return column_actions, rewritten_columns, not_null_columns
+
+
+def _not_null_check_actions(table_name: str, name: str) -> Tuple[str, str, str]:
+    """Function for generating the actions adding, validating and dropping the check constraint used to set a column
+    NOT NULL without blocking writes
+
+    :param str table_name: The name of the table in question
+    :param str name: The name of the column
+
+    :return: The add, validate and drop actions
+    :rtype: Tuple[str, str, str]
+    """
+
+    constraint_name = _get_constraint_name(f"{table_name}_{name}_not_null")
+    return (
+        f"ADD CONSTRAINT {constraint_name} CHECK ({name} IS NOT NULL) NOT VALID",
+        f"VALIDATE CONSTRAINT {constraint_name}",
+        f"DROP CONSTRAINT {constraint_name}"
+    )
+
+
+def _get_constraint_name(name: str) -> str:
+    """Function for fitting a generated constraint name into the maximum identifier length
+
+    The server would silently truncate a longer name, so names sharing their first 63 bytes would clash. A longer
+    name is truncated and ends with a hash of the full name instead.
+
+    :param str name: The generated name
+
+    :return: The name, at most 63 bytes long
+    :rtype: str
+    """
+
+    encoded = name.encode('utf-8')
+    if len(encoded) <= _MAX_IDENTIFIER_LENGTH:
+        return name
+
+    suffix = '_' + hashlib.sha256(encoded).hexdigest()[:8]
+    prefix = encoded[:_MAX_IDENTIFIER_LENGTH - len(suffix)].decode('utf-8', errors='ignore')
+    return prefix + suffix
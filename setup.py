@@ -13,6 +13,10 @@ setup(
     install_requires=[
         'psycopg2',
     ],
+    extras_require={
+        'orjson': ['orjson'],
+        'sql': ['pglast>=3'],
+    },
     test_suite='tests.pypgdelta_tests',
 
 )
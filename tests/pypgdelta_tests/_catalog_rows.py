@@ -0,0 +1,97 @@
+# The columns of the rows of the catalog query, see pypgdelta.sql.state._catalog
+CATALOG_COLUMNS = (
+    'kind', 'schema_name', 'table_schema', 'table_name', 'table_type', 'column_name', 'data_type',
+    'character_maximum_length', 'udt_name', 'numeric_precision', 'numeric_scale', 'datetime_precision', 'is_nullable',
+    'name', 'type', 'schema', 'table', 'column', 'position', 'foreign_schema', 'foreign_table', 'foreign_column',
+    'definition', 'method', 'is_unique'
+)
+
+
+def schema_row(schema_name: str) -> dict:
+    """Function for getting the catalog row of a schema
+
+    :param str schema_name: The name of the schema
+
+    :return: The row
+    :rtype: dict
+    """
+
+    row = dict.fromkeys(CATALOG_COLUMNS)
+    row.update(kind='schema', schema_name=schema_name)
+    return row
+
+
+def column_row(schema_name: str, table_name: str, column_name: str) -> dict:
+    """Function for getting the catalog row of a bigint column
+
+    :param str schema_name: The name of the schema
+    :param str table_name: The name of the table
+    :param str column_name: The name of the column
+
+    :return: The row
+    :rtype: dict
+    """
+
+    row = dict.fromkeys(CATALOG_COLUMNS)
+    row.update(
+        kind='column',
+        table_schema=schema_name,
+        table_name=table_name,
+        table_type='BASE TABLE',
+        column_name=column_name,
+        data_type='bigint',
+        udt_name='int8',
+        is_nullable='NO'
+    )
+    return row
+
+
+def constraint_row(schema_name: str, table_name: str, constraint_name: str, column_name: str) -> dict:
+    """Function for getting the catalog row of a single column primary key
+
+    :param str schema_name: The name of the schema
+    :param str table_name: The name of the table
+    :param str constraint_name: The name of the primary key
+    :param str column_name: The name of the column
+
+    :return: The row
+    :rtype: dict
+    """
+
+    row = dict.fromkeys(CATALOG_COLUMNS)
+    row.update(
+        kind='constraint',
+        name=constraint_name,
+        type='p',
+        schema=schema_name,
+        table=table_name,
+        column=column_name,
+        position=1
+    )
+    return row
+
+
+def index_row(schema_name: str, table_name: str, index_name: str, column_name: str) -> dict:
+    """Function for getting the catalog row of a single column btree index
+
+    :param str schema_name: The name of the schema
+    :param str table_name: The name of the table
+    :param str index_name: The name of the index
+    :param str column_name: The name of the column
+
+    :return: The row
+    :rtype: dict
+    """
+
+    row = dict.fromkeys(CATALOG_COLUMNS)
+    row.update(
+        kind='index',
+        name=index_name,
+        schema=schema_name,
+        table=table_name,
+        column=column_name,
+        position=1,
+        method='btree',
+        is_unique=False
+    )
+    return row
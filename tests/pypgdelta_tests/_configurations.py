@@ -0,0 +1,95 @@
+from typing import Dict, List
+
+from pypgdelta.construct import construct_configuration
+
+from ._parse_tree import column_definition, index_statement, schema_statement, table_statement
+
+BIGINT = ['pg_catalog', 'int8']
+VARCHAR = ['pg_catalog', 'varchar']
+
+
+def get_configuration(statements: List[Dict]) -> Dict:
+    """Function for getting the configuration of the statements of a single file
+
+    :param List[Dict] statements: The statements
+
+    :return: The configuration
+    :rtype: Dict
+    """
+    return construct_configuration([{'stmts': statements}])
+
+
+def named_table(table_name: str, length: int) -> Dict:
+    """Function for getting the statement of a table with a bigint primary key and a varchar column
+
+    :param str table_name: The name of the table in the app schema
+    :param int length: The maximum length of the name column
+
+    :return: The statement
+    :rtype: Dict
+    """
+    return table_statement(
+        'app',
+        table_name,
+        [
+            column_definition('id', BIGINT, primary_key=True),
+            column_definition('name', VARCHAR, [length])
+        ]
+    )
+
+
+def get_old_configuration() -> Dict:
+    """Function for getting the baseline of the golden delta tests
+
+    :return: The configuration
+    :rtype: Dict
+    """
+    return get_configuration([named_table('orders', 10), named_table('users', 50)])
+
+
+def get_new_configuration() -> Dict:
+    """Function for getting the desired configuration of the golden delta tests: a new schema with a table and an
+    index, a widened column, a new not null column and a column that becomes not null
+
+    :return: The configuration
+    :rtype: Dict
+    """
+    return get_configuration(
+        [
+            schema_statement('audit'),
+            table_statement('audit', 'log', [column_definition('id', BIGINT, primary_key=True)]),
+            index_statement('audit', 'log', ['id'], index_name='log_id_idx'),
+            table_statement(
+                'app',
+                'orders',
+                [
+                    column_definition('id', BIGINT, primary_key=True),
+                    column_definition('name', VARCHAR, [20]),
+                    column_definition('code', BIGINT, not_null=True)
+                ]
+            ),
+            table_statement(
+                'app',
+                'users',
+                [
+                    column_definition('id', BIGINT, primary_key=True),
+                    column_definition('name', VARCHAR, [100], not_null=True)
+                ]
+            )
+        ]
+    )
+
+
+def rename_primary_key(configuration: Dict, table_name: str, primary_key_name: str) -> Dict:
+    """Function for renaming the primary key of a table in the app schema, which makes get_delta replace it
+
+    :param Dict configuration: The configuration to update in place
+    :param str table_name: The name of the table
+    :param str primary_key_name: The new name of the primary key
+
+    :return: The configuration
+    :rtype: Dict
+    """
+
+    configuration['app']['tables'][table_name]['constraints']['primary_key']['name'] = primary_key_name
+    return configuration
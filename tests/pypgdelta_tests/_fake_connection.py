@@ -0,0 +1,109 @@
+import threading
+from typing import Callable, Dict, List, Union
+
+import psycopg2.extensions
+import psycopg2.pool
+
+
+class FakeCursor:
+    """Cursor of a FakeConnection, returning the rows of the connection handler"""
+
+    def __init__(self, connection: 'FakeConnection', name: Union[str, None] = None):
+        self.connection = connection
+        self.name = name
+        self.itersize = 2000
+        self.rows = []
+        self.rowcount = -1
+
+    def __enter__(self) -> 'FakeCursor':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def execute(self, query: str, parameters: Union[Dict, None] = None):
+        self.connection.queries.append((query, parameters))
+        with self.connection.lock:
+            self.connection.running = True
+        try:
+            self.rows = list(self.connection.handler(self.connection, query, parameters) or [])
+            self.rowcount = len(self.rows)
+        finally:
+            with self.connection.lock:
+                self.connection.running = False
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def fetchall(self) -> List[Dict]:
+        return self.rows
+
+    def fetchone(self) -> Union[Dict, None]:
+        return self.rows[0] if self.rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection, answering every query with the rows returned by the handler
+
+    The handler is called with the connection, the query and its parameters. The rows are returned as they are, so
+    handlers return dicts where the code under test uses a RealDictCursor. Like a real connection, cancel only has an
+    effect while a query is running, and on_cursor is called whenever a cursor is created.
+    """
+
+    def __init__(self, handler: Callable[['FakeConnection', str, Union[Dict, None]], List]):
+        self.handler = handler
+        self.queries = []
+        self.cursors = []
+        self.autocommit = False
+        self.closed = 0
+        self.cancelled = threading.Event()
+        self.cancel_requested = threading.Event()
+        self.running = False
+        self.lock = threading.Lock()
+        self.transactions = []
+        self.on_cursor = None
+
+    def cursor(self, name: Union[str, None] = None, **kwargs) -> FakeCursor:
+        if self.on_cursor is not None:
+            self.on_cursor(self)
+        cursor = FakeCursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+    def poll(self) -> int:
+        return psycopg2.extensions.POLL_OK
+
+    def cancel(self):
+        self.cancel_requested.set()
+        with self.lock:
+            if self.running:
+                self.cancelled.set()
+
+    def commit(self):
+        self.transactions.append('commit')
+
+    def rollback(self):
+        self.transactions.append('rollback')
+
+    def close(self):
+        self.closed = 1
+
+
+class FakePool(psycopg2.pool.AbstractConnectionPool):
+    """Connection pool handing out FakeConnections"""
+
+    def __init__(self, handler: Callable[[FakeConnection, str, Union[Dict, None]], List]):
+        self.handler = handler
+        self.connections = []
+        self.returned = []
+
+    def getconn(self, key=None) -> FakeConnection:
+        connection = FakeConnection(self.handler)
+        self.connections.append(connection)
+        return connection
+
+    def putconn(self, conn: FakeConnection, key=None, close=False):
+        self.returned.append(conn)
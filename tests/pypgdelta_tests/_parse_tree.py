@@ -0,0 +1,136 @@
+import json
+import os
+from typing import Dict, List, Union
+
+
+def schema_statement(schema_name: str) -> Dict:
+    """Function for getting the parse tree of a create schema statement
+
+    :param str schema_name: The name of the schema
+
+    :return: The statement
+    :rtype: Dict
+    """
+    return {'stmt': {'CreateSchemaStmt': {'schemaname': schema_name}}}
+
+
+def column_definition(column_name: str,
+                      type_names: List[str],
+                      modifiers: Union[List[int], None] = None,
+                      not_null: bool = False,
+                      primary_key: bool = False,
+                      array: bool = False) -> Dict:
+    """Function for getting the parse tree of a column definition, in the libpg_query json layout of PostgreSQL 13
+
+    :param str column_name: The name of the column
+    :param List[str] type_names: The qualified type name, e.g. ['pg_catalog', 'int8']
+    :param Union[List[int], None] modifiers: The type modifiers, e.g. the maximum length of a varchar
+    :param bool not_null: Whether the column is not null
+    :param bool primary_key: Whether the column is the primary key
+    :param bool array: Whether the column is an array of the type
+
+    :return: The column definition
+    :rtype: Dict
+    """
+
+    type_name = {'names': [{'String': {'str': name}} for name in type_names]}
+    if modifiers:
+        type_name['typmods'] = [{'A_Const': {'val': {'Integer': {'ival': modifier}}}} for modifier in modifiers]
+    if array:
+        type_name['arrayBounds'] = [{'Integer': {'ival': -1}}]
+
+    constraints = []
+    if not_null:
+        constraints.append({'Constraint': {'contype': 'CONSTR_NOTNULL'}})
+    if primary_key:
+        constraints.append({'Constraint': {'contype': 'CONSTR_PRIMARY'}})
+
+    column = {'colname': column_name, 'typeName': type_name}
+    if constraints:
+        column['constraints'] = constraints
+    return {'ColumnDef': column}
+
+
+def table_statement(schema_name: str, table_name: str, columns: List[Dict]) -> Dict:
+    """Function for getting the parse tree of a create table statement
+
+    :param str schema_name: The name of the schema
+    :param str table_name: The name of the table
+    :param List[Dict] columns: The column definitions, see column_definition
+
+    :return: The statement
+    :rtype: Dict
+    """
+    return {
+        'stmt': {
+            'CreateStmt': {
+                'relation': {'schemaname': schema_name, 'relname': table_name},
+                'tableElts': columns
+            }
+        }
+    }
+
+
+def index_statement(schema_name: str,
+                    table_name: str,
+                    columns: List[str],
+                    index_name: Union[str, None] = None,
+                    unique: bool = False) -> Dict:
+    """Function for getting the parse tree of a create index statement on plain columns
+
+    :param str schema_name: The name of the schema
+    :param str table_name: The name of the table
+    :param List[str] columns: The indexed columns
+    :param Union[str, None] index_name: The name of the index, generated by the server if not given
+    :param bool unique: Whether the index is unique
+
+    :return: The statement
+    :rtype: Dict
+    """
+
+    index = {
+        'relation': {'schemaname': schema_name, 'relname': table_name},
+        'accessMethod': 'btree',
+        'indexParams': [
+            {'IndexElem': {'name': column, 'ordering': 'SORTBY_DEFAULT', 'nulls_ordering': 'SORTBY_NULLS_DEFAULT'}}
+            for column in columns
+        ]
+    }
+    if index_name is not None:
+        index['idxname'] = index_name
+    if unique:
+        index['unique'] = True
+    return {'stmt': {'IndexStmt': index}}
+
+
+def alter_table_statement(schema_name: str, table_name: str, commands: List[Dict]) -> Dict:
+    """Function for getting the parse tree of an alter table statement
+
+    :param str schema_name: The name of the schema
+    :param str table_name: The name of the table
+    :param List[Dict] commands: The commands, e.g. {'subtype': 'AT_DropColumn', 'name': 'name'}
+
+    :return: The statement
+    :rtype: Dict
+    """
+    return {
+        'stmt': {
+            'AlterTableStmt': {
+                'relation': {'schemaname': schema_name, 'relname': table_name},
+                'cmds': [{'AlterTableCmd': command} for command in commands],
+                'relkind': 'OBJECT_TABLE'
+            }
+        }
+    }
+
+
+def write_json_files(root_dir: str, files: Dict[str, List[Dict]]):
+    """Function for writing parse trees to json files, as libpg_query outputs them
+
+    :param str root_dir: The directory to write to
+    :param Dict[str, List[Dict]] files: The statements of each file, by file name
+    """
+
+    for file_name, statements in files.items():
+        with open(os.path.join(root_dir, file_name), 'w') as f:
+            json.dump({'version': 130003, 'stmts': statements}, f)
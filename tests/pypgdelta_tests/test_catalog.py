@@ -0,0 +1,190 @@
+import importlib.util
+import json
+import os
+import re
+import unittest
+
+from pypgdelta.sql.state import _catalog, _constraint, _index, _table, get_state
+
+from ._catalog_rows import CATALOG_COLUMNS
+
+# The columns each branch of the catalog query fills, the other columns are NULL
+SELECTED_COLUMNS = {
+    'schema': {'kind', 'schema_name'},
+    'column': {
+        'kind', 'table_schema', 'table_name', 'table_type', 'column_name', 'data_type', 'character_maximum_length',
+        'udt_name', 'numeric_precision', 'numeric_scale', 'datetime_precision', 'is_nullable', 'position'
+    },
+    'constraint': {
+        'kind', 'name', 'type', 'schema', 'table', 'column', 'position', 'foreign_schema', 'foreign_table',
+        'foreign_column', 'definition'
+    },
+    'index': {'kind', 'name', 'schema', 'table', 'column', 'position', 'method', 'is_unique'}
+}
+
+# The queries the catalog query replaces, by the kind of rows they return
+QUERIES = {
+    'column': _table._TABLES_AND_VIEWS_QUERY,
+    'constraint': _constraint._CONSTRAINTS_QUERY,
+    'index': _index._INDEXES_QUERY
+}
+
+
+def parse_select(query):
+    """Function for parsing a select statement, with the psycopg2 placeholders replaced by text arrays
+
+    :param query: The query
+
+    :return: The SelectStmt node
+    """
+    from pglast.parser import parse_sql_json
+
+    query = re.sub(r'%\((\w+)\)s', "ARRAY['\\1']", query)
+    return json.loads(parse_sql_json(query))['stmts'][0]['stmt']['SelectStmt']
+
+
+def get_branches(select):
+    """Function for getting the selects combined by the UNION ALLs of a select statement, in order
+
+    :param select: The SelectStmt node
+
+    :return: The SelectStmt nodes
+    """
+    if select.get('op', 'SETOP_NONE') != 'SETOP_NONE':
+        return get_branches(select['larg']) + get_branches(select['rarg'])
+    return [select]
+
+
+def get_constant(node):
+    """Function for getting a constant, possibly cast, in both libpg_query json layouts
+
+    :param node: The node
+
+    :return: The A_Const node, None if the node is no constant
+    """
+    if 'TypeCast' in node:
+        node = node['TypeCast']['arg']
+    return node.get('A_Const')
+
+
+def is_null(node):
+    """Function for checking whether a node is a NULL constant, possibly cast
+
+    :param node: The node
+
+    :return: Whether the node is NULL
+    """
+    constant = get_constant(node)
+    return constant is not None and bool(constant.get('isnull') or 'Null' in constant.get('val', {}))
+
+
+def get_string(node):
+    """Function for getting the value of a string constant, possibly cast
+
+    :param node: The node
+
+    :return: The value
+    """
+    constant = get_constant(node)
+    if 'sval' in constant:
+        return constant['sval']['sval']
+    return constant['val']['String']['str']
+
+
+def get_target_name(target):
+    """Function for getting the name of a column of a select, the alias or the name of the referenced column
+
+    :param target: The ResTarget node
+
+    :return: The name
+    """
+    if 'name' in target:
+        return target['name']
+
+    field = target['val']['ColumnRef']['fields'][-1]['String']
+    return field.get('sval', field.get('str'))
+
+
+@unittest.skipUnless(importlib.util.find_spec('pglast'), 'requires the pglast package')
+class CatalogQueryTest(unittest.TestCase):
+
+    def test_selected_columns(self):
+        query, _ = _catalog._get_query(None)
+        branches = get_branches(parse_select(query))
+
+        names = [get_target_name(target['ResTarget']) for target in branches[0]['targetList']]
+        self.assertEqual(tuple(names), CATALOG_COLUMNS)
+
+        kinds = []
+        for branch in branches:
+            targets = [target['ResTarget'] for target in branch['targetList']]
+            self.assertEqual(len(targets), len(names))
+
+            kind = get_string(targets[0]['val'])
+            kinds.append(kind)
+            selected = {name for name, target in zip(names, targets) if not is_null(target['val'])}
+            self.assertEqual(selected, SELECTED_COLUMNS[kind], kind)
+
+            # Each branch selects what the query it replaces selects
+            if kind in QUERIES:
+                replaced = parse_select(QUERIES[kind].format(filter=''))
+                replaced_names = {get_target_name(target['ResTarget']) for target in replaced['targetList']}
+                self.assertLessEqual(replaced_names, selected, kind)
+
+        self.assertEqual(kinds, ['schema', 'column', 'constraint', 'index'])
+
+    def test_parameters(self):
+        filters = {'include_schemas': 'app*', 'exclude_tables': ['tmp_*']}
+        query, parameters = _catalog._get_query(filters)
+
+        self.assertEqual(parameters, {'include_schemas': ['app%'], 'exclude_tables': ['tmp\\_%']})
+        self.assertEqual(set(re.findall(r'%\((\w+)\)s', query)), set(parameters))
+        self.assertEqual(len(get_branches(parse_select(query))), 4)
+
+        # The schema names are filtered in every branch, the table names in every branch but the schemas
+        self.assertEqual(query.count('nsp.nspname LIKE ANY(%(include_schemas)s)'), 4)
+        self.assertEqual(query.count('rel.relname LIKE ANY(%(exclude_tables)s)'), 3)
+
+    def test_relation_query(self):
+        query = _catalog._RELATION_CATALOG_QUERY
+
+        self.assertEqual(set(re.findall(r'%\((\w+)\)s', query)), {'relation_ids'})
+        self.assertEqual(query.count('rel.oid = ANY(%(relation_ids)s::oid[])'), 3)
+        self.assertEqual(len(get_branches(parse_select(query))), 4)
+
+
+@unittest.skipUnless(os.environ.get('PG_DSN'), 'requires a database in the PG_DSN environment variable')
+class CatalogDatabaseTest(unittest.TestCase):
+
+    def test_catalog_matches_information_schema(self):
+        import psycopg2
+
+        connection = psycopg2.connect(os.environ['PG_DSN'])
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """CREATE SCHEMA pypgdelta_test;
+                       CREATE TABLE pypgdelta_test.teams (
+                           id bigint PRIMARY KEY,
+                           name varchar(100) NOT NULL UNIQUE,
+                           budget numeric(10, 2) CHECK (budget >= 0)
+                       );
+                       CREATE TABLE pypgdelta_test.users (
+                           id bigint,
+                           team_id bigint REFERENCES pypgdelta_test.teams (id),
+                           tags text[],
+                           created timestamptz(3),
+                           PRIMARY KEY (id)
+                       );
+                       CREATE INDEX users_team_id_idx ON pypgdelta_test.users (team_id DESC, created);
+                       CREATE VIEW pypgdelta_test.user_view AS SELECT id, tags FROM pypgdelta_test.users"""
+                )
+
+            filters = {'include_schemas': 'pypgdelta_test'}
+            state = get_state(connection, use_catalog=True, filters=filters)
+
+            self.assertEqual(state, get_state(connection, filters=filters))
+            self.assertEqual(list(state['pypgdelta_test']['tables']), ['teams', 'users'])
+        finally:
+            connection.rollback()
+            connection.close()
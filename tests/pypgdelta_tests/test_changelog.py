@@ -0,0 +1,137 @@
+import unittest
+from collections import OrderedDict
+
+from pypgdelta.sql.state import prune_change_log, refresh_state
+
+from ._catalog_rows import column_row
+from ._fake_connection import FakeConnection
+
+
+class FakeDatabase:
+    """Answers the change log queries of refresh_state from a list of relations"""
+
+    def __init__(self, schemas, relations, changes):
+        self.schemas = schemas
+        self.relations = relations
+        self.changes = changes
+        self.parameters = {}
+
+    def __call__(self, connection, query, parameters):
+        if 'ddl_change_log' in query:
+            return [change for change in self.changes if change['id'] > parameters['watermark']]
+        elif 'UNION ALL' in query:
+            return [
+                column_row(relation['schema'], relation['name'], 'id')
+                for relation in self.relations
+                if relation['relation_id'] in parameters['relation_ids']
+            ]
+        elif 'AS relation_id' in query:
+            self.parameters['relations'] = parameters
+            return [
+                relation
+                for relation in self.relations
+                if relation['relation_id'] in parameters['relation_ids'] or relation['schema'] in parameters['schemas']
+            ]
+
+        self.parameters['schemas'] = parameters
+        return [{'name': schema} for schema in self.schemas if schema in parameters['schemas']]
+
+
+def table_state(columns):
+    """Function for getting the state of a table with bigint columns
+
+    :param columns: The column names
+
+    :return: The table state
+    """
+    return OrderedDict(
+        [
+            (
+                'columns',
+                OrderedDict(
+                    [
+                        (
+                            column,
+                            OrderedDict(
+                                [
+                                    ('data_type', 'bigint'),
+                                    ('character_maximum_length', None),
+                                    ('nullable', False),
+                                    ('data_type_stmt', 'bigint')
+                                ]
+                            )
+                        )
+                        for column in columns
+                    ]
+                )
+            )
+        ]
+    )
+
+
+class RefreshStateTest(unittest.TestCase):
+
+    def test_renamed_schema(self):
+        previous_state = OrderedDict(
+            [
+                ('a', OrderedDict([('tables', OrderedDict([('t', table_state(['id']))])), ('views', OrderedDict())])),
+                ('c', OrderedDict([('tables', OrderedDict()), ('views', OrderedDict())]))
+            ]
+        )
+        database = FakeDatabase(
+            ['b', 'c'],
+            [{'relation_id': 100, 'schema': 'b', 'name': 't', 'kind': 'tables'}],
+            [{'id': 1, 'relation_id': None, 'object_type': 'schema', 'schema_name': None, 'object_name': 'b',
+              'dropped': False}]
+        )
+
+        watermark = refresh_state(previous_state, FakeConnection(database), 0)
+
+        self.assertEqual(watermark, 1)
+        self.assertEqual(list(previous_state), ['c', 'b'])
+        self.assertEqual(list(previous_state['b']['tables']), ['t'])
+        self.assertEqual(list(previous_state['b']['tables']['t']['columns']), ['id'])
+
+        # Only the logged relations and the relations of the known schemas are looked up
+        self.assertEqual(database.parameters['relations']['relation_ids'], [])
+        self.assertEqual(database.parameters['relations']['schemas'], ['c', 'b'])
+
+    def test_filters(self):
+        previous_state = OrderedDict(
+            [
+                ('a', OrderedDict([('tables', OrderedDict([('t', table_state(['id']))])), ('views', OrderedDict())]))
+            ]
+        )
+        database = FakeDatabase(
+            ['a'],
+            [{'relation_id': 100, 'schema': 'a', 'name': 't', 'kind': 'tables'}],
+            [{'id': 4, 'relation_id': 100, 'object_type': 'table', 'schema_name': 'a', 'object_name': 'a.t',
+              'dropped': False}]
+        )
+
+        refresh_state(previous_state, FakeConnection(database), 3, filters={'exclude_tables': 'tmp_*'})
+
+        self.assertEqual(database.parameters['relations']['exclude_tables'], ['tmp\\_%'])
+        self.assertEqual(database.parameters['relations']['relation_ids'], [100])
+        self.assertEqual(list(previous_state['a']['tables']), ['t'])
+
+
+class PruneChangeLogTest(unittest.TestCase):
+
+    def test_prune(self):
+        changes = [{'id': change_id} for change_id in (1, 2, 3)]
+
+        def handler(connection, query, parameters):
+            deleted = [change for change in changes if change['id'] <= parameters['watermark']]
+            for change in deleted:
+                changes.remove(change)
+            return deleted
+
+        connection = FakeConnection(handler)
+
+        self.assertEqual(prune_change_log(connection, 2, schema_name='log'), 2)
+        self.assertEqual(changes, [{'id': 3}])
+        self.assertEqual(
+            connection.queries,
+            [('DELETE FROM log.ddl_change_log WHERE id <= %(watermark)s', {'watermark': 2})]
+        )
@@ -0,0 +1,56 @@
+import json
+import unittest
+
+from pypgdelta.sql.state._constraint import _build_constraints_dict
+
+
+def constraint_row(name, constraint_type, column, position, foreign_table=None, foreign_column=None, definition=None):
+    """Function for getting a row of the constraints query on the table app.orders
+
+    :return: The row
+    """
+    return {
+        'name': name,
+        'type': constraint_type,
+        'schema': 'app',
+        'table': 'orders',
+        'column': column,
+        'position': position,
+        'foreign_schema': 'app' if foreign_table else None,
+        'foreign_table': foreign_table,
+        'foreign_column': foreign_column,
+        'definition': definition
+    }
+
+
+class ConstraintTest(unittest.TestCase):
+
+    def test_constraint_columns(self):
+        constraints = _build_constraints_dict(
+            [
+                constraint_row('orders_check', 'c', None, None, definition='CHECK (true)'),
+                constraint_row('orders_pkey', 'p', 'shop_id', 1),
+                constraint_row('orders_pkey', 'p', 'id', 2),
+                constraint_row('orders_user_fkey', 'f', 'user_shop_id', 1, 'users', 'shop_id'),
+                constraint_row('orders_user_fkey', 'f', 'user_id', 2, 'users', 'id')
+            ]
+        )
+
+        table = json.loads(json.dumps(constraints['app']['tables']['orders']))
+        self.assertEqual(
+            table['constraints'],
+            {
+                'primary_key': {'name': 'orders_pkey', 'columns': ['shop_id', 'id']},
+                'check': {'orders_check': {'name': 'orders_check', 'definition': 'CHECK (true)', 'columns': []}},
+                'foreign_keys': {
+                    'orders_user_fkey': {
+                        'name': 'orders_user_fkey',
+                        'foreign_schema': 'app',
+                        'foreign_table': 'users',
+                        'foreign_columns': ['shop_id', 'id'],
+                        'columns': ['user_shop_id', 'user_id']
+                    }
+                }
+            }
+        )
+        self.assertEqual(table['columns']['id'], {'constraints': [{'name': 'orders_pkey', 'type': 'p'}]})
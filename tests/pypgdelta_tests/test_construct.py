@@ -0,0 +1,262 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pypgdelta import DeltaWatcher, get_delta_statement
+from pypgdelta.construct import construct_cached_configuration, construct_configuration
+from pypgdelta.construct._cache import create_fragment, merge_fragments
+from pypgdelta.locate import iter_json
+
+from ._parse_tree import (alter_table_statement, column_definition, index_statement, schema_statement, table_statement,
+                          write_json_files)
+
+USERS = table_statement(
+    'app',
+    'users',
+    [
+        column_definition('id', ['pg_catalog', 'int8'], primary_key=True),
+        column_definition('name', ['pg_catalog', 'varchar'], [100], not_null=True)
+    ]
+)
+
+
+
+
+def to_postgres_15_layout(node):
+    """Function for converting a parse tree to the libpg_query json layout of PostgreSQL 15 and later
+
+    :param node: The parse tree in the layout of PostgreSQL 13
+
+    :return: The converted parse tree
+    """
+
+    if isinstance(node, list):
+        return [to_postgres_15_layout(element) for element in node]
+    if not isinstance(node, dict):
+        return node
+
+    if 'String' in node:
+        return {'String': {'sval': node['String']['str']}}
+    if 'A_Const' in node:
+        return {'A_Const': {'ival': node['A_Const']['val']['Integer']}}
+    return {key: to_postgres_15_layout(value) for key, value in node.items()}
+
+
+class ConstructTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root_dir = os.path.join(self.directory.name, 'schema')
+        self.cache_dir = os.path.join(self.directory.name, 'cache')
+        os.mkdir(self.root_dir)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_constructions_agree(self, old_configuration):
+        configuration = construct_configuration(iter_json(self.root_dir))
+
+        self.assertEqual(construct_cached_configuration(self.root_dir, self.cache_dir), configuration)
+        # A second run reads the fragments from the cache
+        self.assertEqual(construct_cached_configuration(self.root_dir, self.cache_dir), configuration)
+
+        watcher = DeltaWatcher(old_configuration, self.root_dir)
+        watcher.refresh()
+        self.assertEqual(watcher.configuration, configuration)
+        self.assertEqual(watcher.statement, get_delta_statement(old_configuration, configuration))
+
+        return configuration
+
+    def get_cache_entries(self):
+        return [
+            entry
+            for directory in os.listdir(self.cache_dir)
+            for entry in os.listdir(os.path.join(self.cache_dir, directory))
+        ]
+
+    def test_cached_construction(self):
+        write_json_files(
+            self.root_dir,
+            {
+                'schemas.json': [schema_statement('app'), schema_statement('empty')],
+                'users.json': [USERS, index_statement('app', 'users', ['name'], unique=True)],
+                'events.json': [table_statement('log', 'events', [column_definition('id', ['uuid'])])]
+            }
+        )
+
+        configuration = self.assert_constructions_agree({})
+        self.assertEqual(list(configuration['app']['tables']), ['users'])
+        self.assertEqual(len(self.get_cache_entries()), 3)
+
+        # Only the entries of the current files are kept
+        write_json_files(self.root_dir, {'events.json': [schema_statement('log')]})
+        configuration = self.assert_constructions_agree({})
+        self.assertEqual(configuration['log']['tables'], {})
+        self.assertEqual(len(self.get_cache_entries()), 3)
+
+    def test_cache_reuse(self):
+        write_json_files(self.root_dir, {'users.json': [USERS]})
+        construct_cached_configuration(self.root_dir, self.cache_dir)
+
+        # The fragment is read from the cache instead of being constructed again
+        with mock.patch('pypgdelta.construct._cache.create_fragment') as create_fragment:
+            configuration = construct_cached_configuration(self.root_dir, self.cache_dir)
+
+        create_fragment.assert_not_called()
+        self.assertEqual(configuration, construct_configuration(iter_json(self.root_dir)))
+
+    def test_shared_cache_dir(self):
+        other_root_dir = os.path.join(self.directory.name, 'other')
+        os.mkdir(other_root_dir)
+        write_json_files(self.root_dir, {'users.json': [USERS]})
+        write_json_files(other_root_dir, {'schemas.json': [schema_statement('log')]})
+
+        construct_cached_configuration(self.root_dir, self.cache_dir)
+        construct_cached_configuration(other_root_dir, self.cache_dir)
+
+        # Each root directory keeps its own entries
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertEqual(len(self.get_cache_entries()), 2)
+        with mock.patch('pypgdelta.construct._cache.create_fragment') as create_fragment:
+            configuration = construct_cached_configuration(self.root_dir, self.cache_dir)
+
+        create_fragment.assert_not_called()
+        self.assertEqual(list(configuration), ['app'])
+
+    def test_index_in_other_file(self):
+        for table_file, index_file in (('a.json', 'b.json'), ('b.json', 'a.json')):
+            with self.subTest(table_file=table_file):
+                write_json_files(
+                    self.root_dir,
+                    {
+                        table_file: [USERS],
+                        index_file: [index_statement('app', 'users', ['name'])]
+                    }
+                )
+                old_configuration = construct_configuration([{'stmts': [USERS]}])
+
+                configuration = self.assert_constructions_agree(old_configuration)
+
+                self.assertEqual(list(configuration['app']['tables']), ['users'])
+                self.assertEqual(
+                    configuration['app']['tables']['users']['indexes']['users_name_idx']['columns'],
+                    ['name']
+                )
+                self.assertIn(
+                    'CREATE INDEX CONCURRENTLY users_name_idx ON app.users USING btree (name)',
+                    get_delta_statement(old_configuration, configuration)
+                )
+
+    def test_index_without_table(self):
+        write_json_files(
+            self.root_dir,
+            {
+                'schemas.json': [schema_statement('app')],
+                'indexes.json': [
+                    index_statement('app', 'missing', ['id']),
+                    index_statement('other', 'missing', ['id'])
+                ]
+            }
+        )
+
+        configuration = self.assert_constructions_agree({})
+
+        # The declared schema is kept, the one only referenced by the index is not
+        self.assertEqual(list(configuration), ['app'])
+        self.assertEqual(configuration['app']['tables'], {})
+        self.assertNotIn('index_only', configuration['app'])
+
+    def test_alter_table_in_other_file(self):
+        accounts = table_statement('app', 'accounts', [column_definition('id', ['uuid'])])
+        changes = [
+            alter_table_statement(
+                'app',
+                'users',
+                [
+                    {
+                        'subtype': 'AT_AddColumn',
+                        'def': column_definition('email', ['pg_catalog', 'varchar'], [200], not_null=True)
+                    },
+                    {'subtype': 'AT_DropColumn', 'name': 'name'}
+                ]
+            ),
+            alter_table_statement(
+                'app',
+                'accounts',
+                [
+                    {
+                        'subtype': 'AT_AddConstraint',
+                        'def': {
+                            'Constraint': {
+                                'contype': 'CONSTR_PRIMARY',
+                                'conname': 'accounts_id_pk',
+                                'keys': [{'String': {'str': 'id'}}]
+                            }
+                        }
+                    }
+                ]
+            ),
+            index_statement('app', 'users', ['email'])
+        ]
+        files = [[USERS, accounts], changes]
+
+        configuration = construct_configuration([{'stmts': statements} for statements in files])
+        self.assertEqual(merge_fragments([create_fragment(statements) for statements in files]), configuration)
+
+        users = configuration['app']['tables']['users']
+        self.assertEqual(list(users['columns']), ['id', 'email'])
+        self.assertEqual(users['columns']['email']['data_type_stmt'], 'varchar(200)')
+        self.assertEqual(list(users['indexes']), ['users_email_idx'])
+
+        accounts = configuration['app']['tables']['accounts']
+        self.assertEqual(accounts['constraints']['primary_key'], {'name': 'accounts_id_pk', 'columns': ['id']})
+        self.assertFalse(accounts['columns']['id']['nullable'])
+
+        # The cached fragments and the watcher agree, in whichever order the files are found
+        write_json_files(self.root_dir, {'tables.json': files[0], 'changes.json': files[1]})
+        self.assert_constructions_agree({})
+
+    def test_alter_table_before_create(self):
+        drop_primary_key = alter_table_statement(
+            'app',
+            'users',
+            [
+                {'subtype': 'AT_DropConstraint', 'name': 'users_pkey'},
+                {'subtype': 'AT_DropNotNull', 'name': 'name'}
+            ]
+        )
+        files = [[drop_primary_key], [USERS]]
+
+        # Like on the server, the table has to exist when it is altered
+        configuration = construct_configuration([{'stmts': statements} for statements in files])
+        self.assertEqual(configuration, construct_configuration([{'stmts': [USERS]}]))
+        self.assertEqual(merge_fragments([create_fragment(statements) for statements in files]), configuration)
+
+        configuration = construct_configuration([{'stmts': [USERS, drop_primary_key]}])
+        users = configuration['app']['tables']['users']
+        self.assertEqual(users['constraints']['primary_key'], {})
+        self.assertEqual(users['columns']['id']['constraints'], [])
+        self.assertFalse(users['columns']['id']['nullable'])
+        self.assertTrue(users['columns']['name']['nullable'])
+
+    def test_postgres_15_layout(self):
+        statements = [
+            schema_statement('app'),
+            USERS,
+            table_statement(
+                'app',
+                'amounts',
+                [
+                    column_definition('id', ['uuid'], primary_key=True),
+                    column_definition('amount', ['pg_catalog', 'numeric'], [10, 2])
+                ]
+            )
+        ]
+
+        configuration = construct_configuration([{'stmts': statements}])
+
+        self.assertEqual(construct_configuration([{'stmts': to_postgres_15_layout(statements)}]), configuration)
+        tables = configuration['app']['tables']
+        self.assertEqual(tables['users']['columns']['name']['data_type_stmt'], 'varchar(100)')
+        self.assertEqual(tables['amounts']['columns']['amount']['data_type_stmt'], 'numeric(10,2)')
@@ -0,0 +1,302 @@
+import io
+import unittest
+
+from pypgdelta import (get_configuration_fingerprint, get_delta, get_delta_plan, get_delta_statement,
+                       iter_delta_statements, write_delta_statement)
+from pypgdelta._fingerprint import get_schema_fingerprint
+from pypgdelta._types import is_metadata_only_change
+
+from ._configurations import (BIGINT, VARCHAR, get_configuration, get_new_configuration, get_old_configuration,
+                              named_table, rename_primary_key)
+from ._parse_tree import column_definition, index_statement, table_statement
+
+# The statements of the golden delta test
+DEFAULT_STATEMENTS = [
+    'CREATE SCHEMA audit',
+    'CREATE TABLE audit.log (\n\tid bigint NOT NULL\n)',
+    'ALTER TABLE audit.log ADD CONSTRAINT log_pkey PRIMARY KEY(id)',
+    'CREATE INDEX CONCURRENTLY log_id_idx ON audit.log USING btree (id)',
+    'ALTER TABLE app.orders \nADD COLUMN code bigint NOT NULL',
+    'ALTER TABLE app.orders \nALTER COLUMN name TYPE varchar(20),\nALTER COLUMN name DROP NOT NULL',
+    'ALTER TABLE app.users \nALTER COLUMN name TYPE varchar(100),\nALTER COLUMN name SET NOT NULL'
+]
+
+
+def users_table(columns):
+    """Function for getting the configuration of a table app.users with the given columns
+
+    :param columns: The column definitions
+
+    :return: The configuration
+    """
+    return get_configuration([table_statement('app', 'users', columns)])
+
+
+def users_index(columns, unique=False):
+    """Function for getting the statement of the index users_name_idx on app.users
+
+    :param columns: The names of the indexed columns
+    :param unique: Whether the index is unique
+
+    :return: The statement
+    """
+    return index_statement('app', 'users', columns, index_name='users_name_idx', unique=unique)
+
+
+class DeltaTest(unittest.TestCase):
+
+    def test_column_delta(self):
+        old = users_table([
+            column_definition('id', BIGINT, primary_key=True),
+            column_definition('name', VARCHAR, [50]),
+            column_definition('legacy', BIGINT)
+        ])
+        new = users_table([
+            column_definition('id', BIGINT, primary_key=True),
+            column_definition('name', VARCHAR, [100]),
+            column_definition('email', VARCHAR, [200])
+        ])
+
+        delta = get_delta(old, new)
+
+        self.assertEqual(delta['schema']['new'], [])
+        self.assertEqual(delta['tables']['new'], [])
+        table = delta['tables']['alter'][0]
+        self.assertEqual(list(table['new_column_definitions']), ['email'])
+        self.assertEqual(list(table['alter_column_definitions']), ['name'])
+        self.assertEqual(list(table['delete_column_definitions']), ['legacy'])
+
+        # The delta references the column definitions of the configurations instead of copying them
+        new_columns = new['app']['tables']['users']['columns']
+        old_columns = old['app']['tables']['users']['columns']
+        self.assertIs(table['new_column_definitions']['email'], new_columns['email'])
+        self.assertIs(table['alter_column_definitions']['name'], new_columns['name'])
+        self.assertIs(table['previous_column_definitions']['name'], old_columns['name'])
+        self.assertIs(table['delete_column_definitions']['legacy'], old_columns['legacy'])
+
+    def test_new_table_shares_columns(self):
+        new = users_table([column_definition('id', BIGINT, primary_key=True)])
+
+        delta = get_delta({}, new)
+
+        self.assertEqual(delta['schema']['new'], ['app'])
+        self.assertIs(delta['tables']['new'][0]['column_definitions'], new['app']['tables']['users']['columns'])
+
+    def test_fingerprints(self):
+        old = get_old_configuration()
+        new = get_old_configuration()
+        old_fingerprints = {}
+        new_fingerprints = {}
+        self.assertEqual(get_schema_fingerprint(new['app'], new_fingerprints),
+                         get_schema_fingerprint(old['app'], old_fingerprints))
+        self.assertEqual(get_configuration_fingerprint(new), get_configuration_fingerprint(old))
+
+        # The fingerprints are kept off the configuration
+        self.assertNotIn('fingerprint', new['app'])
+        self.assertNotIn('fingerprint', new['app']['tables']['users'])
+
+        # Changing a column changes the fingerprints of its table and schema only
+        new['app']['tables']['users']['columns']['name']['nullable'] = False
+        new_fingerprints = {}
+        self.assertNotEqual(get_schema_fingerprint(new['app'], new_fingerprints),
+                            get_schema_fingerprint(old['app'], old_fingerprints))
+        for table_name, is_changed in (('users', True), ('orders', False)):
+            new_fingerprint = new_fingerprints[id(new['app']['tables'][table_name])]
+            old_fingerprint = old_fingerprints[id(old['app']['tables'][table_name])]
+            self.assertEqual(new_fingerprint != old_fingerprint, is_changed)
+        self.assertNotEqual(get_configuration_fingerprint(new), get_configuration_fingerprint(old))
+
+    def test_changed_configuration(self):
+        old = get_old_configuration()
+        new = get_old_configuration()
+        self.assertEqual(get_delta(old, new)['tables']['alter'], [])
+
+        # A configuration changed after it was diffed is compared again
+        new['app']['tables']['users']['columns']['name']['nullable'] = False
+        self.assertEqual([table['table_name'] for table in get_delta(old, new)['tables']['alter']], ['users'])
+        self.assertEqual(get_delta(old, new, jobs=2), get_delta(old, new))
+        self.assertEqual(get_delta_statement(old, new),
+                         'ALTER TABLE app.users \nALTER COLUMN name TYPE varchar(50),\nALTER COLUMN name SET NOT NULL;')
+
+    def test_process_pool(self):
+        old = get_old_configuration()
+        new = get_new_configuration()
+
+        self.assertEqual(get_delta(old, new, jobs=2), get_delta(old, new))
+        self.assertEqual(get_delta_statement(old, new, jobs=2), get_delta_statement(old, new))
+
+    def test_delta_statement(self):
+        delta_statement = get_delta_statement(get_old_configuration(), get_new_configuration())
+
+        self.assertEqual(delta_statement, ';\n\n'.join(DEFAULT_STATEMENTS) + ';')
+
+    def test_online_delta_statement(self):
+        old = users_table([column_definition('id', BIGINT, primary_key=True), column_definition('name', VARCHAR, [50])])
+        not_null_statements = [
+            'ALTER TABLE app.users ADD CONSTRAINT users_name_not_null CHECK (name IS NOT NULL) NOT VALID',
+            'ALTER TABLE app.users VALIDATE CONSTRAINT users_name_not_null',
+            'ALTER TABLE app.users \nALTER COLUMN name SET NOT NULL',
+            'ALTER TABLE app.users \nDROP CONSTRAINT users_name_not_null'
+        ]
+
+        # NOT NULL is set through a check constraint validated without blocking writes, the type only if it changes
+        widen_statement = 'ALTER TABLE app.users \nALTER COLUMN name TYPE varchar(100)'
+        for length, type_statements in ((50, []), (100, [widen_statement])):
+            new = users_table(
+                [
+                    column_definition('id', BIGINT, primary_key=True),
+                    column_definition('name', VARCHAR, [length], not_null=True)
+                ]
+            )
+            self.assertEqual(list(iter_delta_statements(old, new, online=True)), type_statements + not_null_statements)
+
+    def test_online_rewrite(self):
+        old = get_configuration([named_table('users', 50)])
+        new = get_configuration([named_table('users', 10)])
+
+        # Narrowing a column rewrites the table, which is flagged on the delta and the plan instead of avoided
+        delta = get_delta(old, new)
+        self.assertEqual(delta['tables']['alter'][0]['rewritten_columns'], ['name'])
+        self.assertEqual(
+            get_delta_statement(old, new, online=True),
+            'ALTER TABLE app.users \nALTER COLUMN name TYPE varchar(10);'
+        )
+        for coalesce in (False, True):
+            plan = get_delta_plan(delta, online=True, coalesce=coalesce)
+            self.assertEqual([step['rewrites'] for step in plan], [['name']])
+
+        # Widening it does not
+        delta = get_delta(new, old)
+        self.assertNotIn('rewritten_columns', delta['tables']['alter'][0])
+        self.assertEqual([step['rewrites'] for step in get_delta_plan(delta, online=True)], [[]])
+
+    def test_long_not_null_check_name(self):
+        columns = [column_definition('a' * 40, BIGINT), column_definition('a' * 40 + 'b', BIGINT)]
+        old = get_configuration([table_statement('app', 'user_accounts', columns)])
+        new = get_configuration(
+            [
+                table_statement(
+                    'app',
+                    'user_accounts',
+                    [column_definition(name, BIGINT, not_null=True) for name in ('a' * 40, 'a' * 40 + 'b')]
+                )
+            ]
+        )
+
+        # The server truncates identifiers to 63 bytes, the names are shortened before they clash
+        names = {
+            statement.split('VALIDATE CONSTRAINT ')[1]
+            for statement in iter_delta_statements(old, new, online=True)
+            if 'VALIDATE CONSTRAINT' in statement
+        }
+        self.assertEqual(len(names), 2)
+        for name in names:
+            self.assertEqual(len(name), 63)
+            self.assertTrue(name.startswith('user_accounts_aaaa'))
+
+    def test_metadata_only_change(self):
+        for old_statement, new_statement in (('varchar(10)', 'varchar(20)'), ('varchar(10)', 'text'),
+                                             ('text', 'varchar'), ('numeric(10,2)', 'numeric(12,2)'),
+                                             ('numeric(10,2)', 'numeric'), ('timestamp(3)', 'timestamp(6)'),
+                                             ('varbit(4)', 'varbit(8)'), ('bigint', 'bigint')):
+            self.assertTrue(is_metadata_only_change(old_statement, new_statement), (old_statement, new_statement))
+
+        for old_statement, new_statement in (('varchar(20)', 'varchar(10)'), ('text', 'varchar(10)'),
+                                             ('numeric(10,2)', 'numeric(12,3)'), ('timestamp(6)', 'timestamp(3)'),
+                                             ('int4', 'int8'), (None, 'bigint')):
+            self.assertFalse(is_metadata_only_change(old_statement, new_statement), (old_statement, new_statement))
+
+    def test_coalesced_delta_statement(self):
+        old = users_table([
+            column_definition('id', BIGINT, primary_key=True),
+            column_definition('name', VARCHAR, [50]),
+            column_definition('legacy', BIGINT)
+        ])
+        new = users_table([
+            column_definition('id', BIGINT, primary_key=True),
+            column_definition('name', VARCHAR, [100], not_null=True),
+            column_definition('email', VARCHAR, [200])
+        ])
+
+        # The column changes of a table are merged into one command
+        self.assertEqual(
+            list(iter_delta_statements(old, new, coalesce=True)),
+            [
+                'ALTER TABLE app.users \nADD COLUMN email varchar(200),\nALTER COLUMN name TYPE varchar(100),\n'
+                'ALTER COLUMN name SET NOT NULL,\nDROP COLUMN legacy'
+            ]
+        )
+
+        # Online, only the validation, SET NOT NULL and the removal of the check constraint run separately
+        self.assertEqual(
+            list(iter_delta_statements(old, new, online=True, coalesce=True)),
+            [
+                'ALTER TABLE app.users \nADD COLUMN email varchar(200),\nALTER COLUMN name TYPE varchar(100),\n'
+                'DROP COLUMN legacy,\nADD CONSTRAINT users_name_not_null CHECK (name IS NOT NULL) NOT VALID',
+                'ALTER TABLE app.users \nVALIDATE CONSTRAINT users_name_not_null',
+                'ALTER TABLE app.users \nALTER COLUMN name SET NOT NULL',
+                'ALTER TABLE app.users \nDROP CONSTRAINT users_name_not_null'
+            ]
+        )
+
+    def test_coalesced_constraints(self):
+        old = get_old_configuration()
+        new = rename_primary_key(get_configuration([named_table('orders', 20), named_table('users', 50)]), 'orders',
+                                 'orders_id_pkey')
+
+        # The primary key is replaced in the same statement that alters the columns
+        self.assertEqual(
+            get_delta_statement(old, new, coalesce=True),
+            'ALTER TABLE app.orders \nDROP CONSTRAINT IF EXISTS orders_pkey CASCADE,\n'
+            'ALTER COLUMN name TYPE varchar(20),\nALTER COLUMN name DROP NOT NULL,\n'
+            'ADD CONSTRAINT orders_id_pkey PRIMARY KEY(id);'
+        )
+        self.assertEqual(
+            get_delta_statement(old, new),
+            'ALTER TABLE app.orders DROP CONSTRAINT IF EXISTS orders_pkey CASCADE;\n\n'
+            'ALTER TABLE app.orders \nALTER COLUMN name TYPE varchar(20),\nALTER COLUMN name DROP NOT NULL;\n\n'
+            'ALTER TABLE app.orders ADD CONSTRAINT orders_id_pkey PRIMARY KEY(id);'
+        )
+
+    def test_index_delta_statement(self):
+        old = get_configuration([named_table('users', 50), users_index(['name'])])
+
+        self.assertEqual(get_delta_statement(old, get_configuration([named_table('users', 50), users_index(['name'])])),
+                         '')
+        self.assertEqual(
+            get_delta_statement(old, get_configuration([named_table('users', 50), users_index(['id', 'name'], True)])),
+            'DROP INDEX CONCURRENTLY IF EXISTS app.users_name_idx;\n\n'
+            'CREATE UNIQUE INDEX CONCURRENTLY users_name_idx ON app.users USING btree (id, name);'
+        )
+        self.assertEqual(get_delta_statement(old, get_configuration([named_table('users', 50)])),
+                         'DROP INDEX CONCURRENTLY IF EXISTS app.users_name_idx;')
+
+        # A changed index is dropped before and created after the columns are altered
+        self.assertEqual(
+            get_delta_statement(old, get_configuration([named_table('users', 100), users_index(['id'])])),
+            'DROP INDEX CONCURRENTLY IF EXISTS app.users_name_idx;\n\n'
+            'ALTER TABLE app.users \nALTER COLUMN name TYPE varchar(100),\nALTER COLUMN name DROP NOT NULL;\n\n'
+            'CREATE INDEX CONCURRENTLY users_name_idx ON app.users USING btree (id);'
+        )
+
+    def test_unchanged_delta_statement(self):
+        self.assertEqual(get_delta_statement(get_old_configuration(), get_old_configuration()), '')
+
+    def test_streaming(self):
+        old = get_old_configuration()
+        new = get_new_configuration()
+
+        for online in (False, True):
+            for coalesce in (False, True):
+                file = io.StringIO()
+                count = write_delta_statement(old, new, file, online=online, coalesce=coalesce)
+
+                delta_statement = get_delta_statement(old, new, online=online, coalesce=coalesce)
+                self.assertEqual(file.getvalue(), delta_statement)
+                statement_list = list(iter_delta_statements(old, new, online, coalesce))
+                self.assertEqual(';\n\n'.join(statement_list) + ';', delta_statement)
+                self.assertEqual(count, len(statement_list))
+
+        file = io.StringIO()
+        self.assertEqual(write_delta_statement(old, old, file), 0)
+        self.assertEqual(file.getvalue(), '')
@@ -0,0 +1,29 @@
+import unittest
+from unittest import mock
+
+from pypgdelta.construct import dispatch_statements, register_handler
+from pypgdelta.construct._dispatch import _HANDLERS
+
+from ._parse_tree import schema_statement
+
+
+class DispatchTest(unittest.TestCase):
+
+    def test_unknown_statements_are_ignored(self):
+        configuration = dispatch_statements(
+            [schema_statement('app'), {'stmt': {'CommentStmt': {'comment': 'users'}}}]
+        )
+
+        self.assertEqual(list(configuration), ['app'])
+
+    @mock.patch.dict(_HANDLERS)
+    def test_register_handler(self):
+        def add_comment(node, configuration):
+            configuration['app']['comment'] = node['comment']
+
+        register_handler('CommentStmt', add_comment)
+        configuration = dispatch_statements(
+            [schema_statement('app'), {'stmt': {'CommentStmt': {'comment': 'users'}}}]
+        )
+
+        self.assertEqual(configuration['app']['comment'], 'users')
@@ -0,0 +1,136 @@
+import queue
+import threading
+import unittest
+
+import psycopg2
+import psycopg2.extensions
+
+from pypgdelta import execute_delta, get_delta
+from pypgdelta._execute import _cancel, _run_step
+
+from ._configurations import get_configuration, named_table
+from ._fake_connection import FakeConnection, FakePool
+from ._parse_tree import index_statement
+
+
+class ExecuteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.delta = get_delta(
+            get_configuration([named_table('orders', 10), named_table('users', 10)]),
+            get_configuration(
+                [
+                    named_table('orders', 20),
+                    index_statement('app', 'orders', ['name'], index_name='orders_name_idx'),
+                    named_table('users', 20)
+                ]
+            )
+        )
+
+    def test_fail_fast(self):
+        users_started = threading.Event()
+
+        def handler(connection, query, parameters):
+            if 'app.users' in query:
+                users_started.set()
+                if connection.cancelled.wait(5):
+                    raise psycopg2.extensions.QueryCanceledError('canceling statement due to user request')
+            elif query.startswith('ALTER TABLE app.orders'):
+                users_started.wait(5)
+                raise psycopg2.ProgrammingError('column "name" does not exist')
+
+        pool = FakePool(handler)
+        summary = execute_delta(self.delta, pool, max_connections=2)
+
+        self.assertEqual(
+            [(step['table_name'], step['kind'], step['status']) for step in summary['steps']],
+            [('orders', 'column', 'failed'), ('users', 'column', 'cancelled'), ('orders', 'index', 'skipped')]
+        )
+        self.assertEqual(
+            [summary[status] for status in ('succeeded', 'failed', 'cancelled', 'skipped')],
+            [0, 1, 1, 1]
+        )
+        self.assertEqual(summary['steps'][0]['error'], 'column "name" does not exist')
+        self.assertEqual(len(pool.connections), 2)
+        self.assertEqual(sorted(map(id, pool.returned)), sorted(map(id, pool.connections)))
+
+    def test_no_fail_fast(self):
+        def handler(connection, query, parameters):
+            if query.startswith('ALTER TABLE app.orders'):
+                raise psycopg2.ProgrammingError('column "name" does not exist')
+
+        summary = execute_delta(self.delta, FakePool(handler), max_connections=2, fail_fast=False)
+
+        self.assertEqual(
+            [summary[status] for status in ('succeeded', 'failed', 'cancelled', 'skipped')],
+            [1, 1, 0, 1]
+        )
+
+    def test_max_connections(self):
+        pool = FakePool(lambda connection, query, parameters: [])
+
+        with self.assertRaises(ValueError):
+            execute_delta(self.delta, pool, max_connections=0)
+        self.assertEqual(pool.connections, [])
+
+    def test_cancel_before_execute(self):
+        connection = FakeConnection(lambda connection, query, parameters: [])
+        idle = queue.Queue()
+        idle.put(connection)
+        running_connections = {}
+        lock = threading.Lock()
+        stopped = threading.Event()
+        step = {'id': 0, 'kind': 'column', 'statement': 'ALTER TABLE app.users \nALTER COLUMN name TYPE varchar(20)'}
+        result = {'status': 'skipped', 'duration': None, 'error': None}
+
+        # The execution is stopped after the step started but before its statement reached the server, where the
+        # cancel request is lost
+        connection.on_cursor = lambda connection: _cancel(running_connections, lock, stopped)
+        _run_step(step, result, idle, running_connections, lock, stopped)
+
+        self.assertEqual(result['status'], 'cancelled')
+        self.assertFalse(connection.cancelled.is_set())
+        self.assertEqual(connection.transactions, ['rollback'])
+        self.assertEqual(running_connections, {})
+        self.assertIs(idle.get_nowait(), connection)
+
+    def test_cancel_concurrent_index(self):
+        delta = get_delta(
+            get_configuration([named_table('orders', 10), named_table('users', 10)]),
+            get_configuration(
+                [
+                    named_table('orders', 20),
+                    named_table('users', 10),
+                    index_statement('app', 'users', ['name'], index_name='users_name_idx')
+                ]
+            )
+        )
+        index_started = threading.Event()
+
+        def on_cursor(connection):
+            # Only the concurrent index statement runs in autocommit mode, it is held until the first cancel request
+            # was lost
+            if connection.autocommit:
+                index_started.set()
+                connection.cancel_requested.wait(5)
+
+        def handler(connection, query, parameters):
+            if query.startswith('CREATE INDEX'):
+                if connection.cancelled.wait(5):
+                    raise psycopg2.extensions.QueryCanceledError('canceling statement due to user request')
+            else:
+                index_started.wait(5)
+                raise psycopg2.ProgrammingError('column "name" does not exist')
+
+        class Pool(FakePool):
+            def getconn(self, key=None):
+                connection = super().getconn(key)
+                connection.on_cursor = on_cursor
+                return connection
+
+        summary = execute_delta(delta, Pool(handler), max_connections=2)
+
+        self.assertEqual(
+            [(step['table_name'], step['kind'], step['status']) for step in summary['steps']],
+            [('orders', 'column', 'failed'), ('users', 'index', 'cancelled')]
+        )
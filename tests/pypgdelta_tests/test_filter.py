@@ -0,0 +1,50 @@
+import unittest
+
+from pypgdelta.sql.state import get_state
+from pypgdelta.sql.state._filter import build_filter
+
+from ._fake_connection import FakeConnection
+
+
+class FilterTest(unittest.TestCase):
+
+    def test_build_filter(self):
+        condition, parameters = build_filter(
+            {'include_schemas': 'app*', 'exclude_schemas': ['pg_*', 'information_schema'], 'exclude_tables': 'tmp?'},
+            'nsp.nspname',
+            'rel.relname'
+        )
+
+        self.assertEqual(
+            condition,
+            'AND nsp.nspname LIKE ANY(%(include_schemas)s) '
+            'AND NOT nsp.nspname LIKE ANY(%(exclude_schemas)s) '
+            'AND NOT rel.relname LIKE ANY(%(exclude_tables)s)'
+        )
+        self.assertEqual(
+            parameters,
+            {
+                'include_schemas': ['app%'],
+                'exclude_schemas': ['pg\\_%', 'information\\_schema'],
+                'exclude_tables': ['tmp_']
+            }
+        )
+
+    def test_table_filters_need_a_table_column(self):
+        condition, parameters = build_filter({'include_tables': 'users'}, 'schema_name')
+
+        self.assertEqual((condition, parameters), ('', {}))
+        self.assertEqual(build_filter(None, 'schema_name'), ('', {}))
+
+    def test_state_queries(self):
+        filters = {'include_schemas': 'app'}
+        for use_catalog in (False, True):
+            with self.subTest(use_catalog=use_catalog):
+                connection = FakeConnection(lambda connection, query, parameters: [])
+
+                get_state(connection, use_catalog=use_catalog, filters=filters)
+
+                # The filters are applied in every query
+                for query, parameters in connection.queries:
+                    self.assertIn('LIKE ANY(%(include_schemas)s)', query)
+                    self.assertEqual(parameters, {'include_schemas': ['app']})
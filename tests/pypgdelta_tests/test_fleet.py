@@ -0,0 +1,96 @@
+import unittest
+from unittest import mock
+
+import psycopg2
+
+from pypgdelta import get_delta_statement, get_fleet_delta_statements
+from pypgdelta.construct import construct_configuration
+
+from ._fake_connection import FakeConnection
+from ._parse_tree import column_definition, table_statement
+
+
+def information_schema(columns):
+    """Function for getting a connection handler answering the information_schema queries of get_state
+
+    :param columns: The bigint columns of the table app.users
+
+    :return: The handler
+    """
+
+    def handler(connection, query, parameters):
+        if 'information_schema.schemata' in query:
+            return [{'schema_name': 'app'}]
+        elif 'information_schema.columns' in query:
+            return [
+                {
+                    'table_schema': 'app',
+                    'table_name': 'users',
+                    'table_type': 'BASE TABLE',
+                    'character_maximum_length': None,
+                    'column_name': column,
+                    'data_type': 'bigint',
+                    'udt_name': 'int8',
+                    'numeric_precision': 64,
+                    'numeric_scale': 0,
+                    'datetime_precision': None,
+                    'is_nullable': 'NO'
+                }
+                for column in columns
+            ]
+        return []
+
+    return handler
+
+
+class FleetTest(unittest.TestCase):
+
+    def test_identical_states_share_one_delta(self):
+        new_configuration = construct_configuration(
+            [
+                {
+                    'stmts': [
+                        table_statement(
+                            'app',
+                            'users',
+                            [
+                                column_definition('id', ['pg_catalog', 'int8'], not_null=True),
+                                column_definition('name', ['pg_catalog', 'int8'], not_null=True)
+                            ]
+                        )
+                    ]
+                }
+            ]
+        )
+        connections = {
+            'a': FakeConnection(information_schema(['id'])),
+            'b': FakeConnection(information_schema(['id', 'name'])),
+            'c': FakeConnection(information_schema(['id']))
+        }
+
+        with mock.patch('pypgdelta._fleet.get_delta_statement', wraps=get_delta_statement) as delta:
+            scripts, errors = get_fleet_delta_statements(connections, new_configuration, max_workers=2)
+
+        self.assertEqual(errors, {})
+        self.assertEqual(delta.call_count, 2)
+        self.assertEqual(list(scripts), ['a', 'b', 'c'])
+        self.assertEqual(scripts['a'], scripts['c'])
+        self.assertIn('ADD COLUMN name', scripts['a'])
+        self.assertEqual(scripts['b'], '')
+
+    def test_unreachable_database(self):
+        def unreachable(connection, query, parameters):
+            raise psycopg2.OperationalError('could not connect to server')
+
+        connections = {
+            'a': FakeConnection(information_schema(['id'])),
+            'b': FakeConnection(unreachable),
+            'c': FakeConnection(information_schema(['id']))
+        }
+
+        scripts, errors = get_fleet_delta_statements(connections, {}, max_workers=2)
+
+        # The other databases still get their scripts
+        self.assertEqual(list(scripts), ['a', 'c'])
+        self.assertEqual(list(errors), ['b'])
+        self.assertIsInstance(errors['b'], psycopg2.OperationalError)
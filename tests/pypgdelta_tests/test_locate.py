@@ -0,0 +1,91 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from pypgdelta.construct import construct_configuration
+from pypgdelta.locate import find_and_read_json, iter_json, iter_sql
+
+from ._parse_tree import column_definition, index_statement, schema_statement, table_statement, write_json_files
+
+SQL = """CREATE SCHEMA app;
+
+CREATE TABLE app.users (
+    id bigint PRIMARY KEY,
+    name varchar(100) NOT NULL,
+    amount numeric(10, 2),
+    tags text[]
+);
+
+CREATE UNIQUE INDEX users_name_key ON app.users (name);
+"""
+
+
+class JsonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.directory.name, 'tables'))
+        write_json_files(self.directory.name, {'schema.json': [schema_statement('app')]})
+        write_json_files(
+            os.path.join(self.directory.name, 'tables'),
+            {
+                f'table_{number}.json': [
+                    table_statement('app', f'table_{number}', [column_definition('id', ['pg_catalog', 'int8'])])
+                ]
+                for number in range(5)
+            }
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_process_pool(self):
+        parsed = find_and_read_json(self.directory.name)
+
+        self.assertEqual(len(parsed), 6)
+        self.assertEqual(list(iter_json(self.directory.name, processes=2, chunksize=2)), parsed)
+
+    @unittest.skipUnless(importlib.util.find_spec('orjson'), 'requires the orjson package')
+    def test_orjson(self):
+        parsed = list(iter_json(self.directory.name, decoder='orjson'))
+
+        self.assertEqual(parsed, find_and_read_json(self.directory.name))
+
+    def test_unknown_decoder(self):
+        with self.assertRaises(ValueError):
+            list(iter_json(self.directory.name, decoder='yaml'))
+
+
+@unittest.skipUnless(importlib.util.find_spec('pglast'), 'requires the pglast package')
+class SqlTest(unittest.TestCase):
+
+    def test_parse_sql_file(self):
+        with tempfile.TemporaryDirectory() as root_dir:
+            with open(os.path.join(root_dir, 'users.sql'), 'w') as f:
+                f.write(SQL)
+
+            configuration = construct_configuration(iter_sql(root_dir))
+
+        expected = construct_configuration(
+            [
+                {
+                    'stmts': [
+                        schema_statement('app'),
+                        table_statement(
+                            'app',
+                            'users',
+                            [
+                                column_definition('id', ['pg_catalog', 'int8'], primary_key=True),
+                                column_definition('name', ['pg_catalog', 'varchar'], [100], not_null=True),
+                                column_definition('amount', ['pg_catalog', 'numeric'], [10, 2]),
+                                column_definition('tags', ['text'], array=True)
+                            ]
+                        ),
+                        index_statement('app', 'users', ['name'], index_name='users_name_key', unique=True)
+                    ]
+                }
+            ]
+        )
+        self.assertEqual(configuration, expected)
+        self.assertEqual(configuration['app']['tables']['users']['columns']['tags']['data_type_stmt'], 'text[]')
@@ -0,0 +1,48 @@
+import unittest
+
+from pypgdelta import (Column, Index, Schema, Table, get_configuration_dict, get_configuration_model, get_delta,
+                       get_delta_statement)
+
+from ._configurations import get_new_configuration, get_old_configuration
+
+
+class ModelTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        configuration = get_new_configuration()
+
+        model = get_configuration_model(configuration)
+
+        self.assertIsInstance(model['audit'], Schema)
+        self.assertIsInstance(model['audit']['tables']['log'], Table)
+        self.assertIsInstance(model['audit']['tables']['log']['columns']['id'], Column)
+        self.assertIsInstance(model['audit']['tables']['log']['indexes']['log_id_idx'], Index)
+        self.assertEqual(get_configuration_dict(model), configuration)
+
+    def test_delta(self):
+        old_configuration = get_old_configuration()
+        new_configuration = get_new_configuration()
+        old_model = get_configuration_model(old_configuration)
+        new_model = get_configuration_model(new_configuration)
+
+        self.assertEqual(get_delta(old_model, new_model), get_delta(old_configuration, new_configuration))
+        self.assertEqual(
+            get_delta_statement(old_model, new_model),
+            get_delta_statement(old_configuration, new_configuration)
+        )
+
+    def test_node_keys(self):
+        column = Column.from_dict({'data_type': 'bigint', 'nullable': False})
+
+        self.assertEqual(dict(column), {'data_type': 'bigint', 'nullable': False})
+        self.assertNotIn('data_type_stmt', column)
+        with self.assertRaises(KeyError):
+            column['data_type_stmt']
+        with self.assertRaises(KeyError):
+            column['unknown'] = True
+        with self.assertRaises(ValueError):
+            Column.from_dict({'unknown': True})
+
+        column['data_type_stmt'] = 'bigint'
+        del column['nullable']
+        self.assertEqual(list(column), ['data_type', 'data_type_stmt'])
@@ -0,0 +1,101 @@
+import unittest
+
+from pypgdelta import get_delta, get_delta_plan, get_plan_waves
+
+from ._configurations import (get_configuration, get_new_configuration, get_old_configuration, named_table,
+                              rename_primary_key)
+
+
+def get_waves(plan):
+    """Function for getting the kind, table, dependencies and statement of the steps of each wave of a plan
+
+    :param plan: The plan
+
+    :return: The waves
+    """
+    return [
+        [(step['kind'], step['table_name'], step['depends_on'], step['statement']) for step in wave]
+        for wave in get_plan_waves(plan)
+    ]
+
+
+class PlanTest(unittest.TestCase):
+
+    def test_plan_waves(self):
+        plan = get_delta_plan(get_delta(get_old_configuration(), get_new_configuration()))
+
+        self.assertEqual(
+            get_waves(plan),
+            [
+                [
+                    ('schema', None, [], 'CREATE SCHEMA audit'),
+                    ('column', 'orders', [], 'ALTER TABLE app.orders \nADD COLUMN code bigint NOT NULL;\n\n'
+                                             'ALTER TABLE app.orders \nALTER COLUMN name TYPE varchar(20),\n'
+                                             'ALTER COLUMN name DROP NOT NULL'),
+                    ('column', 'users', [], 'ALTER TABLE app.users \nALTER COLUMN name TYPE varchar(100),\n'
+                                            'ALTER COLUMN name SET NOT NULL')
+                ],
+                [
+                    ('table', 'log', [0], 'CREATE TABLE audit.log (\n\tid bigint NOT NULL\n)')
+                ],
+                [
+                    ('constraint', 'log', [1], 'ALTER TABLE audit.log ADD CONSTRAINT log_pkey PRIMARY KEY(id)'),
+                    ('index', 'log', [1], 'CREATE INDEX CONCURRENTLY log_id_idx ON audit.log USING btree (id)')
+                ]
+            ]
+        )
+        self.assertEqual([step['id'] for step in plan], [0, 4, 5, 1, 2, 3])
+
+    def test_primary_key_drop_is_a_barrier(self):
+        old_configuration = rename_primary_key(
+            get_configuration([named_table('users', 10), named_table('orders', 10), named_table('items', 10)]),
+            'orders',
+            'orders_old_pkey'
+        )
+        new_configuration = get_configuration(
+            [named_table('users', 20), named_table('orders', 20), named_table('items', 20)]
+        )
+        delta = get_delta(old_configuration, new_configuration)
+
+        for coalesce in (False, True):
+            with self.subTest(coalesce=coalesce):
+                steps = {
+                    step['table_name']: step
+                    for step in get_delta_plan(delta, coalesce=coalesce)
+                    if 'CASCADE' in step['statement'] or step['table_name'] != 'orders'
+                }
+
+                # The primary key drop waits for the users table, the items table waits for the drop
+                self.assertIn(steps['users']['id'], steps['orders']['depends_on'])
+                self.assertEqual(steps['items']['depends_on'], [steps['orders']['id']])
+                self.assertGreater(steps['orders']['wave'], steps['users']['wave'])
+                self.assertGreater(steps['items']['wave'], steps['orders']['wave'])
+
+    def test_foreign_keys(self):
+        old_configuration = get_configuration(
+            [named_table('orders', 10), named_table('users', 10), named_table('items', 10)]
+        )
+        old_configuration['app']['tables']['orders']['constraints']['foreign_keys'] = {
+            'orders_user_fkey': {
+                'name': 'orders_user_fkey',
+                'type': 'f',
+                'foreign_schema': 'app',
+                'foreign_table': 'users',
+                'foreign_columns': ['id'],
+                'columns': ['id']
+            }
+        }
+        new_configuration = get_configuration(
+            [named_table('orders', 20), named_table('users', 20), named_table('items', 20)]
+        )
+        delta = get_delta(old_configuration, new_configuration)
+        self.assertEqual(delta['tables']['alter'][0]['referenced_tables'], [['app', 'users']])
+
+        for coalesce in (False, True):
+            with self.subTest(coalesce=coalesce):
+                steps = {step['table_name']: step for step in get_delta_plan(delta, coalesce=coalesce)}
+
+                # The referencing table waits for the table it references, the unrelated table does not
+                self.assertEqual(steps['orders']['depends_on'], [steps['users']['id']])
+                self.assertEqual(steps['items']['depends_on'], [])
+                self.assertLess(steps['users']['id'], steps['orders']['id'])
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from pypgdelta import get_configuration_model, get_delta_statement, load_state, save_state
+
+from ._configurations import get_new_configuration, get_old_configuration
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'state.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        configuration = get_old_configuration()
+        for state in (configuration, get_configuration_model(configuration)):
+            with self.subTest(model=state is not configuration):
+                save_state(state, self.path)
+
+                with load_state(self.path) as snapshot:
+                    self.assertEqual(list(snapshot), list(configuration))
+                    self.assertEqual(dict(snapshot), dict(configuration))
+                    self.assertEqual(
+                        get_delta_statement(snapshot, get_new_configuration()),
+                        get_delta_statement(configuration, get_new_configuration())
+                    )
+
+    def test_lazy_loading(self):
+        save_state(get_new_configuration(), self.path)
+
+        with load_state(self.path) as snapshot:
+            self.assertIn('audit', snapshot)
+            self.assertEqual(len(snapshot), 2)
+            self.assertEqual(snapshot._schemas, {})
+
+            self.assertEqual(list(snapshot['audit']['tables']), ['log'])
+            self.assertEqual(list(snapshot._schemas), ['audit'])
+
+    def test_closed(self):
+        save_state(get_new_configuration(), self.path)
+
+        with load_state(self.path) as snapshot:
+            snapshot['audit']
+
+        # Once closed, no schema can be read, not even one parsed before
+        self.assertTrue(snapshot._map.closed)
+        with self.assertRaises(ValueError):
+            snapshot['audit']
+        snapshot.close()
+
+    def test_unsupported_file(self):
+        with open(self.path, 'w') as f:
+            f.write('{"format": "other", "version": 1}\n{"index": []}\n')
+
+        with self.assertRaises(ValueError):
+            load_state(self.path)
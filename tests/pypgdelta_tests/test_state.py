@@ -0,0 +1,127 @@
+import asyncio
+import unittest
+
+import psycopg2
+
+from pypgdelta.sql.state import get_state, get_state_async
+
+from ._catalog_rows import column_row, constraint_row, index_row, schema_row
+from ._fake_connection import FakeConnection, FakePool
+
+ROWS = [
+    schema_row('app'),
+    schema_row('empty'),
+    column_row('app', 'users', 'id'),
+    column_row('app', 'users', 'team_id'),
+    constraint_row('app', 'users', 'users_pkey', 'id'),
+    index_row('app', 'users', 'users_team_id_idx', 'team_id')
+]
+
+
+def catalog(connection, query, parameters):
+    """Function answering the catalog query and the per-kind queries with the rows of ROWS, the queries themselves are
+    checked in test_catalog
+    """
+
+    if 'UNION ALL' in query:
+        kinds = ('schema', 'column', 'constraint', 'index')
+    elif 'information_schema.schemata' in query:
+        kinds = ('schema',)
+    elif 'information_schema.columns' in query:
+        kinds = ('column',)
+    elif 'pg_catalog.pg_index' in query:
+        kinds = ('index',)
+    else:
+        kinds = ('constraint',)
+    return [row for row in ROWS if row['kind'] in kinds]
+
+
+def snapshot_catalog(connection, query, parameters):
+    """Function answering the snapshot export of the concurrent introspection, and the other queries like catalog"""
+    if 'pg_export_snapshot' in query:
+        return [('00000003-0000001B-1',)]
+    return catalog(connection, query, parameters)
+
+
+class StateTest(unittest.TestCase):
+
+    def test_catalog_rows(self):
+        connection = FakeConnection(catalog)
+
+        state = get_state(connection, use_catalog=True)
+
+        # Both backends build the same state from the same rows
+        self.assertEqual(state, get_state(connection))
+        self.assertEqual(list(state), ['app', 'empty'])
+        users = state['app']['tables']['users']
+        self.assertEqual(list(users['columns']), ['id', 'team_id'])
+        self.assertEqual(users['constraints']['primary_key']['name'], 'users_pkey')
+        self.assertEqual(users['indexes']['users_team_id_idx']['columns'], ['team_id'])
+
+    def test_itersize(self):
+        for use_catalog in (False, True):
+            with self.subTest(use_catalog=use_catalog):
+                connection = FakeConnection(catalog)
+
+                state = get_state(connection, use_catalog=use_catalog, itersize=2)
+
+                self.assertEqual(state, get_state(FakeConnection(catalog), use_catalog=use_catalog))
+                self.assertTrue(connection.cursors)
+                for cursor in connection.cursors:
+                    self.assertIsNotNone(cursor.name)
+                    self.assertEqual(cursor.itersize, 2)
+
+    def test_catalog_on_pool(self):
+        pool = FakePool(catalog)
+
+        state = get_state(pool, use_catalog=True)
+
+        self.assertEqual(list(state['app']['tables']['users']['columns']), ['id', 'team_id'])
+        self.assertEqual(len(pool.connections), 1)
+        self.assertEqual(pool.returned, pool.connections)
+
+    def test_concurrent(self):
+        pool = FakePool(snapshot_catalog)
+
+        state = get_state(pool)
+
+        self.assertEqual(state, get_state(FakeConnection(catalog)))
+        self.assertEqual(len(pool.connections), 4)
+        self.assertEqual(sorted(map(id, pool.returned)), sorted(map(id, pool.connections)))
+
+        # Every connection reads from the snapshot exported by the first one
+        for connection in pool.connections[1:]:
+            self.assertIn(
+                ('SET TRANSACTION SNAPSHOT %s', ('00000003-0000001B-1',)),
+                connection.queries
+            )
+        for connection in pool.connections:
+            self.assertEqual(connection.queries[-1], ('ROLLBACK', None))
+            self.assertFalse(connection.autocommit)
+
+    def test_concurrent_broken_connection(self):
+        def handler(connection, query, parameters):
+            if query == 'ROLLBACK' and connection.queries[-2][0].startswith('SELECT t.table_schema'):
+                raise psycopg2.InterfaceError('connection already closed')
+            if 'information_schema.columns' in query:
+                raise psycopg2.OperationalError('server closed the connection unexpectedly')
+            return snapshot_catalog(connection, query, parameters)
+
+        pool = FakePool(handler)
+
+        # The error of the table query is raised rather than the one of its rollback
+        with self.assertRaisesRegex(psycopg2.OperationalError, 'server closed the connection'):
+            get_state(pool)
+
+        self.assertEqual(len(pool.connections), 4)
+        self.assertEqual(sorted(map(id, pool.returned)), sorted(map(id, pool.connections)))
+        for connection in pool.connections:
+            self.assertEqual(connection.queries[-1], ('ROLLBACK', None))
+            self.assertFalse(connection.autocommit)
+
+    def test_async(self):
+        for use_catalog in (False, True):
+            with self.subTest(use_catalog=use_catalog):
+                state = asyncio.run(get_state_async(FakeConnection(catalog), use_catalog=use_catalog))
+
+                self.assertEqual(state, get_state(FakeConnection(catalog)))
@@ -0,0 +1,65 @@
+import unittest
+
+from pypgdelta import get_delta_statement
+from pypgdelta.sql.state._table import _build_table_dict
+
+from ._configurations import BIGINT, VARCHAR, get_configuration
+from ._parse_tree import column_definition, table_statement
+
+
+def column_row(column_name, data_type, udt_name, length=None, precision=None, scale=None, datetime_precision=None,
+               nullable=True):
+    """Function for getting a row of the columns query on the table app.t
+
+    :return: The row
+    """
+    return {
+        'table_schema': 'app',
+        'table_name': 't',
+        'table_type': 'BASE TABLE',
+        'character_maximum_length': length,
+        'column_name': column_name,
+        'data_type': data_type,
+        'udt_name': udt_name,
+        'numeric_precision': precision,
+        'numeric_scale': scale,
+        'datetime_precision': datetime_precision,
+        'is_nullable': 'YES' if nullable else 'NO'
+    }
+
+
+class TypesTest(unittest.TestCase):
+
+    def test_construct_matches_state(self):
+        configuration = get_configuration(
+            [
+                table_statement(
+                    'app',
+                    't',
+                    [
+                        column_definition('a', VARCHAR, [100]),
+                        column_definition('b', ['pg_catalog', 'numeric'], [10, 2]),
+                        column_definition('c', ['pg_catalog', 'timestamptz'], [3]),
+                        column_definition('d', BIGINT, not_null=True),
+                        column_definition('e', ['text'], array=True),
+                        column_definition('f', ['uuid'])
+                    ]
+                )
+            ]
+        )
+        state = _build_table_dict(
+            [
+                column_row('a', 'character varying', 'varchar', length=100),
+                column_row('b', 'numeric', 'numeric', precision=10, scale=2),
+                column_row('c', 'timestamp with time zone', 'timestamptz', datetime_precision=3),
+                column_row('d', 'bigint', 'int8', precision=64, scale=0, nullable=False),
+                column_row('e', 'ARRAY', '_text'),
+                column_row('f', 'uuid', 'uuid')
+            ]
+        )
+
+        self.assertEqual(
+            [column['data_type_stmt'] for column in state['app']['tables']['t']['columns'].values()],
+            ['varchar(100)', 'numeric(10,2)', 'timestamptz(3)', 'bigint', 'text[]', 'uuid']
+        )
+        self.assertEqual(get_delta_statement(state, configuration), '')
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from pypgdelta import DeltaWatcher, get_delta_statement, watch_delta_statement
+from pypgdelta.construct import construct_configuration
+from pypgdelta.locate import iter_json
+
+from ._configurations import get_old_configuration, named_table
+from ._parse_tree import index_statement, write_json_files
+
+
+class WatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root_dir = self.directory.name
+        write_json_files(
+            self.root_dir,
+            {
+                'orders.json': [named_table('orders', 10)],
+                'users.json': [named_table('users', 50)]
+            }
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_current(self, watcher):
+        configuration = construct_configuration(iter_json(self.root_dir))
+        self.assertEqual(watcher.configuration, configuration)
+        self.assertEqual(watcher.statement, get_delta_statement(watcher.old_configuration, configuration))
+
+    def test_refresh(self):
+        watcher = DeltaWatcher(get_old_configuration(), self.root_dir)
+
+        self.assertTrue(watcher.refresh())
+        self.assertEqual(watcher.statement, '')
+        self.assertFalse(watcher.refresh())
+
+        # A changed file
+        write_json_files(self.root_dir, {'users.json': [named_table('users', 100)]})
+        self.assertTrue(watcher.refresh())
+        self.assert_current(watcher)
+        self.assertIn('varchar(100)', watcher.statement)
+
+        # A new file
+        write_json_files(self.root_dir, {'indexes.json': [index_statement('app', 'orders', ['name'])]})
+        self.assertTrue(watcher.refresh())
+        self.assert_current(watcher)
+        self.assertIn('CREATE INDEX CONCURRENTLY orders_name_idx', watcher.statement)
+
+        # A removed file
+        os.remove(os.path.join(self.root_dir, 'indexes.json'))
+        self.assertTrue(watcher.refresh())
+        self.assert_current(watcher)
+        self.assertNotIn('orders_name_idx', watcher.statement)
+
+    def test_watch_delta_statement(self):
+        scripts = []
+        stop_event = threading.Event()
+
+        def callback(statement):
+            scripts.append(statement)
+            stop_event.set()
+
+        write_json_files(self.root_dir, {'users.json': [named_table('users', 100)]})
+        watch_delta_statement(get_old_configuration(), self.root_dir, callback, interval=0, stop_event=stop_event)
+
+        self.assertEqual(len(scripts), 1)
+        self.assertIn('varchar(100)', scripts[0])